@@ -0,0 +1,70 @@
+"""
+مجذّع عربي خفيف (light stemmer) مع ذاكرة مؤقتة
+
+يحذف السوابق (ال، وال، بال، كال، فال، لل، و) واللواحق (ات، ون، ين، ة/ه)
+ويوحّد جموع التكسير المعروفة على وزن مفاعل (مخابز -> مخبز، مطاعم -> مطعم)،
+بحيث تتجمع الصيغ الصرفية للكلمة نفسها تحت جذع واحد:
+    مخبز / مخابز / المخبز / بالمخبز  -> مخبز
+    حلويات / حلوى                     -> حلوي
+يُتوقع أن يكون النص مطبّعاً مسبقاً (ة -> ه، ى -> ي، أ/إ/آ -> ا).
+"""
+
+from functools import lru_cache
+
+ARTICLE_PREFIXES = ('وال', 'بال', 'كال', 'فال', 'لل', 'ال')
+SUFFIXES = ('ات', 'ون', 'ين', 'ة', 'ه')
+MIN_STEM = 3
+STEM_CACHE_SIZE = 65536
+
+# جموع مفاعل فقط: نفس الوزن يطابق مفرداتٍ كثيرة (محاسب، مساعد، مقاول، معالج)
+# فلا يُطبق الاختزال إلا على هذه القائمة (بعد حذف السوابق واللواحق)
+BROKEN_PLURALS = frozenset((
+    'مباني', 'متاجر', 'مجاري', 'مخابز', 'مدارس', 'مراتب', 'مرافق', 'مراكز', 'مزارع', 'مسابح',
+    'مساجد', 'مسالخ', 'مصارف', 'مصاعد', 'مصانع', 'مضارب', 'مطابخ', 'مطاعم', 'معادن', 'معارض',
+    'معاصر', 'معالم', 'مغاسل', 'مفاصل', 'مقابر', 'مقاهي', 'مكاتب', 'ملابس', 'ملاعب', 'ملاهي',
+    'منازل', 'مناظر', 'منافذ', 'موارد', 'مواقد', 'مواقع', 'مواقف', 'مواهب',
+))
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word):
+    """جذع كلمة عربية واحدة (الكلمات غير العربية تُعاد كما هي)"""
+    if not word or not ('؀' <= word[0] <= 'ۿ'):
+        return word
+    w = word
+    for p in ARTICLE_PREFIXES:
+        if w.startswith(p) and len(w) - len(p) >= MIN_STEM:
+            w = w[len(p):]
+            break
+    for s in SUFFIXES:
+        if w.endswith(s) and len(w) - len(s) >= MIN_STEM:
+            w = w[:-len(s)]
+            break
+    # واو العطف: فقط إذا بقي جذع طويل بما يكفي (ورد، وجبه تبقى كما هي)
+    if w.startswith('و') and len(w) - 1 >= MIN_STEM + 1:
+        w = w[1:]
+    # جمع التكسير مفاعل -> مفعل
+    if w in BROKEN_PLURALS:
+        w = w[:2] + w[3:]
+    return w
+
+
+def stem_text(text):
+    """تجذيع كل كلمات النص"""
+    return ' '.join(stem(tok) for tok in text.split())
+
+
+def dedupe_by_stem(keywords, normalize=None):
+    """إزالة الكلمات المفتاحية التي تتكرر بعد التجذيع (مع الإبقاء على أول صيغة)"""
+    seen = set()
+    out = []
+    for kw in keywords:
+        key = stem_text(normalize(kw) if normalize else (kw or "").strip().lower())
+        if key and key not in seen:
+            seen.add(key)
+            out.append(kw)
+    return out
+
+
+def cache_info():
+    return stem.cache_info()
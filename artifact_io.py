@@ -0,0 +1,179 @@
+"""
+كتابة وقراءة مخرجات خط البيانات (مصفوفات سجلات) بصيغ مختلفة
+
+الصيغ:
+- json     : نفس مخرجات json.dumps(records, ensure_ascii=False, indent=2) (الافتراضي،
+             ما تقرؤه واجهة Next.js والخادم)
+- compact  : JSON بدون مسافات (نفس الامتداد .json، أصغر بكثير وتقرؤه الواجهة كما هو)
+- jsonl    : سجل واحد في كل سطر (.jsonl)، يُقرأ ويُكتب سطراً سطراً
+- msgpack  : MessagePack (.msgpack)، يتطلب مكتبة msgpack
+
+الكتابة متدفقة على دفعات من السجلات فلا تُبنى السلسلة الكاملة في الذاكرة،
+وتستخدم orjson إن كانت مثبتة (compact/jsonl). صيغة json تبقى بمرمّز المكتبة
+القياسية حتى تبقى الملفات مطابقة بايتاً ببايت لما سبق.
+
+القراءة تكتشف الصيغة من أول بايتات الملف وليس من الامتداد.
+
+أي صيغة يمكن ضغطها بإضافة .gz أو .zst (مثلاً jsonl.zst أو json.gz): الكتابة
+تضغط أثناء التدفق والقراءة تفك الضغط أثناء التدفق (انظر compressed_io).
+"""
+
+import json
+from pathlib import Path
+
+import compressed_io
+from json_stream import iter_records
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMATS = ("json", "compact", "jsonl", "msgpack")
+DEFAULT_FORMAT = "json"
+SUFFIXES = {"json": ".json", "compact": ".json", "jsonl": ".jsonl", "msgpack": ".msgpack"}
+CHUNK_RECORDS = 1000
+
+# رؤوس مصفوفة MessagePack: fixarray و array16 و array32
+_MSGPACK_ARRAY = set(range(0x90, 0xA0)) | {0xDC, 0xDD}
+
+
+def split_format(fmt):
+    """"jsonl.zst" -> ("jsonl", "zstd")، "json" -> ("json", None)"""
+    base, dot, ext = fmt.partition(".")
+    codec = compressed_io.codec_for_path("x." + ext) if dot else None
+    if base not in SUFFIXES or (dot and codec is None):
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {', '.join(FORMATS)}"
+                         f" (optionally + {' / '.join(compressed_io.SUFFIXES.values())})")
+    return base, codec
+
+
+def is_format(fmt):
+    try:
+        split_format(fmt)
+        return True
+    except ValueError:
+        return False
+
+
+def artifact_path(path, fmt=DEFAULT_FORMAT):
+    """مسار الملف بامتداد الصيغة (pois.json -> pois.jsonl مع jsonl، pois.jsonl.zst مع jsonl.zst)"""
+    base, codec = split_format(fmt)
+    path = Path(path)
+    if compressed_io.codec_for_path(path):
+        path = path.with_suffix("")
+    return compressed_io.compressed_path(path.with_suffix(SUFFIXES[base]), codec)
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise RuntimeError("The msgpack format needs the msgpack package (pip install msgpack)")
+
+
+def _compact(rec):
+    if orjson is not None:
+        return orjson.dumps(rec)
+    return json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _pretty(rec):
+    # النصوص في JSON لا تحتوي سطراً جديداً خاماً، فالإزاحة آمنة
+    return ("  " + json.dumps(rec, ensure_ascii=False, indent=2).replace("\n", "\n  ")).encode("utf-8")
+
+
+def _chunks(records, size):
+    chunk = []
+    for rec in records:
+        chunk.append(rec)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_records(path, records, fmt=DEFAULT_FORMAT, chunk=CHUNK_RECORDS):
+    """كتابة سجلات (أي iterable) بالصيغة المطلوبة؛ ترجع المسار الفعلي المكتوب"""
+    out = artifact_path(path, fmt)
+    fmt, codec = split_format(fmt)
+    if fmt == "msgpack":
+        _require_msgpack()
+        records = records if hasattr(records, "__len__") else list(records)
+        packer = msgpack.Packer(use_bin_type=True)
+        with compressed_io.open_write(out, codec) as f:
+            f.write(packer.pack_array_header(len(records)))
+            for part in _chunks(records, chunk):
+                f.write(b"".join(packer.pack(rec) for rec in part))
+        return out
+
+    with compressed_io.open_write(out, codec) as f:
+        if fmt == "jsonl":
+            for part in _chunks(records, chunk):
+                f.write(b"".join(_compact(rec) + b"\n" for rec in part))
+            return out
+        encode, sep, open_, close = (
+            (_pretty, b",\n", b"[\n", b"\n]") if fmt == "json" else (_compact, b",", b"[", b"]")
+        )
+        first = True
+        for part in _chunks(records, chunk):
+            f.write((open_ if first else sep) + sep.join(encode(rec) for rec in part))
+            first = False
+        f.write(b"[]" if first else close)
+    return out
+
+
+def detect_format(path):
+    """json | jsonl | msgpack حسب محتوى الملف بعد فك الضغط (compact يُقرأ كـ json)"""
+    with compressed_io.open_read(path) as f:
+        head = f.read(4096)
+    if head and head[0] in _MSGPACK_ARRAY:
+        return "msgpack"
+    text = head.decode("utf-8", errors="ignore").lstrip()
+    if text[:1] == "[":
+        return "json"
+    if not text or text[0] == "{":  # ملف JSONL فارغ = صفر سجلات
+        return "jsonl"
+    raise ValueError(f"Unrecognized artifact format in {path}")
+
+
+def _project(rec, fields):
+    if fields is None or not isinstance(rec, dict):
+        return rec
+    return {k: v for k, v in rec.items() if k in fields}
+
+
+def iter_artifact(path, fields=None):
+    """سجلات الملف واحداً تلو الآخر أياً كانت صيغته وضغطه"""
+    path = compressed_io.resolve(path)
+    fmt = detect_format(path)
+    if fmt == "json":
+        yield from iter_records(path, fields)
+        return
+    fields = set(fields) if fields is not None else None
+    if fmt == "jsonl":
+        loads = orjson.loads if orjson is not None else json.loads
+        with compressed_io.open_read(path) as f:
+            for line in f:
+                if line.strip():
+                    yield _project(loads(line), fields)
+        return
+    _require_msgpack()
+    with compressed_io.open_read(path) as f:
+        unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+        for _ in range(unpacker.read_array_header()):
+            yield _project(unpacker.unpack(), fields)
+
+
+def load_artifact(path, fields=None):
+    """قائمة السجلات كاملة؛ ملف JSON غير مضغوط بدون اختيار حقول يُحلل دفعة واحدة بـ orjson إن وُجدت"""
+    path = compressed_io.resolve(path)
+    if (fields is None and orjson is not None and compressed_io.detect_codec(path) is None
+            and detect_format(path) == "json"):
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    return list(iter_artifact(path, fields))
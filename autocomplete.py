@@ -0,0 +1,282 @@
+"""
+فهرس إكمال تلقائي (type-ahead) لأسماء التصنيفات وكلماتها المفتاحية
+
+خطوة بناء تجمع كل الأسماء (name_ar/name_en) والكلمات المفتاحية بعد التطبيع
+في شجرة بادئات مضغوطة (radix trie)؛ كل عقدة تحمل مسبقاً أفضل K تصنيفات
+تحت البادئة، فيصبح الإكمال مجرد نزول في الشجرة بطول البادئة ثم إرجاع قائمة
+جاهزة (ميكروثوانٍ) بدلاً من تصفية مصفوفة التصنيفات كاملة مع كل ضغطة مفتاح.
+
+الترتيب داخل العقدة: الاسم قبل الكلمة المفتاحية قبل كلمة داخلية من عبارة
+("بيتزا" تكمل "مطعم بيتزا")، ثم الأقصر، ثم ترتيب التصنيف في الملف.
+
+الفهرس يُحفظ في ملف pickle من قوائم بسيطة فيُحمّل فوراً، ويُعاد بناؤه تلقائياً
+إذا تغير ملف التصنيفات.
+
+    python autocomplete.py build [categories.json]
+    python autocomplete.py <prefix> [--limit 10]
+    python autocomplete.py --bench
+"""
+
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import compressed_io
+from category_matcher import CATS_PATH, normalize_text
+from json_stream import load_records
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+OUT_INDEX = DATA_DIR / "autocomplete_index.pickle"
+
+TOP_K = 10
+FORMAT_VERSION = 1
+AUTOCOMPLETE_FIELDS = ("id", "name_ar", "name_en", "search_key_words_ar", "search_key_words_en")
+
+# أوزان نوع المدخل (الأصغر أفضل)
+NAME, KEYWORD, INNER_WORD = 0, 1, 2
+
+
+def category_terms(c):
+    """(النص المطبّع، النوع) لكل اسم وكلمة مفتاحية، مع كلمات العبارات الداخلية"""
+    out = {}
+
+    def put(norm, kind):
+        if norm and kind < out.get(norm, INNER_WORD + 1):
+            out[norm] = kind
+
+    for field, kind in (("name_ar", NAME), ("name_en", NAME),
+                        ("search_key_words_ar", KEYWORD), ("search_key_words_en", KEYWORD)):
+        values = c.get(field)
+        for text in ([values] if isinstance(values, str) else values or []):
+            norm = normalize_text(text)
+            put(norm, kind)
+            words = norm.split()
+            for i in range(1, len(words)):
+                put(" ".join(words[i:]), INNER_WORD)
+    return out
+
+
+class _Node:
+    __slots__ = ("children", "best")
+
+    def __init__(self):
+        self.children = {}
+        self.best = {}  # موقع التصنيف -> أفضل مفتاح ترتيب لمدخل ينتهي هنا
+
+
+def _top(cands, k):
+    return sorted(cands.items(), key=lambda kv: (kv[1], kv[0]))[:k]
+
+
+class AutocompleteIndex:
+    """شجرة مسطحة: لكل عقدة {أول حرف: (نص الحافة، رقم العقدة)} وقائمة أفضل K"""
+
+    def __init__(self, edges, topk, categories, source=None):
+        self.edges = edges
+        self.topk = topk
+        self.categories = categories  # (id, name_ar, name_en) حسب الموقع
+        self.source = source
+
+    @classmethod
+    def build(cls, categories, k=TOP_K, source=None):
+        root = _Node()
+        for pos, c in enumerate(categories):
+            for term, kind in category_terms(c).items():
+                node = root
+                for ch in term:
+                    nxt = node.children.get(ch)
+                    if nxt is None:
+                        nxt = node.children[ch] = _Node()
+                    node = nxt
+                key = (kind, len(term))
+                if key < node.best.get(pos, (INNER_WORD + 1, 0)):
+                    node.best[pos] = key
+
+        # أفضل K لكل عقدة من الأسفل إلى الأعلى (بدون تعاود)
+        order = [root]
+        for node in order:
+            order.extend(node.children.values())
+        for node in reversed(order):
+            cands = dict(node.best)
+            for child in node.children.values():
+                for pos, key in child.best:
+                    if key < cands.get(pos, (INNER_WORD + 1, 0)):
+                        cands[pos] = key
+            node.best = _top(cands, k)
+
+        # تسطيح مع ضغط السلاسل: عقدة بابن واحد ولا مدخل ينتهي عندها لها نفس قائمة ابنها
+        edges, topk = [], []
+
+        def emit(node):
+            edges.append({})
+            topk.append(tuple(pos for pos, _ in node.best))
+            return len(edges) - 1
+
+        stack = [(root, emit(root))]
+        while stack:
+            node, idx = stack.pop()
+            for ch, child in node.children.items():
+                label = ch
+                while len(child.children) == 1 and child.best == _only(child).best:
+                    (c2, grand), = child.children.items()
+                    label += c2
+                    child = grand
+                child_idx = emit(child)
+                edges[idx][ch] = (label, child_idx)
+                stack.append((child, child_idx))
+
+        cats = [(c["id"], c.get("name_ar"), c.get("name_en")) for c in categories]
+        return cls(edges, topk, cats, source)
+
+    def _node(self, prefix):
+        """رقم أعمق عقدة تغطي البادئة، أو None"""
+        node, i = 0, 0
+        while i < len(prefix):
+            edge = self.edges[node].get(prefix[i])
+            if edge is None:
+                return None
+            label, child = edge
+            n = min(len(label), len(prefix) - i)
+            if label[:n] != prefix[i:i + n]:
+                return None
+            node, i = child, i + n
+        return node
+
+    def complete_ids(self, prefix, limit=TOP_K):
+        node = self._node(normalize_text(prefix))
+        return [] if node is None else [self.categories[pos][0] for pos in self.topk[node][:limit]]
+
+    def complete(self, prefix, limit=TOP_K):
+        node = self._node(normalize_text(prefix))
+        if node is None:
+            return []
+        out = []
+        for pos in self.topk[node][:limit]:
+            cid, name_ar, name_en = self.categories[pos]
+            out.append({"id": cid, "name_ar": name_ar, "name_en": name_en})
+        return out
+
+    def stats(self):
+        return {
+            "nodes": len(self.edges),
+            "edges_chars": sum(len(label) for e in self.edges for label, _ in e.values()),
+            "categories": len(self.categories),
+        }
+
+    def save(self, path=OUT_INDEX):
+        payload = {
+            "version": FORMAT_VERSION,
+            "source": self.source,
+            "edges": self.edges,
+            "topk": self.topk,
+            "categories": self.categories,
+        }
+        tmp = Path(path).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path=OUT_INDEX):
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported autocomplete index version in {path}")
+        return cls(payload["edges"], payload["topk"], payload["categories"], payload["source"])
+
+
+def _only(node):
+    return next(iter(node.children.values()))
+
+
+def _source_stamp(path):
+    path = compressed_io.resolve(path)
+    st = path.stat()
+    return {"path": str(path.resolve()), "size": st.st_size, "mtime": st.st_mtime_ns}
+
+
+def build_index(cats_path=CATS_PATH, out_path=OUT_INDEX, k=TOP_K):
+    categories = load_records(cats_path, AUTOCOMPLETE_FIELDS)
+    index = AutocompleteIndex.build(categories, k=k, source=_source_stamp(cats_path))
+    index.save(out_path)
+    return index
+
+
+def load_or_build(cats_path=CATS_PATH, out_path=OUT_INDEX):
+    """الفهرس المحفوظ إذا كان مبنياً من نفس ملف التصنيفات، وإلا يُعاد بناؤه"""
+    if Path(out_path).exists():
+        try:
+            index = AutocompleteIndex.load(out_path)
+            if index.source == _source_stamp(cats_path):
+                return index
+        except (ValueError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+    return build_index(cats_path, out_path)
+
+
+def _arg(flags, name, default=None):
+    if name in flags:
+        i = flags.index(name)
+        if i + 1 < len(flags):
+            return flags[i + 1]
+    return default
+
+
+def bench(cats_path=CATS_PATH):
+    """زمن البناء والتحميل والإكمال مقارنة بتصفية المصفوفة كاملة"""
+    t0 = time.perf_counter()
+    index = build_index(cats_path)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    index = AutocompleteIndex.load(OUT_INDEX)
+    load_s = time.perf_counter() - t0
+
+    categories = load_records(cats_path, AUTOCOMPLETE_FIELDS)
+    prefixes = sorted({t[:n] for c in categories for t in category_terms(c) for n in (1, 2, 3, 5)})
+    t0 = time.perf_counter()
+    for p in prefixes:
+        index.complete_ids(p)
+    trie_us = (time.perf_counter() - t0) / len(prefixes) * 1e6
+
+    terms = [(c["id"], list(category_terms(c))) for c in categories]
+    sample = prefixes[::max(1, len(prefixes) // 200)]
+    t0 = time.perf_counter()
+    for p in sample:
+        [cid for cid, ts in terms if any(t.startswith(p) for t in ts)]
+    scan_us = (time.perf_counter() - t0) / len(sample) * 1e6
+
+    return {
+        "source": str(cats_path),
+        "index": index.stats(),
+        "artifact_bytes": OUT_INDEX.stat().st_size,
+        "build_s": round(build_s, 3),
+        "load_ms": round(load_s * 1e3, 2),
+        "prefixes": len(prefixes),
+        "complete_us": round(trie_us, 2),
+        "full_scan_us": round(scan_us, 2),
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python autocomplete.py build [categories.json] | <prefix> [--limit N] | --bench")
+        sys.exit(1)
+    if args[0] == "build":
+        src = Path(args[1]) if len(args) > 1 else CATS_PATH
+        index = build_index(src)
+        print("Index:", OUT_INDEX, index.stats())
+    elif args[0] == "--bench":
+        src = Path(args[1]) if len(args) > 1 else CATS_PATH
+        import json
+        print(json.dumps(bench(src), ensure_ascii=False, indent=2))
+    else:
+        index = load_or_build()
+        for c in index.complete(args[0], int(_arg(args, "--limit", TOP_K))):
+            print(f"[{c['id']}] {c['name_ar']} ({c['name_en']})")
+
+
+if __name__ == "__main__":
+    main()
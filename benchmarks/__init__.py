@@ -0,0 +1,9 @@
+"""
+حزمة قياس الأداء لسكربتات خط البيانات
+
+- generators: توليد تصنيفات ثنائية اللغة وملفات POI اصطناعية بذرة ثابتة
+- run: تشغيل المراحل مع قياس الزمن والإنتاجية وذروة الذاكرة (JSON)
+
+تشغيل:
+    python -m benchmarks.run --rows 10000,100000 --encodings utf-8,utf-16,cp1256
+"""
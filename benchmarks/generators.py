@@ -0,0 +1,116 @@
+"""
+مولدات بيانات اصطناعية بذرة ثابتة (نفس البذرة => نفس الملفات)
+
+- generate_taxonomy: تصنيفات ثنائية اللغة بحجم مضاعف لـ categories.json
+- generate_poi_csv: ملف POI بنفس أعمدة التصدير الحقيقي وبترميز محدد
+"""
+
+import csv
+import json
+import random
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASE = ROOT / "wash-tasnifoh" / "data" / "categories.json"
+
+CSV_FIELDS = ["id", "name_en", "name_ar", "category_en", "category_ar", "sub_category_en", "sub_category_ar"]
+
+AR_BRANDS = ["الريان", "النخبة", "السلام", "الأمل", "الفجر", "الواحة", "النور", "الراشد", "الهدى", "البركة"]
+EN_BRANDS = ["Al Rayan", "Elite", "Salam", "Hope", "Fajr", "Oasis", "Noor", "Rashid", "Huda", "Baraka"]
+AR_PLACES = ["الرياض", "جدة", "الدمام", "مكة", "المدينة", "أبها", "تبوك", "حائل"]
+EN_PLACES = ["Riyadh", "Jeddah", "Dammam", "Makkah", "Madinah", "Abha", "Tabuk", "Hail"]
+
+
+def load_base(path=BASE):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def generate_taxonomy(scale=1.0, seed=42, base=None):
+    """تصنيفات بعدد len(base) × scale مع الحفاظ على بنية الجذور والأبناء"""
+    rnd = random.Random(seed)
+    base = base if base is not None else load_base()
+    roots = [c for c in base if not c.get("parent_id")]
+    children = [c for c in base if c.get("parent_id")]
+    ar_pool = sorted({k for c in base for k in (c.get("search_key_words_ar") or [])})
+    en_pool = sorted({k for c in base for k in (c.get("search_key_words_en") or [])})
+
+    target = max(len(roots) + 1, int(len(base) * scale))
+    n_roots = max(1, round(len(roots) * target / len(base)))
+
+    out = []
+    next_id = 1
+    root_ids = []
+    for i in range(n_roots):
+        src = roots[i % len(roots)]
+        gen = i // len(roots)
+        out.append(_clone(src, next_id, None, gen, rnd, ar_pool, en_pool))
+        root_ids.append(next_id)
+        next_id += 1
+    i = 0
+    while len(out) < target:
+        src = children[i % len(children)]
+        gen = i // len(children)
+        out.append(_clone(src, next_id, rnd.choice(root_ids), gen, rnd, ar_pool, en_pool))
+        next_id += 1
+        i += 1
+    return out
+
+
+def _clone(src, new_id, parent_id, gen, rnd, ar_pool, en_pool):
+    suffix_ar = f" {gen + 1}" if gen else ""
+    suffix_en = f" {gen + 1}" if gen else ""
+    ar = list(src.get("search_key_words_ar") or [])
+    en = list(src.get("search_key_words_en") or [])
+    if gen:
+        # نسخ إضافية تأخذ كلمات من المجمّع العام لتبقى واقعية ومتنوعة
+        ar = ar[: len(ar) // 2] + rnd.sample(ar_pool, min(len(ar_pool), max(1, len(ar) // 2)))
+        en = en[: len(en) // 2] + rnd.sample(en_pool, min(len(en_pool), max(1, len(en) // 2)))
+    return {
+        "id": new_id,
+        "name_ar": (src.get("name_ar") or "") + suffix_ar,
+        "name_en": (src.get("name_en") or "") + suffix_en,
+        "code": f"{src.get('code') or 'GEN'}_{new_id}",
+        "related_category": [],
+        "description_ar": src.get("description_ar"),
+        "description_en": src.get("description_en"),
+        "search_key_words_en": en,
+        "search_key_words_ar": ar,
+        "parent_id": parent_id,
+        "created_at": src.get("created_at"),
+        "updated_at": src.get("updated_at"),
+    }
+
+
+def iter_poi_rows(rows, taxonomy, seed=42):
+    """صفوف POI بأسماء مركبة من علامة تجارية + كلمة التصنيف + مدينة"""
+    rnd = random.Random(seed)
+    by_id = {c["id"]: c for c in taxonomy}
+    subs = [c for c in taxonomy if c.get("parent_id") in by_id]
+    for i in range(1, rows + 1):
+        sub = rnd.choice(subs)
+        cat = by_id[sub["parent_id"]]
+        b = rnd.randrange(len(AR_BRANDS))
+        p = rnd.randrange(len(AR_PLACES))
+        kw_ar = rnd.choice(sub.get("search_key_words_ar") or [sub["name_ar"]])
+        yield {
+            "id": str(i),
+            "name_en": f"{EN_BRANDS[b]} {sub['name_en']} {EN_PLACES[p]}",
+            "name_ar": f"{kw_ar} {AR_BRANDS[b]} {AR_PLACES[p]}",
+            "category_en": cat["name_en"],
+            "category_ar": cat["name_ar"],
+            # نسبة من الصفوف بدون تصنيف فرعي كما في التصدير الحقيقي
+            "sub_category_en": sub["name_en"] if rnd.random() > 0.1 else "",
+            "sub_category_ar": sub["name_ar"] if rnd.random() > 0.1 else "",
+        }
+
+
+def generate_poi_csv(path, rows, taxonomy, encoding="utf-8", seed=42):
+    """كتابة ملف CSV بشكل متدفق (يدعم حتى 10M صف دون تحميلها في الذاكرة)"""
+    path = Path(path)
+    # cp1256 لا يغطي كل الحروف؛ نستبدل ما لا يُرمّز بدلاً من الفشل
+    with open(path, "w", encoding=encoding, errors="replace", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in iter_poi_rows(rows, taxonomy, seed):
+            writer.writerow(row)
+    return path
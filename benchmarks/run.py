@@ -0,0 +1,334 @@
+"""
+تشغيل قياسات الأداء لكل مراحل خط البيانات وإخراج النتائج بصيغة JSON
+
+كل حالة تُشغّل مرة للتوقيت (بدون tracemalloc لأنه يبطئ التنفيذ) ثم مرة
+لقياس ذروة الذاكرة، وتُكتب المخرجات الوسيطة في مجلد عمل مؤقت بدلاً من
+wash-tasnifoh/data.
+
+    python -m benchmarks.run --rows 10000 --encodings utf-8,utf-16,cp1256 --out bench.json
+"""
+
+import argparse
+import contextlib
+import copy
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks import generators
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import artifact_io  # noqa: E402
+import category_matcher  # noqa: E402
+import compressed_io  # noqa: E402
+import expand_keyword_bundles  # noqa: E402
+import expand_keywords_v2  # noqa: E402
+import import_pois_from_csv  # noqa: E402
+import mega_dictionary_complete  # noqa: E402
+import validate_keywords  # noqa: E402
+from poi_records import FIELDS, PoiTable  # noqa: E402
+
+
+@contextlib.contextmanager
+def patched(module, **attrs):
+    """توجيه ثوابت المسارات في السكربت مؤقتاً إلى مجلد العمل"""
+    old = {k: getattr(module, k) for k in attrs}
+    for k, v in attrs.items():
+        setattr(module, k, v)
+    try:
+        yield
+    finally:
+        for k, v in old.items():
+            setattr(module, k, v)
+
+
+def measure(stage, fn, units, unit, params=None, setup=None, memory=True, repeat=1):
+    """زمن الجدار والمعالج والإنتاجية وذروة الذاكرة لحالة واحدة
+
+    repeat > 1: أقل زمن من عدة تشغيلات (setup قبل كل تشغيل)، حتى لا تُقارن
+    حالات قصيرة بضجيج تشغيل واحد.
+    """
+    wall = cpu = None
+    for _ in range(max(1, repeat)):
+        args = setup() if setup else ()
+        gc.collect()
+        w0, c0 = time.perf_counter(), time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn(*args)
+        w, c = time.perf_counter() - w0, time.process_time() - c0
+        wall = w if wall is None else min(wall, w)
+        cpu = c if cpu is None else min(cpu, c)
+
+    peak = None
+    if memory:
+        args = setup() if setup else ()
+        gc.collect()
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "stage": stage,
+        "params": params or {},
+        "units": units,
+        "unit": unit,
+        "repeat": max(1, repeat),
+        "wall_seconds": round(wall, 6),
+        "cpu_seconds": round(cpu, 6),
+        "throughput": round(units / wall, 2) if wall > 0 else None,
+        "peak_bytes": peak,
+    }
+
+
+def taxonomy_cases(taxonomy, tax_path, workdir, scale, memory):
+    n = len(taxonomy)
+    params = {"scale": scale, "categories": n}
+    out = []
+
+    def bundles(cats):
+        for c in cats:
+            expand_keyword_bundles.expand_category(c)
+
+    out.append(measure("expand_keyword_bundles.expand", bundles, n, "categories", params,
+                       setup=lambda: (copy.deepcopy(taxonomy),), memory=memory))
+
+    out.append(measure("validate_keywords.validate",
+                       lambda: validate_keywords.validate_and_clean_keywords(tax_path, workdir / "validated.json"),
+                       n, "categories", params, memory=memory))
+
+    out.append(measure("expand_keywords_v2.expand",
+                       lambda: expand_keywords_v2.expand_all_categories(tax_path, workdir / "expanded.json"),
+                       n, "categories", params, memory=memory))
+
+    out.append(measure("mega_dictionary.expand", mega_dictionary_complete.expand_all_keywords, n, "categories",
+                       params, setup=lambda: (copy.deepcopy(taxonomy),), memory=memory))
+
+    out.append(measure("matcher.build", lambda: category_matcher.CategoryIndex(taxonomy), n, "categories",
+                       params, memory=memory))
+
+    index = category_matcher.CategoryIndex(taxonomy)
+    queries = [r["name_ar"] for r in generators.iter_poi_rows(500, taxonomy)]
+
+    def run_queries():
+        for q in queries:
+            category_matcher.match_categories(q, index)
+
+    out.append(measure("matcher.query", run_queries, len(queries), "queries", params, memory=memory))
+    return out
+
+
+def import_cases(taxonomy, tax_path, workdir, rows, encoding, seed, memory):
+    csv_path = generators.generate_poi_csv(workdir / f"pois_{rows}_{encoding}.csv", rows, taxonomy, encoding, seed)
+    params = {"rows": rows, "encoding": encoding, "csv_bytes": csv_path.stat().st_size}
+    paths = {
+        "CATS_PATH": tax_path,
+        "OUT_POIS": workdir / "pois.json",
+        "OUT_REPORT": workdir / "pois_import_report.json",
+        "OUT_CATS_FROM_CSV": workdir / "categories_from_csv.json",
+        "OUT_CATS_MERGED": workdir / "categories_merged.json",
+    }
+    out = []
+    with patched(import_pois_from_csv, **paths):
+        out.append(measure("import_pois.authoritative",
+                           lambda: import_pois_from_csv.import_pois(csv_path, authoritative_from_csv=True),
+                           rows, "rows", params, memory=memory))
+        out.append(measure("import_pois.lookup",
+                           lambda: import_pois_from_csv.import_pois(csv_path, authoritative_from_csv=False),
+                           rows, "rows", params, memory=memory))
+    csv_path.unlink()
+    return out
+
+
+def record_cases(taxonomy, rows, seed, memory):
+    """ذاكرة تمثيل POI: قائمة قواميس (السابق) مقابل PoiTable، لكل مليون صف"""
+    by_id = {c["id"]: c for c in taxonomy}
+    by_en = {c["name_en"]: c for c in taxonomy}
+    params = {"rows": rows}
+
+    def mapped():
+        for r in generators.iter_poi_rows(rows, taxonomy, seed):
+            sub = by_en.get(r["sub_category_en"])
+            cat = by_id.get(sub["parent_id"]) if sub else by_en.get(r["category_en"])
+            yield (int(r["id"]), r["name_en"], r["name_ar"], cat["id"], cat["name_en"], cat["name_ar"],
+                   sub["id"] if sub else None, sub["name_en"] if sub else None, sub["name_ar"] if sub else None)
+
+    def as_dicts():
+        return [dict(zip(FIELDS, row)) for row in mapped()]
+
+    def as_table():
+        table = PoiTable()
+        for row in mapped():
+            table.append(*row[:3], table.label(*row[3:]))
+        return table
+
+    out = [
+        measure("pois.records.dicts", as_dicts, rows, "pois", params, memory=memory),
+        measure("pois.records.table", as_table, rows, "pois", params, memory=memory),
+    ]
+    for case in out:
+        if case["peak_bytes"] is not None:
+            case["peak_bytes_per_million"] = round(case["peak_bytes"] * 1_000_000 / rows)
+    return out
+
+
+def format_cases(name, records, workdir, memory):
+    """زمن الكتابة والقراءة وحجم الملف لكل صيغة مخرجات متاحة"""
+    formats = [f for f in artifact_io.FORMATS if f != "msgpack" or artifact_io.msgpack is not None]
+    n = len(records)
+    out = []
+    for fmt in formats:
+        params = {"artifact": name, "format": fmt, "orjson": artifact_io.orjson is not None}
+        target = workdir / f"{name}_{fmt}.json"
+        case = measure(f"artifact.{fmt}.encode", lambda: artifact_io.write_records(target, records, fmt),
+                       n, "records", params, memory=memory)
+        path = artifact_io.artifact_path(target, fmt)
+        case["file_bytes"] = path.stat().st_size
+        out.append(case)
+        out.append(measure(f"artifact.{fmt}.decode", lambda: artifact_io.load_artifact(path),
+                           n, "records", params, memory=memory))
+        path.unlink()
+    return out
+
+
+def _evict(path):
+    """إخراج الملف من ذاكرة صفحات النظام حتى تكون القراءة التالية باردة (Linux)"""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def _read_all(path):
+    with compressed_io.open_read(path) as f:
+        return f.read()
+
+
+def compression_cases(name, records, workdir, memory, repeat=5):
+    """الحجم وزمن القراءة الباردة/الدافئة لكل ضغط، والوقت الموفر في الإدخال مقابل كلفة فك الضغط
+
+    كل زمن هو الأقل من repeat تشغيلات. كلفة فك الضغط تُقاس وحدها (قراءة الملف
+    مع فك الضغط بدون تحليل JSON) مقارنة بقراءة الملف غير المضغوط من الذاكرة.
+    """
+    codecs = [None, "gzip"] + (["zstd"] if compressed_io.zstandard is not None else [])
+    n = len(records)
+    out = []
+    baseline = {}
+    for codec in codecs:
+        label = codec or "none"
+        fmt = "json" + (compressed_io.SUFFIXES[codec] if codec else "")
+        path = artifact_io.write_records(workdir / f"{name}_compressed.json", records, fmt)
+        size = path.stat().st_size
+        params = {"artifact": name, "compression": label, "file_bytes": size}
+        cold = {}
+        for kind, fn, units, unit in (("read", path.read_bytes, size, "bytes"),
+                                      ("load", lambda: list(artifact_io.iter_artifact(path)), n, "records")):
+            cold[kind] = measure(f"compression.{label}.{kind}_cold", fn, units, unit, params,
+                                 setup=lambda: (_evict(path), ())[1], memory=False, repeat=repeat)
+            out.append(cold[kind])
+        decode = measure(f"compression.{label}.decompress_warm", lambda: _read_all(path), size, "bytes", params,
+                         memory=False, repeat=repeat)
+        out.append(decode)
+        warm = measure(f"compression.{label}.load_warm", lambda: list(artifact_io.iter_artifact(path)),
+                       n, "records", params, memory=memory, repeat=repeat)
+        out.append(warm)
+        if codec is None:
+            baseline = {"read": cold["read"]["wall_seconds"], "decode": decode["cpu_seconds"], "bytes": size}
+        else:
+            warm["ratio"] = round(baseline["bytes"] / size, 2)
+            warm["io_saved_ms"] = round((baseline["read"] - cold["read"]["wall_seconds"]) * 1e3, 3)
+            warm["decompress_cpu_ms"] = round((decode["cpu_seconds"] - baseline["decode"]) * 1e3, 3)
+        path.unlink()
+    return out
+
+
+def _csv_ints(s):
+    return [int(float(x)) for x in s.split(",") if x]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pipeline benchmarks")
+    ap.add_argument("--rows", default="10000", help="POI row counts, comma separated (e.g. 10000,1000000)")
+    ap.add_argument("--encodings", default="utf-8,utf-16,cp1256")
+    ap.add_argument("--scales", default="1", help="taxonomy scale factors vs categories.json")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    ap.add_argument("--skip-taxonomy", action="store_true")
+    ap.add_argument("--skip-import", action="store_true")
+    ap.add_argument("--skip-formats", action="store_true", help="skip output format (json/jsonl/msgpack) cases")
+    ap.add_argument("--skip-compression", action="store_true", help="skip gzip/zstd artifact cases")
+    ap.add_argument("--repeat", type=int, default=5, help="timed runs per compression case (min is reported)")
+    ap.add_argument("--workdir", default=None)
+    ap.add_argument("--out", default=None, help="write JSON results to this file")
+    args = ap.parse_args(argv)
+
+    memory = not args.no_memory
+    scales = [float(x) for x in args.scales.split(",") if x]
+    results = []
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp:
+        workdir = Path(tmp)
+        for i, scale in enumerate(scales):
+            taxonomy = generators.generate_taxonomy(scale, args.seed)
+            tax_path = workdir / f"taxonomy_{scale}.json"
+            tax_path.write_text(json.dumps(taxonomy, ensure_ascii=False), encoding="utf-8")
+            if not args.skip_taxonomy:
+                results += taxonomy_cases(taxonomy, tax_path, workdir, scale, memory)
+            # ملفات POI تُقاس على أول حجم للتصنيفات فقط
+            if i == 0 and not args.skip_import:
+                for rows in _csv_ints(args.rows):
+                    for enc in args.encodings.split(","):
+                        results += import_cases(taxonomy, tax_path, workdir, rows, enc, args.seed, memory)
+                    results += record_cases(taxonomy, rows, args.seed, memory)
+                    if not (args.skip_formats and args.skip_compression):
+                        with patched(import_pois_from_csv, CATS_PATH=tax_path):
+                            pois = import_pois_from_csv.run_import(
+                                generators.generate_poi_csv(workdir / "pois_formats.csv", rows, taxonomy,
+                                                            seed=args.seed),
+                                authoritative_from_csv=False, write_outputs=False)["pois"]
+                    if not args.skip_formats:
+                        results += format_cases(f"pois_{rows}", list(pois), workdir, memory)
+                    if not args.skip_compression:
+                        results += compression_cases(f"pois_{rows}", list(pois), workdir, memory, args.repeat)
+        if not args.skip_formats:
+            complete = json.loads((ROOT / "categories_complete.json").read_text(encoding="utf-8"))
+            results += format_cases("categories_complete", complete, workdir, memory)
+        if not args.skip_compression:
+            complete = artifact_io.load_artifact(ROOT / "categories_complete.json")
+            results += compression_cases("categories_complete", complete, workdir, memory, args.repeat)
+
+    report = {
+        "meta": {
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "memory": memory,
+        },
+        "cases": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+جدول العلامات التجارية والسلاسل (مسار سريع قبل أي تقييم)
+
+كثير من المحلات فروع لسلاسل معروفة (صيدليات، مقاهٍ، محطات وقود...) وتصنيفها
+ثابت. brands.json بجانب categories.json يربط اسم العلامة وأسماءها البديلة
+برقم التصنيف. الأسماء تُطبّع وتُخزن في dict واحد، والبحث:
+
+- مطابق: الاسم المطبّع كاملاً هو اسم العلامة
+- بادئة: الاسم يبدأ باسم العلامة متبوعاً بكلمات أخرى ("ستاربكس العليا")
+
+البادئة مسموحة فقط لأسماء من كلمتين فأكثر (بدون al/el) أو لعلامة عليها
+"prefix": true في الملف (أسماء مميزة مثل ستاربكس). الكلمة المفردة العامة
+تطابق كاملةً فقط: "Panda Express" ليس بنده و"لولو للذهب" ليس هايبر ماركت.
+
+البادئة تُفحص بكلمات كاملة من الأطول إلى الأقصر، فالبحث بعدد كلمات أطول
+اسم علامة من عمليات dict (لا مسح للجدول). العدادات (مطابق/بادئة/فشل)
+تُضاف إلى تقارير المطابقة والاستيراد.
+"""
+
+import json
+from pathlib import Path
+
+import compressed_io
+
+ROOT = Path(__file__).parent
+BRANDS_PATH = ROOT / "wash-tasnifoh" / "data" / "brands.json"
+
+# أدوات تعريف لا تُحسب كلمة مستقلة ("al rajhi" كلمة واحدة)
+ARTICLES = {"al", "el", "the"}
+
+
+def prefix_safe(norm, flagged=False):
+    """هل يُقبل الاسم بادئةً لاسم أطول؟"""
+    return flagged or sum(1 for w in norm.split() if w not in ARTICLES) >= 2
+
+
+class BrandTable:
+    def __init__(self, brands, normalize, categories=None):
+        """brands: [{name_ar, name_en, category_id, aliases, prefix}]؛ categories لتجاهل أرقام غير موجودة"""
+        self.normalize = normalize
+        known = {c["id"] for c in categories} if categories is not None else None
+        self.table = {}  # الاسم المطبّع -> (رقم التصنيف، الاسم المعروض، يقبل البادئة)
+        self.unknown = []
+        for b in brands:
+            if known is not None and b["category_id"] not in known:
+                self.unknown.append(b.get("name_en") or b.get("name_ar"))
+                continue
+            label = b.get("name_ar") or b.get("name_en")
+            for name in (b.get("name_ar"), b.get("name_en"), *(b.get("aliases") or [])):
+                norm = normalize(name)
+                if norm:
+                    # أول علامة في الملف تبقى عند تكرار نفس الاسم
+                    self.table.setdefault(norm, (b["category_id"], label, prefix_safe(norm, b.get("prefix", False))))
+        self.max_words = max((len(k.split()) for k in self.table), default=0)
+        self.counters = {"lookups": 0, "exact": 0, "prefix": 0, "miss": 0}
+
+    def lookup_norm(self, norm):
+        """(رقم التصنيف، اسم العلامة، exact|prefix) لاسم مطبّع مسبقاً، أو None (بدون عدادات)"""
+        words = norm.split()
+        for n in range(min(self.max_words, len(words)), 0, -1):
+            hit = self.table.get(" ".join(words[:n]) if n < len(words) else norm)
+            if hit is not None and (n == len(words) or hit[2]):
+                return hit[0], hit[1], "exact" if n == len(words) else "prefix"
+        return None
+
+    def lookup(self, *names):
+        """أول اسم (عربي/إنجليزي...) يطابق علامة؛ العدادات تُحدّث مرة واحدة لكل استدعاء"""
+        self.counters["lookups"] += 1
+        for name in names:
+            norm = self.normalize(name)
+            if norm:
+                hit = self.lookup_norm(norm)
+                if hit is not None:
+                    self.counters[hit[2]] += 1
+                    return hit
+        self.counters["miss"] += 1
+        return None
+
+    def reset(self):
+        self.counters = dict.fromkeys(self.counters, 0)
+
+    def stats(self):
+        return {"names": len(self.table), "unknown_categories": len(self.unknown), **self.counters}
+
+    def __len__(self):
+        return len(self.table)
+
+
+def load_brands(normalize, path=BRANDS_PATH, categories=None):
+    """جدول العلامات من الملف؛ جدول فارغ إذا لم يوجد الملف"""
+    path = compressed_io.resolve(path)
+    brands = json.loads(compressed_io.read_text(path)) if path.exists() else []
+    return BrandTable(brands, normalize, categories)
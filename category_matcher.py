@@ -0,0 +1,543 @@
+"""
+خوارزمية مطابقة التصنيفات بناءً على الكلمات المفتاحية (نسخة Python)
+
+نفس منطق التقييم في wash-tasnifoh/lib/categoryMatcher.ts، لكن مع فهرس
+مقلوب (كلمة -> تصنيفات) حتى لا نقيّم إلا التصنيفات التي تشترك مع اسم
+المحل في كلمة واحدة على الأقل. أي تصنيف لا يشترك في كلمة لا يمكن أن
+يحصل على درجة في الخوارزمية الأصلية، لذا النتائج مطابقة للمسح الكامل.
+
+الوضع ثنائي اللغة (bilingual=True) يضيف name_en و search_key_words_en:
+كلمات الاستعلام تُصنّف حسب النص (عربي/لاتيني/مختلط) وكل تصنيف يُقيّم
+بمجموعة الكلمات التي بنفس نص الاستعلام فقط، في نفس المرور.
+"""
+
+import json
+import re
+from pathlib import Path
+
+import arabic_stemmer
+import brands as brand_table
+import keyword_idf
+import symspell_index
+import transliteration
+from json_stream import load_records
+
+ROOT = Path(__file__).parent
+CATS_PATH = ROOT / "wash-tasnifoh" / "data" / "categories.json"
+
+MATCH_FIELDS = (
+    "id", "name_ar", "name_en", "parent_id",
+    "search_key_words_ar", "search_key_words_en",
+    "negative_key_words_ar", "negative_key_words_en", "disallow_partial",
+)
+
+STOP_WORDS = {'و', 'في', 'من', 'إلى', 'على', 'عن', 'أو', 'ل', 'لل', 'ال', 'با', 'ب'}
+
+# التصحيح الإملائي (fuzzy): الكلمة الأصلية تبقى، والتصحيح كلمة إضافية بوزن أقل.
+# أقصر من 4 أحرف لا تُصحح، ومسافة 2 للكلمات من 8 أحرف فأكثر فقط؛ والتصحيح
+# يجب أن يظهر في FUZZY_MIN_COUNT تصنيفات على الأقل وأن يتفوق بوضوح على البديل
+FUZZY_WEIGHT = 0.5
+FUZZY_MIN_LEN = 4
+FUZZY_LONG_LEN = 8
+FUZZY_MIN_COUNT = 2
+FUZZY_MARGIN = 2.0
+
+# نص كل كلمة بعد التطبيع: عربي، لاتيني، مختلط (حروف الاثنين أو غيرهما)
+ARABIC, LATIN, MIXED = "ar", "latin", "mixed"
+_ARABIC_CHARS = re.compile(r'[؀-ۿ]')
+_LATIN_CHARS = re.compile(r'[a-z]')
+
+
+def normalize_text(text):
+    """تنظيف النص العربي من الحركات والتشكيل (مطابق لـ normalizeArabicText)"""
+    if not text:
+        return ""
+    t = str(text)
+    # فصل الحروف العربية واللاتينية المتجاورة (e.g., Shoppingزهور)
+    t = re.sub(r'([؀-ۿ])([A-Za-z]+)', r'\1 \2', t)
+    t = re.sub(r'([A-Za-z]+)([؀-ۿ])', r'\1 \2', t)
+    t = re.sub(r'[ً-ٟ]', '', t)
+    t = re.sub(r'[أإآ]', 'ا', t)
+    t = t.replace('ة', 'ه').replace('ى', 'ي')
+    t = re.sub(r'[\d_\-]', ' ', t)
+    t = re.sub(r'[^\w\s]', ' ', t)
+    return ' '.join(t.lower().split())
+
+
+def script_of(token):
+    """ARABIC | LATIN | MIXED لكلمة مطبّعة"""
+    ar = _ARABIC_CHARS.search(token) is not None
+    latin = _LATIN_CHARS.search(token) is not None
+    if ar and not latin and not _ARABIC_CHARS.sub('', token):
+        return ARABIC
+    if latin and not ar and token.isascii():
+        return LATIN
+    return MIXED
+
+
+def query_scripts(norm_text):
+    """النصوص التي يجب تقييم كلماتها: المختلط يُوجّه للعربي واللاتيني معاً"""
+    scripts = {script_of(tok) for tok in norm_text.split()}
+    if MIXED in scripts:
+        scripts |= {ARABIC, LATIN}
+    return scripts
+
+
+def extract_keywords(text):
+    """تقسيم النص إلى كلمات مع حذف الكلمات الشائعة"""
+    return [w for w in normalize_text(text).split() if len(w) > 1 and w not in STOP_WORDS]
+
+
+def similarity(norm1, norm2, allow_partial=True):
+    """درجة التشابه بين نصين مطبّعين مسبقاً"""
+    if norm1 == norm2:
+        return 1.0
+    t1 = norm1.split()
+    t2 = norm2.split()
+    if allow_partial:
+        if (len(t1) == 1 and t1[0] in t2) or (len(t2) == 1 and t2[0] in t1):
+            return 0.6
+    w1 = set(t1)
+    w2 = set(t2)
+    union = w1 | w2
+    if not union:
+        return 0.0
+    return len(w1 & w2) / len(union)
+
+
+class CategoryIndex:
+    """فهرس مطابقة مبني مسبقاً فوق قائمة التصنيفات"""
+
+    def __init__(self, categories, fuzzy=False, translit=False, stem=False, max_df_ratio=None,
+                 fuzzy_max_entries=symspell_index.MAX_ENTRIES, pruned=None, brands=False, bilingual=False):
+        self.categories = list(categories)
+        self.stem = stem
+        # bilingual: name_en و search_key_words_en تدخل الفهرس والتقييم للكلمات اللاتينية
+        self.bilingual = bilingual
+        self.max_df_ratio = max_df_ratio if pruned is None else None
+        self.by_id = {c["id"]: c for c in categories}
+        self.position = {c["id"]: pos for pos, c in enumerate(categories)}
+        self.live = len(categories)
+        self.tombstones = 0  # مواقع محذوفة تبقى فارغة حتى إعادة البناء
+        self.stale_aux = 0  # تعديلات لم تنعكس على SymSpell/التحويل اللاتيني
+        self.entries = []  # لكل تصنيف: (الاسم المطبّع، [(الكلمة، المطبّعة)], سالبة)
+        self.postings = {}  # كلمة مطبّعة -> مواقع التصنيفات
+        for pos, c in enumerate(categories):
+            self.entries.append(self._prepare(c))
+            for tok in self._tokens(pos):
+                self.postings.setdefault(tok, []).append(pos)
+
+        # الكلمات العامة (محل، متجر، store...) تخرج من قوائم المرشحين
+        self.df = keyword_idf.document_frequencies(self._tokens(pos) for pos in range(len(categories)))
+        self.pruned = set()
+        self.generic = {}
+        if pruned is not None:
+            # مجموعة محسوبة على التصنيفات كلها (فهرس جزئي/shard)
+            self.prune(pruned)
+        elif max_df_ratio is not None:
+            self.prune(keyword_idf.pruned_tokens(self.df, len(categories), max_df_ratio))
+
+        self.symspell = None
+        if fuzzy:
+            self.symspell = symspell_index.build_from_categories(
+                categories, normalize_text, max_entries=fuzzy_max_entries)
+
+        self.translit = None
+        if translit:
+            self.translit = transliteration.TransliterationIndex(categories, normalize=normalize_text)
+
+        # brands=True: جدول العلامات الافتراضي (brands.json)، أو مسار ملف آخر
+        self.brands = None
+        if brands:
+            path = brand_table.BRANDS_PATH if brands is True else brands
+            self.brands = brand_table.load_brands(normalize_text, path, categories)
+
+    def prune(self, tokens):
+        """نقل قوائم الكلمات العامة من المرشحين إلى قوائم الرجوع"""
+        for tok in set(tokens) & self.postings.keys():
+            self.pruned.add(tok)
+            self.generic[tok] = self.postings.pop(tok)
+
+    # ---- تحديثات حية لتصنيف واحد (بدون إعادة بناء الفهرس) ----
+
+    def add_category(self, c):
+        """إضافة تصنيف في آخر القائمة (نفس ترتيب إضافته في الملف)"""
+        if c["id"] in self.position:
+            raise ValueError(f"Category {c['id']} already indexed")
+        pos = len(self.categories)
+        self.categories.append(c)
+        self.entries.append(self._prepare(c))
+        self.by_id[c["id"]] = c
+        self.position[c["id"]] = pos
+        self.live += 1
+        toks = self._tokens(pos)
+        for tok in toks:
+            self._posting_list(tok).append(pos)
+        self.df.update(toks)
+        self._sync_pruning(toks, self.live - 1)
+        self._update_aux(c, removed=False)
+
+    def remove_category(self, cat_id):
+        """حذف تصنيف: يُزال من قوائم الكلمات ويبقى موقعه فارغاً"""
+        pos = self.position.pop(cat_id)
+        toks = self._tokens(pos)
+        for tok in toks:
+            self._posting_list(tok).remove(pos)
+            self.df[tok] -= 1
+        c = self.categories[pos]
+        self.categories[pos] = None
+        self.entries[pos] = None
+        del self.by_id[cat_id]
+        self.live -= 1
+        self.tombstones += 1
+        self._sync_pruning(toks, self.live + 1)
+        self._update_aux(c, removed=True)
+
+    def update_category(self, c):
+        """استبدال تصنيف موجود في نفس موقعه (مثلاً بعد إضافة كلمة مفتاحية)"""
+        pos = self.position[c["id"]]
+        old = self._tokens(pos)
+        self.categories[pos] = c
+        self.entries[pos] = self._prepare(c)
+        self.by_id[c["id"]] = c
+        new = self._tokens(pos)
+        for tok in old - new:
+            self._posting_list(tok).remove(pos)
+            self.df[tok] -= 1
+        for tok in new - old:
+            self._posting_list(tok).append(pos)
+            self.df[tok] += 1
+        self._sync_pruning(old ^ new, self.live)
+        self._update_aux(c, removed=bool(old - new))
+
+    def fragmentation(self):
+        """نسبة المواقع الفارغة والتعديلات غير المنعكسة إلى حجم الفهرس"""
+        return (self.tombstones + self.stale_aux) / max(1, len(self.categories))
+
+    def _posting_list(self, tok):
+        if tok in self.generic:
+            return self.generic[tok]
+        return self.postings.setdefault(tok, [])
+
+    def _sync_pruning(self, changed, old_live):
+        """إعادة تقييم الكلمات التي تغيّر تكرارها أو عبرت العتبة بتغيّر عدد التصنيفات"""
+        check = set(changed)
+        if self.max_df_ratio is not None:
+            old_limit = self.max_df_ratio * old_live
+            limit = self.max_df_ratio * self.live
+            if limit != old_limit:
+                lo, hi = sorted((old_limit, limit))
+                check.update(tok for tok, v in self.df.items() if lo < v <= hi)
+        for tok in check:
+            if self.df.get(tok, 0) <= 0:
+                self.df.pop(tok, None)
+                self.postings.pop(tok, None)
+                self.generic.pop(tok, None)
+                self.pruned.discard(tok)
+                continue
+            if self.max_df_ratio is None:
+                continue
+            generic = self.df[tok] > self.max_df_ratio * self.live
+            if generic and tok not in self.pruned:
+                self.pruned.add(tok)
+                self.generic[tok] = self.postings.pop(tok)
+            elif not generic and tok in self.pruned:
+                self.pruned.discard(tok)
+                self.postings[tok] = self.generic.pop(tok)
+
+    def _update_aux(self, c, removed):
+        if self.symspell is not None:
+            texts = [c.get("name_ar"), c.get("name_en")]
+            texts += (c.get("search_key_words_ar") or []) + (c.get("search_key_words_en") or [])
+            for tok in {t for text in texts for t in normalize_text(text or "").split() if len(t) > 1}:
+                if tok not in self.symspell.words:
+                    self.symspell.add(tok)
+            if removed:
+                # SymSpell لا يدعم الحذف: كلمات قديمة قد تبقى كاقتراحات حتى إعادة البناء
+                self.stale_aux += 1
+        if self.translit is not None:
+            self.stale_aux += 1
+
+    def live_categories(self):
+        return [c for c in self.categories if c is not None]
+
+    def _norm(self, text):
+        norm = normalize_text(text)
+        return arabic_stemmer.stem_text(norm) if self.stem else norm
+
+    def _keywords(self, values):
+        keywords = []
+        seen = set()
+        for kw in values or []:
+            norm = self._norm(kw)
+            if self.stem:
+                # الصيغ الصرفية لنفس الكلمة تُقيّم مرة واحدة
+                if norm in seen:
+                    continue
+                seen.add(norm)
+            keywords.append((kw, norm))
+        return keywords
+
+    def _prepare(self, c):
+        keywords = self._keywords(c.get("search_key_words_ar"))
+        negatives = []
+        for n in (c.get("negative_key_words_ar") or []) + (c.get("negative_key_words_en") or []):
+            tok = self._norm(n)
+            if tok:
+                negatives.append(tok)
+        # الاسم والكلمات الإنجليزية: (الاسم المطبّع، [(الكلمة، المطبّعة)]) أو None
+        latin = None
+        if self.bilingual:
+            latin = (self._norm(c.get("name_en")), self._keywords(c.get("search_key_words_en")))
+        return self._norm(c.get("name_ar")), keywords, negatives, latin
+
+    def _known(self, tok):
+        if tok in self.postings or tok in self.generic:
+            return True
+        if self.stem:
+            s = arabic_stemmer.stem(tok)
+            return s in self.postings or s in self.generic
+        return False
+
+    def _tokens(self, pos):
+        name_norm, keywords, _, latin = self.entries[pos]
+        toks = set(name_norm.split())
+        for _, norm in keywords:
+            toks.update(norm.split())
+        if latin is not None:
+            toks.update(latin[0].split())
+            for _, norm in latin[1]:
+                toks.update(norm.split())
+        return toks
+
+    def normalize_query(self, store_name):
+        """تطبيع اسم المحل مع المراحل الاختيارية (تحويل لاتيني، تجذيع)"""
+        return self.prepare_query(store_name)[0]
+
+    def prepare_query(self, store_name):
+        """(الاستعلام المطبّع، التصحيحات الإملائية كلمات إضافية منفصلة)"""
+        norm = normalize_text(store_name)
+        if self.translit is not None:
+            norm = self.transliterate(store_name, norm)
+        fuzzy = self.corrections(norm)
+        if self.stem:
+            return arabic_stemmer.stem_text(norm), tuple(arabic_stemmer.stem(w) for w in fuzzy)
+        return norm, fuzzy
+
+    def transliterate(self, raw, norm_text):
+        """تحويل التهجئات اللاتينية (Arabizi) إلى الصيغة العربية عبر المفتاح الصوتي"""
+        if transliteration.is_latin(raw):
+            hit = self.translit.lookup(raw)
+            if hit:
+                return hit
+        out = []
+        for tok in raw.split():
+            tok_norm = normalize_text(tok)
+            if transliteration.is_latin(tok) and not self._known(tok_norm):
+                tok_norm = self.translit.lookup(tok) or tok_norm
+            if tok_norm:
+                out.append(tok_norm)
+        return ' '.join(out) if out else norm_text
+
+    def corrections(self, norm_text):
+        """تصحيحات SymSpell للكلمات التي لا ترشّح أي تصنيف (مرحلة اختيارية)
+
+        لا تستبدل الكلمة الأصلية: أسماء العلم (العثيم، فهد، اسطنبول) غير
+        موجودة في المفردات لكنها صحيحة. التصحيح يُقبل فقط إذا كان أقرب مرشح
+        متكرراً في التصنيفات ومتفوقاً بوضوح على أي مرشح آخر بنفس المسافة.
+        """
+        if self.symspell is None:
+            return ()
+        out = []
+        for tok in norm_text.split():
+            if len(tok) < FUZZY_MIN_LEN or tok in STOP_WORDS or self._known(tok):
+                continue
+            max_d = 2 if len(tok) >= FUZZY_LONG_LEN else 1
+            hits = self.symspell.lookup(tok, max_d)
+            if not hits:
+                continue
+            best, d = hits[0]
+            count = self.symspell.words[best]
+            rival = next((self.symspell.words[w] for w, dw in hits[1:] if dw == d), 0)
+            if count >= FUZZY_MIN_COUNT and count >= FUZZY_MARGIN * rival and best not in out:
+                out.append(best)
+        return tuple(out)
+
+    def candidates(self, norm_text, fuzzy=()):
+        return self.candidates_with_source(norm_text, fuzzy)[0]
+
+    def candidates_with_source(self, norm_text, fuzzy=()):
+        """المرشحون ومصدرهم: "postings" أو "generic" (كلمات عامة فقط) أو None"""
+        cand = set()
+        generic = []
+        for tok in (*norm_text.split(), *fuzzy):
+            if tok in self.postings:
+                cand.update(self.postings[tok])
+            elif tok in self.generic:
+                generic.append(tok)
+        # استعلام مكوّن من كلمات عامة فقط (مثل "محل") يرجع للقوائم الكاملة
+        if cand:
+            return sorted(cand), "postings"
+        for tok in generic:
+            cand.update(self.generic[tok])
+        return sorted(cand), ("generic" if cand else None)
+
+    def score(self, pos, store_norm, store_words, scripts=None, fuzzy=()):
+        """تقييم تصنيف واحد (نفس أوزان matchCategories)
+
+        scripts: نصوص كلمات الاستعلام (query_scripts) في الوضع ثنائي اللغة؛ كلمة
+        عربية لا تشابه كلمة لاتينية أبداً، فتُقيّم فقط مجموعات الكلمات بنفس نص
+        الاستعلام وتبقى النتيجة كما لو قُيّمت المجموعتان.
+        fuzzy: تصحيحات إملائية تُقيّم ككلمات إضافية بوزن FUZZY_WEIGHT.
+        """
+        c = self.categories[pos]
+        name_norm, keywords, negatives, latin = self.entries[pos]
+        allow_partial = not c.get("disallow_partial")
+        total = 0.0
+        count = 0
+        matched = []
+        name = c.get("name_ar")
+        if latin is not None:
+            scripts = query_scripts(store_norm) if scripts is None else scripts
+            if LATIN not in scripts:
+                latin = None
+            elif ARABIC not in scripts:
+                # اسم لاتيني فقط: الاسم والكلمات الإنجليزية بنفس أوزان العربية
+                name, name_norm, keywords, latin = c.get("name_en"), latin[0], latin[1], None
+
+        name_score = similarity(store_norm, name_norm, allow_partial)
+        if latin is not None:
+            # اسم مختلط: أفضل تشابه بين الاسمين، والكلمات من المجموعتين
+            en_score = similarity(store_norm, latin[0], allow_partial)
+            if en_score > name_score:
+                name, name_score = c.get("name_en"), en_score
+            keywords = keywords + latin[1]
+        if name_score > 0.3:
+            total += name_score * 3
+            count += 1
+            matched.append(name)
+
+        for kw, kw_norm in keywords:
+            kw_score = similarity(store_norm, kw_norm, allow_partial)
+            if store_norm == kw_norm:
+                total += 3.0
+                count += 1
+                if kw not in matched:
+                    matched.append(kw)
+            elif kw_score > 0.3:
+                total += kw_score * 2
+                count += 1
+                if kw not in matched:
+                    matched.append(kw)
+
+            for word in store_words:
+                w_score = similarity(word, kw_norm, allow_partial)
+                if w_score > 0.5:
+                    total += w_score
+                    count += 1
+                    if kw not in matched:
+                        matched.append(kw)
+            for word in fuzzy:
+                w_score = similarity(word, kw_norm, allow_partial)
+                if w_score > 0.5:
+                    total += w_score * FUZZY_WEIGHT
+                    count += 1
+                    if kw not in matched:
+                        matched.append(kw)
+
+        if negatives:
+            store_set = set(store_words)
+            total -= 0.6 * sum(1 for n in negatives if n in store_set)
+
+        if count > 0 and total > 0:
+            return min(total / (count + 1), 1.0), matched
+        return 0.0, matched
+
+
+def brand_match(index, store_name):
+    """[مطابقة واحدة بثقة 1.0] إذا كان الاسم علامة تجارية معروفة، وإلا None"""
+    if index.brands is None:
+        return None
+    hit = index.brands.lookup(store_name)
+    if hit is None or hit[0] not in index.by_id:
+        return None
+    c = index.by_id[hit[0]]
+    return [{
+        "category": c,
+        "parent_category": index.by_id.get(c.get("parent_id")) if c.get("parent_id") else None,
+        "confidence": 1.0,
+        "matched_keywords": [hit[1]],
+    }]
+
+
+def match_categories(store_name, index, max_results=5):
+    """البحث عن التصنيفات المطابقة بناءً على اسم المحل (العلامات المعروفة أولاً بدون تقييم)"""
+    if not store_name or not store_name.strip():
+        return []
+    brand = brand_match(index, store_name)
+    if brand is not None:
+        return brand
+
+    store_norm, fuzzy = index.prepare_query(store_name)
+    scored, _ = score_candidates(index, store_norm, fuzzy)
+
+    matches = []
+    for confidence, pos, matched in scored[:max_results]:
+        c = index.categories[pos]
+        parent = index.by_id.get(c.get("parent_id")) if c.get("parent_id") else None
+        matches.append({
+            "category": c,
+            "parent_category": parent,
+            "confidence": confidence,
+            "matched_keywords": matched[:3],
+        })
+    return matches
+
+
+def score_candidates(index, store_norm, fuzzy=()):
+    """[(الثقة، الموقع، الكلمات المطابقة)] مرتبة لاستعلام مطبّع مسبقاً، + مصدر المرشحين
+
+    الترتيب بالثقة ثم بالموقع (نفس ترتيب الفرز المستقر في matchCategories)،
+    لذا يمكن دمج نتائج عدة فهارس جزئية بنفس المفتاح.
+    """
+    store_words = [w for w in store_norm.split() if len(w) > 1 and w not in STOP_WORDS]
+    scripts = query_scripts(store_norm) if index.bilingual else None
+    cand, source = index.candidates_with_source(store_norm, fuzzy)
+    scored = []
+    for pos in cand:
+        confidence, matched = index.score(pos, store_norm, store_words, scripts, fuzzy)
+        if confidence > 0.1:
+            scored.append((confidence, pos, matched))
+    scored.sort(key=lambda m: (-m[0], m[1]))
+    return scored, source
+
+
+def find_best_category(store_name, index):
+    """البحث عن تصنيف واحد (الأعلى ثقة)"""
+    matches = match_categories(store_name, index, 1)
+    return matches[0] if matches else None
+
+
+def load_index(path=CATS_PATH, fuzzy=False, translit=False, stem=False, max_df_ratio=None, brands=False,
+               bilingual=False):
+    # الحقول التي يستخدمها الفهرس فقط (بدون الأوصاف والتواريخ)
+    data = load_records(path, MATCH_FIELDS)
+    return CategoryIndex(data, fuzzy=fuzzy, translit=translit, stem=stem, max_df_ratio=max_df_ratio,
+                         brands=brands, bilingual=bilingual)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python category_matcher.py <store-name> [--fuzzy] [--translit] [--stem] [--prune-generic] [--brands] [--bilingual]")
+        sys.exit(1)
+    flags = sys.argv[2:]
+    idx = load_index(fuzzy="--fuzzy" in flags, translit="--translit" in flags, stem="--stem" in flags,
+                     max_df_ratio=keyword_idf.MAX_DF_RATIO if "--prune-generic" in flags else None,
+                     brands="--brands" in flags, bilingual="--bilingual" in flags)
+    if idx.symspell is not None:
+        print("SymSpell:", json.dumps(idx.symspell.stats()))
+    for m in match_categories(sys.argv[1], idx):
+        c = m["category"]
+        print(f"{m['confidence']:.3f}  [{c['id']}] {c['name_ar']} ({c['name_en']})  <- {', '.join(m['matched_keywords'])}")
@@ -0,0 +1,111 @@
+"""
+فتح ملفات البيانات مضغوطة أو غير مضغوطة بشفافية (gzip / zstd)
+
+- القراءة تكتشف الضغط من أول بايتات الملف (وليس من الامتداد) وتفك الضغط
+  بشكل متدفق، فلا يُفك الملف كاملاً في الذاكرة أبداً
+- resolve: إذا لم يوجد categories.json يُستخدم categories.json.zst أو .gz
+  بجانبه، فتبقى المسارات الافتراضية في السكربتات كما هي
+- الكتابة تختار الضغط من الامتداد (.gz / .zst) أو من المعامل codec
+
+zstd يتطلب مكتبة zstandard (اختيارية)؛ gzip من المكتبة القياسية.
+"""
+
+import gzip
+import io
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODECS = ("gzip", "zstd")
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+_MAGIC = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+
+
+def _require_zstd():
+    if zstandard is None:
+        raise RuntimeError("zstd compression needs the zstandard package (pip install zstandard)")
+
+
+def detect_codec(path):
+    """gzip | zstd | None حسب أول بايتات الملف"""
+    with open(path, "rb") as f:
+        head = f.read(4)
+    for magic, codec in _MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def codec_for_path(path):
+    """الضغط حسب الامتداد (للكتابة)"""
+    suffix = Path(path).suffix
+    return next((c for c, s in SUFFIXES.items() if s == suffix), None)
+
+
+def compressed_path(path, codec):
+    """pois.json -> pois.json.zst (بدون تكرار الامتداد)"""
+    path = Path(path)
+    if codec is None or codec_for_path(path) == codec:
+        return path
+    if codec not in SUFFIXES:
+        raise ValueError(f"Unknown compression {codec!r}; expected one of {', '.join(CODECS)}")
+    return path.with_name(path.name + SUFFIXES[codec])
+
+
+def resolve(path):
+    """المسار كما هو إن وُجد، وإلا نسخته المضغوطة (.zst ثم .gz) إن وُجدت"""
+    path = Path(path)
+    if path.exists():
+        return path
+    for codec in ("zstd", "gzip"):
+        alt = compressed_path(path, codec)
+        if alt.exists():
+            return alt
+    return path
+
+
+def open_read(path):
+    """ملف ثنائي للقراءة المتدفقة مع فك الضغط إن كان مضغوطاً"""
+    path = resolve(path)
+    codec = detect_codec(path)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    if codec == "zstd":
+        _require_zstd()
+        # مخزن وسيط حتى تعمل readline والتكرار سطراً سطراً كملف عادي
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    return open(path, "rb")
+
+
+def open_text(path, mode="r", encoding="utf-8"):
+    """ملف نصي: "r" يفك الضغط حسب المحتوى، "w" يضغط حسب الامتداد"""
+    if mode not in ("r", "w"):
+        raise ValueError(f"open_text mode must be 'r' or 'w', got {mode!r}")
+    raw = open_read(path) if mode == "r" else open_write(path)
+    return io.TextIOWrapper(raw, encoding=encoding)
+
+
+def open_write(path, codec=None):
+    """ملف ثنائي للكتابة؛ codec=None = حسب الامتداد"""
+    codec = codec or codec_for_path(path)
+    if codec == "gzip":
+        # mtime=0 حتى يبقى الناتج متطابقاً بين التشغيلات
+        return gzip.GzipFile(path, "wb", compresslevel=GZIP_LEVEL, mtime=0)
+    if codec == "zstd":
+        _require_zstd()
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, "wb"), closefd=True)
+    if codec is not None:
+        raise ValueError(f"Unknown compression {codec!r}; expected one of {', '.join(CODECS)}")
+    return open(path, "wb")
+
+
+def read_text(path, encoding="utf-8"):
+    """النص كاملاً (للملفات الصغيرة: قواميس، مجموعات تقييم)"""
+    with open_text(path, encoding=encoding) as f:
+        return f.read()
@@ -0,0 +1,235 @@
+"""
+كشف تصادم الكلمات المفتاحية بين التصنيفات (MinHash/LSH)
+
+يكتشف:
+- الكلمات المكررة حرفياً في أكثر من تصنيف
+- الكلمات شبه المتطابقة (تشابه حرفي عالٍ) بين تصنيفات مختلفة
+- التصنيفات ذات مجموعات كلمات متداخلة
+- الكلمات المركبة التي تحتوي كلمة تصنيف آخر (مثل "مخبز الكوكيز" في الكوكيز)
+
+كل ذلك بزمن شبه خطي بدلاً من المقارنة الزوجية بين كل التصنيفات.
+
+المصدر الافتراضي categories.json (المنسق يدوياً)؛ --bundled أو مسار ملف
+لفحص ناتج التوسيع. الكلمات المكررة المتتالية في تراكيب المولّد ("متجر متجر
+مواد البناء") تُدمج قبل المقارنة.
+
+    python detect_keyword_collisions.py [categories.json | --bundled]
+"""
+
+import json
+import random
+import sys
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+from json_stream import load_records
+from validate_keywords import normalize_arabic
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+BUNDLED = DATA_DIR / "categories_bundled.json"
+BASE = DATA_DIR / "categories.json"
+OUT_REPORT = DATA_DIR / "keyword_collisions_report.json"
+
+NUM_PERM = 32
+BANDS = 8  # 8 نطاقات × 4 صفوف => عتبة تقريبية ~0.6
+SHINGLE = 3
+NEAR_THRESHOLD = 0.6
+OVERLAP_THRESHOLD = 0.5
+MAX_EMBED_OWNERS = 3  # تجاهل الكلمات العامة المملوكة لتصنيفات كثيرة
+REPORT_LIMIT = 2000
+COLLISION_FIELDS = ("id", "name_ar", "name_en", "search_key_words_ar", "search_key_words_en")
+
+_PRIME = (1 << 61) - 1
+
+
+def load_categories(path=None):
+    src = Path(path) if path else BASE
+    data = load_records(src, COLLISION_FIELDS)
+    return data, src
+
+
+def _perm_params(num_perm=NUM_PERM, seed=1):
+    rnd = random.Random(seed)
+    return [(rnd.randrange(1, _PRIME), rnd.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+
+def shingles(text, k=SHINGLE):
+    """تقطيع النص إلى مقاطع حرفية بطول k"""
+    padded = f" {text} "
+    if len(padded) <= k:
+        return {padded}
+    return {padded[i:i + k] for i in range(len(padded) - k + 1)}
+
+
+def minhash(items, params):
+    """توقيع MinHash لمجموعة عناصر نصية"""
+    hashed = [zlib.crc32(s.encode("utf-8")) for s in items]
+    if not hashed:
+        return None
+    return tuple(min((a * x + b) % _PRIME for x in hashed) for a, b in params)
+
+
+def lsh_candidates(signatures, bands=BANDS):
+    """تجميع المفاتيح المتشابهة في دلاء LSH وإرجاع الأزواج المرشحة"""
+    buckets = defaultdict(list)
+    for key, sig in signatures.items():
+        rows = len(sig) // bands
+        for b in range(bands):
+            buckets[(b, sig[b * rows:(b + 1) * rows])].append(key)
+
+    pairs = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                a, b = members[i], members[j]
+                pairs.add((a, b) if a < b else (b, a))
+    return pairs
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def collapse_repeats(norm):
+    """دمج الكلمات المكررة المتتالية ("shopping shopping store" -> "shopping store")"""
+    words = norm.split()
+    return " ".join(w for i, w in enumerate(words) if i == 0 or w != words[i - 1])
+
+
+def category_keywords(cat):
+    """الكلمات المفتاحية المطبّعة للتصنيف (عربي + إنجليزي) مع أصلها"""
+    out = {}
+    for kw in (cat.get("search_key_words_ar") or []) + (cat.get("search_key_words_en") or []):
+        norm = collapse_repeats(normalize_arabic(kw))
+        if norm and norm not in out:
+            out[norm] = kw
+    return out
+
+
+def _ref(cat):
+    return {"id": cat.get("id"), "name_ar": cat.get("name_ar"), "name_en": cat.get("name_en")}
+
+
+def detect_collisions(categories, near_threshold=NEAR_THRESHOLD, overlap_threshold=OVERLAP_THRESHOLD):
+    params = _perm_params()
+    by_id = {c["id"]: c for c in categories}
+
+    # كلمة مطبّعة -> التصنيفات المالكة لها
+    owners = defaultdict(set)
+    cat_sets = {}
+    for c in categories:
+        kws = category_keywords(c)
+        cat_sets[c["id"]] = set(kws)
+        for norm in kws:
+            owners[norm].add(c["id"])
+
+    # 1) تكرار حرفي عبر التصنيفات
+    exact = [
+        {"keyword": kw, "categories": [_ref(by_id[i]) for i in sorted(ids)]}
+        for kw, ids in owners.items() if len(ids) > 1
+    ]
+    exact.sort(key=lambda x: -len(x["categories"]))
+
+    # 2) كلمات شبه متطابقة: توقيع واحد لكل كلمة فريدة
+    kw_shingles = {kw: shingles(kw) for kw in owners}
+    kw_sigs = {kw: minhash(sh, params) for kw, sh in kw_shingles.items()}
+    near = []
+    for a, b in lsh_candidates(kw_sigs):
+        if owners[a] == owners[b]:
+            continue
+        sim = jaccard(kw_shingles[a], kw_shingles[b])
+        if sim >= near_threshold:
+            near.append({
+                "keyword_a": a,
+                "categories_a": sorted(owners[a]),
+                "keyword_b": b,
+                "categories_b": sorted(owners[b]),
+                "similarity": round(sim, 3),
+            })
+    near.sort(key=lambda x: -x["similarity"])
+
+    # 3) تداخل مجموعات الكلمات بين التصنيفات
+    cat_sigs = {cid: minhash(s, params) for cid, s in cat_sets.items() if s}
+    overlaps = []
+    for a, b in lsh_candidates(cat_sigs):
+        sim = jaccard(cat_sets[a], cat_sets[b])
+        if sim >= overlap_threshold:
+            overlaps.append({
+                "a": _ref(by_id[a]),
+                "b": _ref(by_id[b]),
+                "jaccard": round(sim, 3),
+                "shared": sorted(cat_sets[a] & cat_sets[b])[:20],
+            })
+    overlaps.sort(key=lambda x: -x["jaccard"])
+
+    # 4) كلمة مركبة تحتوي كلمة مميزة لتصنيف آخر
+    embedded = []
+    for c in categories:
+        own = cat_sets[c["id"]]
+        for kw in own:
+            tokens = kw.split()
+            if len(tokens) < 2:
+                continue
+            for tok in tokens:
+                if tok in own:
+                    continue
+                others = owners.get(tok, set()) - {c["id"]}
+                if others and len(owners[tok]) <= MAX_EMBED_OWNERS:
+                    embedded.append({
+                        "keyword": kw,
+                        "category": _ref(c),
+                        "token": tok,
+                        "token_owners": [_ref(by_id[i]) for i in sorted(others)],
+                    })
+
+    summary = {
+        "categories": len(categories),
+        "unique_keywords": len(owners),
+        "exact_duplicates": len(exact),
+        "near_duplicates": len(near),
+        "overlapping_categories": len(overlaps),
+        "embedded_collisions": len(embedded),
+    }
+
+    # قائمة مختصرة لكل تصنيف يمكن للمدقق أو المشرف مراجعتها
+    flagged = defaultdict(set)
+    for e in embedded:
+        flagged[e["category"]["id"]].add(e["keyword"])
+    for n in near:
+        # التصنيف الذي يملك الكلمتين لا تصادم فيه؛ فقط من يملك إحداهما دون الأخرى
+        a, b = n["keyword_a"], n["keyword_b"]
+        for cid in owners[a] - owners[b]:
+            flagged[cid].add(a)
+        for cid in owners[b] - owners[a]:
+            flagged[cid].add(b)
+
+    return {
+        "summary": summary,
+        "flagged_keywords": {str(cid): sorted(kws) for cid, kws in sorted(flagged.items())},
+        "embedded": embedded[:REPORT_LIMIT],
+        "near_duplicates": near[:REPORT_LIMIT],
+        "overlapping_categories": overlaps[:REPORT_LIMIT],
+        "exact_duplicates": exact[:REPORT_LIMIT],
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    path = BUNDLED if "--bundled" in args else next((a for a in args if not a.startswith("--")), None)
+    cats, src = load_categories(path)
+    report = detect_collisions(cats)
+    report["source"] = str(src)
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print("Source:", src)
+    print("Report:", OUT_REPORT)
+    print("Summary:", json.dumps(report["summary"], ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+تقييم دقة وسرعة مطابقة التصنيفات على مجموعة معنونة
+
+يعيد تشغيل كل اسم محل في matcher_eval_set.json عبر category_matcher
+ويحسب دقة top-1/top-5 مع زمن الاستجابة (p50/p99) والإنتاجية، ويقارن
+الترتيب بين ملفي تصنيفات (مثلاً categories_complete.json مقابل
+categories_validated.json) لمعرفة أثر أي تعديل على الجودة والسرعة معاً.
+
+    python evaluate_matcher.py [--taxonomy A.json] [--against B.json] [--set matcher_eval_set.json] [--repeat 5]
+                               [--fuzzy] [--translit] [--stem] [--prune-generic] [--brands] [--bilingual]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import category_matcher
+import compressed_io
+import keyword_idf
+from json_stream import load_records
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+EVAL_SET = ROOT / "matcher_eval_set.json"
+BASE = DATA_DIR / "categories.json"
+OUT_REPORT = DATA_DIR / "matcher_eval_report.json"
+
+
+def load_labeled(path=EVAL_SET):
+    return json.loads(compressed_io.read_text(path))
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def evaluate(index, labeled, repeat=1, k=5, match=None):
+    """دقة top-1/top-k وزمن الاستجابة لكل استعلام"""
+    match = match or category_matcher.match_categories
+    brands = getattr(index, "brands", None)
+    if brands is not None:
+        brands.reset()
+    latencies = []
+    rankings = []
+    top1 = topk = 0
+    for item in labeled:
+        ok = {item["expected_id"], *item.get("also_ok", [])}
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            res = match(item["name"], index, k)
+            latencies.append(time.perf_counter() - t0)
+        ids = [m["category"]["id"] for m in res]
+        rankings.append(ids)
+        if ids and ids[0] in ok:
+            top1 += 1
+        if ok & set(ids):
+            topk += 1
+
+    n = len(labeled)
+    total = sum(latencies)
+    latencies.sort()
+    summary = {
+        "queries": n,
+        "top1_accuracy": round(top1 / n, 4) if n else 0.0,
+        f"top{k}_accuracy": round(topk / n, 4) if n else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1e3, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1e3, 4),
+        "throughput_qps": round(len(latencies) / total, 2) if total else None,
+    }
+    if brands is not None:
+        summary["brands"] = brands.stats()
+    return summary, rankings
+
+
+def diff_rankings(labeled, rank_a, rank_b):
+    """الاستعلامات التي تغيّر ترتيبها بين نسختين من التصنيفات"""
+    changed = []
+    gained = lost = 0
+    for item, a, b in zip(labeled, rank_a, rank_b):
+        if a == b:
+            continue
+        ok = {item["expected_id"], *item.get("also_ok", [])}
+        a_ok = bool(a) and a[0] in ok
+        b_ok = bool(b) and b[0] in ok
+        gained += (b_ok and not a_ok)
+        lost += (a_ok and not b_ok)
+        changed.append({
+            "name": item["name"],
+            "expected_id": item["expected_id"],
+            "a_top5": a,
+            "b_top5": b,
+            "a_top1_correct": a_ok,
+            "b_top1_correct": b_ok,
+        })
+    return {"changed": len(changed), "top1_gained": gained, "top1_lost": lost, "queries": changed}
+
+
+def index_options(flags):
+    return {
+        "fuzzy": "--fuzzy" in flags,
+        "translit": "--translit" in flags,
+        "stem": "--stem" in flags,
+        "max_df_ratio": keyword_idf.MAX_DF_RATIO if "--prune-generic" in flags else None,
+        "brands": "--brands" in flags,
+        "bilingual": "--bilingual" in flags,
+    }
+
+
+def _arg(flags, name, default=None):
+    if name in flags:
+        i = flags.index(name)
+        if i + 1 < len(flags):
+            return flags[i + 1]
+    return default
+
+
+def main():
+    flags = sys.argv[1:]
+    taxonomy = Path(_arg(flags, "--taxonomy", BASE))
+    against = _arg(flags, "--against")
+    labeled = load_labeled(_arg(flags, "--set", EVAL_SET))
+    repeat = int(_arg(flags, "--repeat", 5))
+    opts = index_options(flags)
+
+    cats_a = load_records(taxonomy, category_matcher.MATCH_FIELDS)
+    summary_a, rank_a = evaluate(category_matcher.CategoryIndex(cats_a, **opts), labeled, repeat)
+    report = {"options": opts, "a": {"taxonomy": str(taxonomy), **summary_a}}
+
+    if against:
+        cats_b = load_records(against, category_matcher.MATCH_FIELDS)
+        summary_b, rank_b = evaluate(category_matcher.CategoryIndex(cats_b, **opts), labeled, repeat)
+        report["b"] = {"taxonomy": str(against), **summary_b}
+        report["diff"] = diff_rankings(labeled, rank_a, rank_b)
+
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    for side in ("a", "b"):
+        if side in report:
+            print(f"{side.upper()}:", json.dumps(report[side], ensure_ascii=False))
+    if "diff" in report:
+        d = report["diff"]
+        print(f"Diff: {d['changed']} changed, top1 +{d['top1_gained']} / -{d['top1_lost']}")
+    print("Report:", OUT_REPORT)
+
+
+if __name__ == "__main__":
+    main()
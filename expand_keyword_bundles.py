@@ -1,17 +1,24 @@
 import json
+import sys
 from pathlib import Path
 
+import compressed_io
+import profiling
+import synonyms
+from artifact_io import DEFAULT_FORMAT, FORMATS, artifact_path, is_format, load_artifact, write_records
+
 ROOT = Path(__file__).parent
 DATA_DIR = ROOT / "wash-tasnifoh" / "data"
 MERGED = DATA_DIR / "categories_merged.json"
 BASE = DATA_DIR / "categories.json"
 OUT = DATA_DIR / "categories_bundled.json"
 REPORT = DATA_DIR / "bundles_report.json"
+PROFILE = DATA_DIR / "bundles_profile.json"
 
 
 def load_categories():
-    src = MERGED if MERGED.exists() else BASE
-    data = json.loads(src.read_text(encoding="utf-8"))
+    src = MERGED if compressed_io.resolve(MERGED).exists() else BASE
+    data = load_artifact(src)
     return data, src
 
 
@@ -28,27 +35,17 @@ def uniq(seq):
     return out
 
 
-# قاموس مرادفات/مثيلات مبسّط (قابل للتوسعة لاحقاً)
-AR_SYNONYMS = {
-    "مخبز": ["خبز", "مخابز", "مخبوزات", "تميس", "خبز تميس", "تنور"],
-    "معجنات": ["فطائر", "مناقيش", "باتيه", "كرواسون", "سبرينغ رول"],
-    "حلويات": ["حلويات شرقية", "بقلاوة", "كنافة", "بسبوسة", "لقيمات"],
-    "متجر زهور": ["محل ورد", "زهور", "ورد"],
-    "أحجار كريمة": ["حجر كريم", "ألماس", "ماس", "زمرد", "ياقوت", "سافير", "فيروز", "عقيق"],
-    "مطعم": ["مطاعم", "مطاعم ومأكولات", "مطاعم فطور", "مطاعم شعبية"],
-    "فول": ["فلافل", "طعمية", "فول وطعمية"],
-    "ورق عنب": ["دوالي", "يبرق", "دولمة"],
-}
-
-EN_SYNONYMS = {
-    "bakery": ["bread", "pastries", "bakes"],
-    "pastry": ["pastries", "croissant", "puff"],
-    "florist": ["flower shop", "flowers"],
-    "gemstones": ["gemstone", "diamond", "emerald", "ruby", "sapphire", "turquoise", "agate"],
-    "restaurant": ["restaurants", "diner", "eatery"],
-    "beans": ["fava", "falafel"],
-    "grape leaves": ["dolma", "yaprak", "warak enab"],
-}
+# قاموس مرادفات/مثيلات مبسّط (جدولا bundles_ar و bundles_en في synonyms.json)
+AR_SYNONYMS = synonyms.table("bundles_ar")
+EN_SYNONYMS = synonyms.table("bundles_en")
+
+
+def _synonym_keys(table, word):
+    """مفاتيح الجدول التي تساوي الكلمة أو تحتويها في مرادفاتها، بترتيب الجدول"""
+    ids = set(table.keys_with_value(word))
+    if word in table.index:
+        ids.add(table.index[word])
+    return sorted(ids)
 
 
 def is_food_category(cat: dict) -> bool:
@@ -82,7 +79,7 @@ def gen_en_variants(kw: str, food: bool) -> list[str]:
     return out
 
 
-def expand_category(cat: dict) -> dict:
+def expand_category(cat: dict, dedupe_stems: bool = False) -> dict:
     food = is_food_category(cat)
     ar = list(cat.get("search_key_words_ar") or [])
     en = list(cat.get("search_key_words_en") or [])
@@ -93,9 +90,8 @@ def expand_category(cat: dict) -> dict:
         if not base:
             continue
         # قاموس عربي
-        for k, vals in AR_SYNONYMS.items():
-            if base == k or base in vals:
-                ar += vals
+        for i in _synonym_keys(AR_SYNONYMS, base):
+            ar += AR_SYNONYMS.values[i]
         # توليد تراكيب عامة
         ar += gen_ar_variants(base, food)
 
@@ -103,9 +99,8 @@ def expand_category(cat: dict) -> dict:
         base = (kw or "").strip().lower()
         if not base:
             continue
-        for k, vals in EN_SYNONYMS.items():
-            if base == k or base in vals:
-                en += vals
+        for i in _synonym_keys(EN_SYNONYMS, base):
+            en += EN_SYNONYMS.values[i]
         en += gen_en_variants(base, food)
 
     # مرادفات لبعض الأسماء نفسها (اسم التصنيف)
@@ -120,39 +115,69 @@ def expand_category(cat: dict) -> dict:
         en += EN_SYNONYMS.get(base, [])
 
     # تنظيف وتحديد سقف منطقي للتوسيع لكل فئة
-    cat["search_key_words_ar"] = uniq(ar)[:80]
+    ar = uniq(ar)
+    if dedupe_stems:
+        # مخبز/مخابز/المخبز تأخذ خانة واحدة فقط من السقف
+        from arabic_stemmer import dedupe_by_stem
+        from category_matcher import normalize_text
+        ar = dedupe_by_stem(ar, normalize_text)
+    cat["search_key_words_ar"] = ar[:80]
     cat["search_key_words_en"] = uniq(en)[:80]
     return cat
 
 
-def main():
-    cats, src = load_categories()
+def bundle_categories(cats: list, dedupe_stems: bool = False, profiler=None) -> dict:
+    """توسيع كل التصنيفات في الذاكرة وإرجاع أرقام التقرير"""
+    prof = profiler or profiling.DISABLED
     before_ar = sum(len(c.get("search_key_words_ar") or []) for c in cats)
     before_en = sum(len(c.get("search_key_words_en") or []) for c in cats)
 
-    for c in cats:
-        expand_category(c)
+    with prof.stage("derive", rows=len(cats)):
+        for c in cats:
+            expand_category(c, dedupe_stems)
 
-    after_ar = sum(len(c.get("search_key_words_ar") or []) for c in cats)
-    after_en = sum(len(c.get("search_key_words_en") or []) for c in cats)
-
-    OUT.write_text(json.dumps(cats, ensure_ascii=False, indent=2), encoding="utf-8")
-    REPORT.write_text(json.dumps({
-        "source": str(src),
-        "output": str(OUT),
+    return {
         "ar_before": before_ar,
-        "ar_after": after_ar,
+        "ar_after": sum(len(c.get("search_key_words_ar") or []) for c in cats),
         "en_before": before_en,
-        "en_after": after_en,
-    }, ensure_ascii=False, indent=2), encoding="utf-8")
+        "en_after": sum(len(c.get("search_key_words_en") or []) for c in cats),
+        "dedupe_stems": dedupe_stems,
+    }
+
+
+def write_bundles(cats: list, stats: dict, src, fmt=DEFAULT_FORMAT) -> dict:
+    out = write_records(OUT, cats, fmt)
+    report = {"source": str(src), "output": str(out), **stats}
+    REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return report
+
+
+def main(dedupe_stems: bool = False, profile: bool = False, fmt=DEFAULT_FORMAT):
+    prof = profiling.Profiler("expand_keyword_bundles", enabled=profile)
+    with prof.stage("load"):
+        cats, src = load_categories()
+
+    stats = bundle_categories(cats, dedupe_stems, prof)
+
+    with prof.stage("serialize", rows=len(cats)):
+        write_bundles(cats, stats, src, fmt)
 
+    before_ar, after_ar = stats["ar_before"], stats["ar_after"]
+    before_en, after_en = stats["en_before"], stats["en_after"]
     print("Source:", src)
-    print("Output:", OUT)
+    print("Output:", artifact_path(OUT, fmt))
     print("Report:", REPORT)
     print("AR:", before_ar, "->", after_ar, "(diff:", after_ar - before_ar, ")")
     print("EN:", before_en, "->", after_en, "(diff:", after_en - before_en, ")")
+    if prof.write(PROFILE):
+        print("Profile:", PROFILE)
 
 
 if __name__ == "__main__":
-    main()
+    flags = sys.argv[1:]
+    fmt = flags[flags.index("--format") + 1] if "--format" in flags else DEFAULT_FORMAT
+    if not is_format(fmt):
+        print(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)}, optionally + .gz / .zst)")
+        sys.exit(2)
+    main(dedupe_stems="--dedupe-stems" in flags, profile="--profile" in flags, fmt=fmt)
 
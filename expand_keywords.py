@@ -1,6 +1,8 @@
 import json
 import re
 
+import compressed_io
+
 # Keyword expansion rules based on category names and patterns
 def expand_english_keywords(name_en, existing_keywords):
     """Generate additional English keywords based on category name"""
@@ -172,7 +174,7 @@ def expand_keywords_for_all_categories(input_file, output_file):
     """Read JSON, expand keywords, and write back"""
 
     print("Reading file...")
-    with open(input_file, 'r', encoding='utf-8') as f:
+    with compressed_io.open_text(input_file) as f:
         data = json.load(f)
 
     print(f"Processing {len(data)} categories...")
@@ -196,7 +198,7 @@ def expand_keywords_for_all_categories(input_file, output_file):
             )
 
     print("Writing updated file...")
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with compressed_io.open_text(output_file, 'w') as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
 
     print(f"Done! Updated {len(data)} categories.")
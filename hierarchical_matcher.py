@@ -0,0 +1,182 @@
+"""
+تصنيف هرمي على مرحلتين: التصنيفات الرئيسية أولاً ثم الفرعية داخل أفضلها
+
+matchCategories يقيّم كل تصنيف يشارك الاستعلام كلمة (رئيسياً كان أو فرعياً).
+هنا:
+
+1) توجيه: لكل تصنيف رئيسي مجموعة كلمات مجمّعة من نفسه ومن كل فروعه؛ الاستعلام
+   يُقيّم على الرئيسيات فقط بمجموع وزن IDF للكلمات المشتركة (بحث في dict لكل كلمة)
+2) تقييم: المرشحون يُجمعون من قوائم كلمات مقسمة حسب الرئيسي (كلمة -> رئيسي ->
+   مواقع) لأفضل TOP_ROOTS رئيسيات فقط، فلا تُبنى مجموعة المرشحين المسطحة، ثم
+   يُقيّمون بنفس دالة CategoryIndex.score، فالثقة والترتيب بنفس مقياس الوضع المسطح
+
+إذا لم يبقَ أي مرشح داخل الرئيسيات المختارة نرجع للمرشحين المسطحين حتى لا
+يخسر الاستعلام نتيجة كان سيحصل عليها.
+
+    python hierarchical_matcher.py [--roots 5] [--repeat 5] [--taxonomy categories.json] [--stem] ...
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+from category_matcher import (CATS_PATH, FUZZY_WEIGHT, MATCH_FIELDS, STOP_WORDS, CategoryIndex, brand_match,
+                              query_scripts)
+from json_stream import load_records
+from sharded_matcher import root_of
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+OUT_REPORT = DATA_DIR / "hierarchical_matcher_report.json"
+
+# على بيانات التقييم: 3 رئيسيات تخسر ~1% من top1 مقابل ربع العمل، و5 تحافظ على الدقة كاملة
+TOP_ROOTS = 5
+
+
+class HierarchicalIndex:
+    def __init__(self, categories, top_roots=TOP_ROOTS, **options):
+        self.index = CategoryIndex(categories, **options)
+        self.top_roots = top_roots
+        cats = self.index.categories
+        by_id = self.index.by_id
+        self.root_of = [root_of(c, by_id) for c in cats]  # موقع -> رقم التصنيف الرئيسي
+        self.roots = sorted(set(self.root_of), key=lambda rid: self.index.position[rid])
+
+        # كلمة -> الرئيسيات التي تظهر في أي من فروعها، ووزنها IDF على مستوى الرئيسيات
+        root_tokens = {}
+        for pos in range(len(cats)):
+            root_tokens.setdefault(self.root_of[pos], set()).update(self.index._tokens(pos))
+        self.root_postings = {}
+        for rid in self.roots:
+            for tok in root_tokens[rid]:
+                self.root_postings.setdefault(tok, []).append(rid)
+        n = len(self.roots)
+        self.root_idf = {tok: math.log(n / len(rids)) + 1.0 for tok, rids in self.root_postings.items()}
+
+        # قوائم الكلمات (العادية والعامة) مقسمة حسب الرئيسي: كلمة -> {رقم الرئيسي: مواقع}
+        self.by_root = {}
+        for table in (self.index.postings, self.index.generic):
+            for tok, positions in table.items():
+                split = self.by_root.setdefault(tok, {})
+                for pos in positions:
+                    split.setdefault(self.root_of[pos], []).append(pos)
+        self.scored = 0  # عدد التصنيفات المقيّمة (لمقارنة العمل مع الوضع المسطح)
+
+    def route(self, store_norm, fuzzy=()):
+        """[(الوزن، رقم الرئيسي)] مرتبة تنازلياً (التعادل بترتيب الملف)"""
+        weights = {}
+        # التصحيحات الإملائية بوزن أقل، والكلمة الأصلية تغلب إن تكررت
+        toks = {tok: FUZZY_WEIGHT for tok in fuzzy}
+        toks.update((tok, 1.0) for tok in store_norm.split())
+        for tok, w in toks.items():
+            if len(tok) <= 1 or tok in STOP_WORDS:
+                continue
+            for rid in self.root_postings.get(tok, ()):
+                weights[rid] = weights.get(rid, 0.0) + self.root_idf[tok] * w
+        return sorted(((w, rid) for rid, w in weights.items()),
+                      key=lambda x: (-x[0], self.index.position[x[1]]))
+
+    def candidates_with_source(self, store_norm, fuzzy, best):
+        """نفس CategoryIndex.candidates_with_source لكن من قوائم الرئيسيات best فقط"""
+        index = self.index
+        toks = (*store_norm.split(), *fuzzy)
+        for table, source in ((index.postings, "postings"), (index.generic, "generic")):
+            hit = [tok for tok in toks if tok in table]
+            if not hit:
+                continue
+            cand = set()
+            for tok in hit:
+                split = self.by_root[tok]
+                for rid in best:
+                    cand.update(split.get(rid, ()))
+            if cand:
+                return sorted(cand), source
+            break
+        # لا مرشح داخل الرئيسيات المختارة: المرشحون المسطحون
+        return index.candidates_with_source(store_norm, fuzzy)
+
+    def score_candidates(self, store_norm, fuzzy=()):
+        """نفس مخرجات category_matcher.score_candidates لكن داخل أفضل الرئيسيات فقط"""
+        index = self.index
+        store_words = [w for w in store_norm.split() if len(w) > 1 and w not in STOP_WORDS]
+        scripts = query_scripts(store_norm) if index.bilingual else None
+        best = [rid for _, rid in self.route(store_norm, fuzzy)[:self.top_roots]]
+        cand, source = self.candidates_with_source(store_norm, fuzzy, best)
+        self.scored += len(cand)
+        scored = []
+        for pos in cand:
+            confidence, matched = index.score(pos, store_norm, store_words, scripts, fuzzy)
+            if confidence > 0.1:
+                scored.append((confidence, pos, matched))
+        scored.sort(key=lambda m: (-m[0], m[1]))
+        return scored, source
+
+
+def match_hierarchical(store_name, hindex, max_results=5):
+    """نفس شكل نتائج match_categories"""
+    if not store_name or not store_name.strip():
+        return []
+    index = hindex.index
+    brand = brand_match(index, store_name)
+    if brand is not None:
+        return brand
+    scored, _ = hindex.score_candidates(*index.prepare_query(store_name))
+    matches = []
+    for confidence, pos, matched in scored[:max_results]:
+        c = index.categories[pos]
+        parent = index.by_id.get(c.get("parent_id")) if c.get("parent_id") else None
+        matches.append({
+            "category": c,
+            "parent_category": parent,
+            "confidence": confidence,
+            "matched_keywords": matched[:3],
+        })
+    return matches
+
+
+def _arg(flags, name, default=None):
+    if name in flags:
+        i = flags.index(name)
+        if i + 1 < len(flags):
+            return flags[i + 1]
+    return default
+
+
+def main():
+    from evaluate_matcher import diff_rankings, evaluate, index_options, load_labeled
+
+    flags = sys.argv[1:]
+    top_roots = int(_arg(flags, "--roots", TOP_ROOTS))
+    repeat = int(_arg(flags, "--repeat", 5))
+    options = index_options(flags)
+    categories = load_records(Path(_arg(flags, "--taxonomy", CATS_PATH)), MATCH_FIELDS)
+    labeled = load_labeled()
+
+    hindex = HierarchicalIndex(categories, top_roots=top_roots, **options)
+    flat = hindex.index
+    flat_scored = sum(len(flat.candidates(flat.normalize_query(item["name"]))) for item in labeled)
+
+    flat_summary, flat_rank = evaluate(flat, labeled, repeat)
+    hindex.scored = 0
+    hier_summary, hier_rank = evaluate(hindex, labeled, repeat, match=match_hierarchical)
+    hier_scored = hindex.scored / repeat
+
+    report = {
+        "options": {**options, "top_roots": top_roots},
+        "roots": len(hindex.roots),
+        "categories": len(categories),
+        "flat": {**flat_summary, "scored_per_query": round(flat_scored / len(labeled), 2)},
+        "hierarchical": {**hier_summary, "scored_per_query": round(hier_scored / len(labeled), 2)},
+        "diff": diff_rankings(labeled, flat_rank, hier_rank),
+    }
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    for side in ("flat", "hierarchical"):
+        print(f"{side}:", json.dumps(report[side], ensure_ascii=False))
+    d = report["diff"]
+    print(f"Diff: {d['changed']} changed, top1 +{d['top1_gained']} / -{d['top1_lost']}")
+    print("Report:", OUT_REPORT)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,33 @@
+import codecs
+import contextlib
 import csv
+import glob
+import hashlib
+import io
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import profiling
+from artifact_io import DEFAULT_FORMAT, FORMATS, artifact_path, is_format, iter_artifact, load_artifact, write_records
+from json_stream import load_records
+from poi_records import IdSet, PoiTable
+
 # Robust open with multiple encodings
 def open_text_multi(path):
     encodings = ["utf-8-sig", "utf-16", "utf-8", "cp1256", "latin1"]
+    # open() never fails on encoding, so probe the first chunk with each decoder
+    with open(path, "rb") as fb:
+        head = fb.read(1 << 16)
     last_err = None
     for enc in encodings:
+        if enc == "utf-16" and not head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            continue
         try:
+            codecs.getincrementaldecoder(enc)().decode(head, final=False)
             return open(path, "r", encoding=enc, newline="")
         except Exception as e:
             last_err = e
@@ -22,10 +41,158 @@ OUT_POIS = ROOT / "wash-tasnifoh" / "data" / "pois.json"
 OUT_REPORT = ROOT / "wash-tasnifoh" / "data" / "pois_import_report.json"
 OUT_CATS_FROM_CSV = ROOT / "wash-tasnifoh" / "data" / "categories_from_csv.json"
 OUT_CATS_MERGED = ROOT / "wash-tasnifoh" / "data" / "categories_merged.json"
+OUT_PROFILE = ROOT / "wash-tasnifoh" / "data" / "pois_import_profile.json"
+OUT_CHECKPOINT = ROOT / "wash-tasnifoh" / "data" / "pois_import_checkpoint.json"
+OUT_IMPORT_STATE = ROOT / "wash-tasnifoh" / "data" / "pois_import_state.json"
+
+# Lookup mode only needs names and hierarchy; authoritative mode rewrites full records
+LOOKUP_FIELDS = ("id", "name_en", "name_ar", "parent_id")
+
+CHECKPOINT_EVERY = 50_000
+
+
+def _raw_encoding(path):
+    """الترميز الفعلي وطول BOM (للقراءة من موضع بايت محدد)"""
+    with open_text_multi(path) as f:
+        enc = f.encoding
+    with open(path, "rb") as fb:
+        head = fb.read(4)
+    if enc == "utf-16":
+        return ("utf-16-le" if head.startswith(codecs.BOM_UTF16_LE) else "utf-16-be"), 2
+    if enc == "utf-8-sig":
+        return "utf-8", 3 if head.startswith(codecs.BOM_UTF8) else 0
+    return enc, 0
+
+
+def iter_rows_with_offsets(csv_path, start=None, fieldnames=None):
+    """صفوف CSV مع موضع البايت بعد نهاية كل صف
+
+    عند تمرير start يجب تمرير fieldnames (السطر الأول لن يُقرأ).
+    """
+    enc, bom = _raw_encoding(csv_path)
+    offset = start or bom
+    with open(csv_path, "rb") as raw:
+        raw.seek(offset)
+        f = io.TextIOWrapper(raw, encoding=enc, newline="")
+
+        def lines():
+            nonlocal offset
+            for line in iter(f.readline, ""):
+                offset += len(line.encode(enc))
+                yield line
+
+        reader = csv.DictReader(lines(), fieldnames=fieldnames)
+        for row in reader:
+            # حقل بين علامتي تنصيص قد يمتد لعدة أسطر؛ الموضع بعد آخرها
+            yield row, offset, reader.fieldnames
 
 
-def load_categories():
-    data = json.loads((CATS_PATH).read_text(encoding="utf-8"))
+def _iter_rows(csv_path):
+    with open_text_multi(csv_path) as f:
+        for row in csv.DictReader(f):
+            yield row, None, None
+
+
+def source_fingerprint(csv_path, offset=None):
+    """بصمة الملف: بداية الملف (الترويسة) وآخر 4KB قبل الموضع المعالج"""
+    with open(csv_path, "rb") as fb:
+        head = fb.read(1 << 16 if offset is None else min(offset, 1 << 16))
+        tail = b""
+        if offset:
+            fb.seek(max(0, offset - 4096))
+            tail = fb.read(offset - max(0, offset - 4096))
+    return {
+        "head_sha256": hashlib.sha256(head).hexdigest(),
+        "tail_sha256": hashlib.sha256(tail).hexdigest(),
+    }
+
+
+def _atomic_write(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ImportCheckpoint:
+    """نقطة استئناف: الموضع والعدادات + ملفات جزئية (JSONL) للمخرجات
+
+    الصفوف تُلحق بالملفات الجزئية أولاً ثم يُكتب ملف النقطة ذرياً بأطوالها؛
+    عند الاستئناف تُقص الملفات لهذه الأطوال فيُتجاهل ما كُتب بعد آخر نقطة.
+    """
+
+    def __init__(self, path, every=CHECKPOINT_EVERY):
+        self.path = Path(path)
+        self.every = every
+        self.pois_path = self.path.with_name(self.path.stem + ".pois.jsonl")
+        self.unmatched_path = self.path.with_name(self.path.stem + ".unmatched.jsonl")
+        self._pois = self._unmatched = None
+
+    def load(self, meta):
+        """حالة النقطة السابقة إن كانت لنفس الملف ونفس الإعدادات"""
+        if not self.path.exists():
+            return None
+        state = json.loads(self.path.read_text(encoding="utf-8"))
+        if state.get("meta") != meta:
+            return None
+        csv_path = Path(meta["csv"])
+        if csv_path.stat().st_size < state["offset"]:
+            return None
+        if source_fingerprint(csv_path, state["offset"]) != state["fingerprint"]:
+            return None
+        return state
+
+    def open(self, state=None):
+        for path, key in ((self.pois_path, "pois_bytes"), (self.unmatched_path, "unmatched_bytes")):
+            if state:
+                with open(path, "r+b") as f:
+                    f.truncate(state[key])
+            else:
+                path.write_bytes(b"")
+        self._pois = open(self.pois_path, "a", encoding="utf-8")
+        self._unmatched = open(self.unmatched_path, "a", encoding="utf-8")
+
+    def read_parts(self):
+        with open(self.pois_path, encoding="utf-8") as f:
+            pois = PoiTable(json.loads(line) for line in f)
+        with open(self.unmatched_path, encoding="utf-8") as f:
+            unmatched = [json.loads(line) for line in f]
+        return pois, unmatched
+
+    def add_poi(self, poi):
+        self._pois.write(json.dumps(poi, ensure_ascii=False) + "\n")
+
+    def add_unmatched(self, item):
+        self._unmatched.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+    def save(self, meta, offset, fieldnames, counters):
+        for f in (self._pois, self._unmatched):
+            f.flush()
+            os.fsync(f.fileno())
+        state = {
+            "meta": meta,
+            "offset": offset,
+            "fingerprint": source_fingerprint(meta["csv"], offset),
+            "fieldnames": fieldnames,
+            "counters": counters,
+            "pois_bytes": self._pois.tell(),
+            "unmatched_bytes": self._unmatched.tell(),
+        }
+        _atomic_write(self.path, json.dumps(state, ensure_ascii=False))
+
+    def clear(self):
+        for f in (self._pois, self._unmatched):
+            if f:
+                f.close()
+        for path in (self.path, self.pois_path, self.unmatched_path):
+            path.unlink(missing_ok=True)
+
+
+def load_categories(data=None, fields=None):
+    if data is None:
+        data = load_records(CATS_PATH, fields)
     # Index by English and Arabic names (normalized lowercase)
     by_en = {}
     by_ar = {}
@@ -39,6 +206,30 @@ def load_categories():
     return data, by_id, by_en, by_ar
 
 
+def build_fuzzy_name_index(cats):
+    """فهرس SymSpell لأسماء التصنيفات المطبّعة (مرحلة اختيارية لتصحيح الأخطاء)"""
+    from category_matcher import normalize_text
+    from symspell_index import SymSpellIndex
+
+    index = SymSpellIndex()
+    by_norm = {}
+    for c in cats:
+        for name in (c.get("name_en"), c.get("name_ar")):
+            norm = normalize_text(name)
+            if norm and norm not in by_norm:
+                by_norm[norm] = c
+                index.add(norm)
+
+    def lookup(name):
+        norm = normalize_text(name)
+        if not norm:
+            return None
+        hit = index.best(norm, 1 if len(norm) <= 5 else 2)
+        return by_norm.get(hit) if hit else None
+
+    return lookup, index
+
+
 def sanitize_code(name: str) -> str:
     import re
     base = (name or "").upper()
@@ -48,18 +239,16 @@ def sanitize_code(name: str) -> str:
     return base[:12]
 
 
-def derive_categories_from_csv(csv_path: Path, cats_existing: list):
-    # Build normalized lookups for existing categories
-    by_en = { (c.get("name_en") or "").strip().lower(): c for c in cats_existing if c.get("name_en") }
-    by_ar = { (c.get("name_ar") or "").strip(): c for c in cats_existing if c.get("name_ar") }
-
+def scan_csv_categories(csv_path: Path, start=None, fieldnames=None):
+    """Unique (category, subcategory) names found in the CSV, in first-seen order"""
     # Track unique categories/subcategories found in CSV
     unique_cats = {}
     unique_subs = {}
 
-    with open_text_multi(csv_path) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    # start: only rows appended after this byte offset (incremental import)
+    rows = iter_rows_with_offsets(csv_path, start, fieldnames) if start else _iter_rows(csv_path)
+    with contextlib.closing(rows):
+        for row, _, _ in rows:
             cat_en = (row.get("category_en") or "").strip()
             cat_ar = (row.get("category_ar") or "").strip()
             sub_en = (row.get("sub_category_en") or "").strip()
@@ -76,6 +265,25 @@ def derive_categories_from_csv(csv_path: Path, cats_existing: list):
                         "cat_en": cat_en, "cat_ar": cat_ar,
                         "name_en": sub_en, "name_ar": sub_ar,
                     }
+    return unique_cats, unique_subs
+
+
+def derive_categories_from_csv(csv_path: Path, cats_existing: list, start=None, fieldnames=None,
+                               fmt=DEFAULT_FORMAT):
+    unique_cats, unique_subs = scan_csv_categories(csv_path, start, fieldnames)
+    return derive_categories(unique_cats, unique_subs, cats_existing, fmt)
+
+
+def derive_categories(unique_cats: dict, unique_subs: dict, cats_existing: list, fmt=DEFAULT_FORMAT):
+    # Build normalized lookups for existing categories
+    # Categories auto-created by an earlier incremental run are not name-matched;
+    # top-level ones only match their exact CSV key, as they would within a single full import
+    def is_auto(c):
+        return (c.get("code") or "").startswith("AUTO_")
+    by_en = { (c.get("name_en") or "").strip().lower(): c for c in cats_existing if c.get("name_en") and not is_auto(c) }
+    by_ar = { (c.get("name_ar") or "").strip(): c for c in cats_existing if c.get("name_ar") and not is_auto(c) }
+    auto_cats = { ((c.get("name_en") or "").strip().lower(), (c.get("name_ar") or "").strip()): c
+                  for c in cats_existing if is_auto(c) and not c.get("parent_id") }
 
     # Create/merge categories
     merged = list(cats_existing)
@@ -89,7 +297,7 @@ def derive_categories_from_csv(csv_path: Path, cats_existing: list):
     # Ensure top-level categories
     cat_map = {}  # (cat_en.lower(), cat_ar) -> id
     for (cen, car), val in unique_cats.items():
-        existing = find_cat(val["name_en"], val["name_ar"])
+        existing = find_cat(val["name_en"], val["name_ar"]) or auto_cats.get((cen, car))
         if existing:
             cat_id = existing["id"]
         else:
@@ -183,8 +391,8 @@ def derive_categories_from_csv(csv_path: Path, cats_existing: list):
             cats_from_csv.append(next(c for c in merged if c["id"] == sid))
             added.add(sid)
 
-    OUT_CATS_FROM_CSV.write_text(json.dumps(cats_from_csv, ensure_ascii=False, indent=2), encoding="utf-8")
-    OUT_CATS_MERGED.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_records(OUT_CATS_FROM_CSV, cats_from_csv, fmt)
+    write_records(OUT_CATS_MERGED, merged, fmt)
 
     return {
         "cat_map": cat_map,
@@ -194,24 +402,96 @@ def derive_categories_from_csv(csv_path: Path, cats_existing: list):
     }, merged
 
 
-def import_pois(csv_path: Path, authoritative_from_csv: bool = True):
-    cats, by_id, by_en, by_ar = load_categories()
+def _brand_category(brand, by_id, counters):
+    """(التصنيف الرئيسي، الفرعي) لعلامة معروفة"""
+    hit = by_id.get(brand[0])
+    if not hit:
+        return None, None
+    counters["matched_brand"] += 1
+    if hit.get("parent_id"):
+        return by_id.get(hit["parent_id"]), hit
+    return hit, None
+
+
+def run_import(csv_path: Path, authoritative_from_csv: bool = True, fuzzy: bool = False, profiler=None,
+               categories=None, checkpoint_every=None, resume=False, since=None, write_outputs=True,
+               fmt=DEFAULT_FORMAT, derived=None, brands=False):
+    """الاستيراد الكامل مع إرجاع البيانات في الذاكرة (pois والتصنيفات المدمجة)
+
+    checkpoint_every: حفظ نقطة استئناف كل N صف في OUT_CHECKPOINT
+    resume: المتابعة من آخر نقطة (إن كانت لنفس الملف والإعدادات)
+    since: (offset, fieldnames) لمعالجة الصفوف المضافة بعد هذا الموضع فقط؛
+           (None, None) = الملف كاملاً مع تتبع المواضع. النتيجة تتضمن offset لآخر صف.
+    fmt: صيغة pois والتصنيفات المشتقة (json | compact | jsonl | msgpack، انظر artifact_io)
+    derived: (cat_maps, merged) محسوبة مسبقاً من عدة ملفات (import_many) بدلاً من اشتقاقها هنا
+    brands: جدول العلامات التجارية (True = brands.json أو مسار ملف)؛ اسم المحل الذي يطابق
+            علامة معروفة يأخذ تصنيفها قبل النظر في أعمدة التصنيف، وفي الوضع المعتمد
+            فقط إذا لم تُحل أعمدة CSV
+    """
+    prof = profiler or profiling.DISABLED
+    with prof.stage("load"):
+        cats, by_id, by_en, by_ar = load_categories(categories, None if authoritative_from_csv else LOOKUP_FIELDS)
     cat_maps = None
     merged = cats
     if authoritative_from_csv:
-        cat_maps, merged = derive_categories_from_csv(csv_path, cats)
+        prof.start("derive")
+        cat_maps, merged = derived or derive_categories_from_csv(csv_path, cats, *(since or (None, None)), fmt=fmt)
         # refresh indexes
         by_id = { c["id"]: c for c in merged }
         by_en = { (c.get("name_en") or "").strip().lower(): c for c in merged if c.get("name_en") }
         by_ar = { (c.get("name_ar") or "").strip(): c for c in merged if c.get("name_ar") }
+        prof.stop("derive", rows=len(merged))
 
-    pois = []
+    pois = PoiTable()
     unmatched = []
     counters = {"rows": 0, "matched": 0, "matched_sub": 0, "matched_cat_only": 0, "unmatched": 0}
 
-    with open_text_multi(csv_path) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    brand_table = None
+    if brands:
+        from brands import BRANDS_PATH, load_brands
+        from category_matcher import normalize_text
+        brand_table = load_brands(normalize_text, BRANDS_PATH if brands is True else brands, merged)
+        counters["matched_brand"] = 0
+
+    fuzzy_lookup = fuzzy_index = None
+    if fuzzy and not authoritative_from_csv:
+        fuzzy_lookup, fuzzy_index = build_fuzzy_name_index(merged)
+        counters["matched_fuzzy"] = 0
+
+    checkpoint = None
+    start, fieldnames = since or (None, None)
+    if checkpoint_every or resume:
+        checkpoint = ImportCheckpoint(OUT_CHECKPOINT, checkpoint_every or CHECKPOINT_EVERY)
+        stat = Path(csv_path).stat()
+        meta = {
+            "csv": str(Path(csv_path).resolve()),
+            "authoritative": authoritative_from_csv,
+            "fuzzy": fuzzy_lookup is not None,
+            "brands": brand_table is not None,
+        }
+        state = checkpoint.load(meta) if resume else None
+        checkpoint.open(state)
+        if resume and not state:
+            print("No usable checkpoint for this CSV; starting from the beginning")
+        if state:
+            pois, unmatched = checkpoint.read_parts()
+            counters = state["counters"]
+            start, fieldnames = state["offset"], state["fieldnames"]
+            print(f"Resuming at row {counters['rows']} (byte {start} of {stat.st_size})")
+
+    prof.start("map")
+    if checkpoint or since:
+        rows = iter_rows_with_offsets(csv_path, start, fieldnames)
+    else:
+        rows = _iter_rows(csv_path)
+    saved_rows, prev_offset = counters["rows"], start
+    with contextlib.closing(rows):
+        for row, offset, fieldnames in rows:
+            if checkpoint and counters["rows"] - saved_rows >= checkpoint.every:
+                # النقطة تُسجّل قبل الصف الحالي: الموضع هو نهاية الصف السابق
+                checkpoint.save(meta, prev_offset, fieldnames, counters)
+                saved_rows = counters["rows"]
+            prev_offset = offset
             counters["rows"] += 1
 
             poi_id_raw = (row.get("id") or "").strip()
@@ -231,8 +511,16 @@ def import_pois(csv_path: Path, authoritative_from_csv: bool = True):
 
             cat = None
             sub = None
-
-            if authoritative_from_csv and cat_maps:
+            authoritative = bool(authoritative_from_csv and cat_maps)
+            # الوضع المعتمد: أعمدة CSV أولاً والعلامة فقط إذا لم تُحل؛ غير ذلك العلامة أولاً
+            brand = None
+            if brand_table is not None and not authoritative:
+                brand = brand_table.lookup(name_ar, name_en)
+
+            if brand:
+                # سلسلة معروفة: تصنيفها ثابت مهما كانت أعمدة CSV
+                cat, sub = _brand_category(brand, by_id, counters)
+            elif authoritative:
                 # Use derived maps from CSV as truth
                 key_cat = (cat_en.lower(), cat_ar)
                 if (sub_en or sub_ar):
@@ -259,6 +547,24 @@ def import_pois(csv_path: Path, authoritative_from_csv: bool = True):
                         cat = by_en.get(cat_en)
                     if not cat and cat_ar:
                         cat = by_ar.get(cat_ar)
+                if not cat and not sub and fuzzy_lookup:
+                    # أسماء فيها أخطاء إملائية (ة/ه، ى/ي، حرف ناقص...)
+                    sub = (sub_en and fuzzy_lookup(sub_en)) or (sub_ar and fuzzy_lookup(sub_ar)) or None
+                    if sub and sub.get("parent_id"):
+                        cat = by_id.get(sub.get("parent_id"))
+                    elif sub:
+                        cat, sub = sub, None
+                    else:
+                        cat = (cat_en and fuzzy_lookup(cat_en)) or (cat_ar and fuzzy_lookup(cat_ar)) or None
+                    if cat or sub:
+                        counters["matched_fuzzy"] += 1
+
+            # أعمدة فارغة تُشتق كتصنيف فارغ، فلا تُعد محلولة
+            unresolved = not (cat or sub) or not (cat_en or cat_ar or sub_en or sub_ar)
+            if authoritative and brand_table is not None and unresolved:
+                brand = brand_table.lookup(name_ar, name_en)
+                if brand:
+                    cat, sub = _brand_category(brand, by_id, counters)
 
             if not cat and not sub:
                 counters["unmatched"] += 1
@@ -271,6 +577,8 @@ def import_pois(csv_path: Path, authoritative_from_csv: bool = True):
                     "sub_category_en": row.get("sub_category_en"),
                     "sub_category_ar": row.get("sub_category_ar"),
                 })
+                if checkpoint:
+                    checkpoint.add_unmatched(unmatched[-1])
                 continue
 
             if sub:
@@ -280,40 +588,299 @@ def import_pois(csv_path: Path, authoritative_from_csv: bool = True):
 
             counters["matched"] += 1
 
-            poi = {
-                "id": poi_id,
-                "name_en": name_en,
-                "name_ar": name_ar,
-                "category_id": (sub.get("parent_id") if sub else (cat.get("id") if cat else None)),
-                "category_name_en": (cat.get("name_en") if cat else None) or (by_id.get(sub.get("parent_id"), {}).get("name_en") if sub else None),
-                "category_name_ar": (cat.get("name_ar") if cat else None) or (by_id.get(sub.get("parent_id"), {}).get("name_ar") if sub else None),
-                "subcategory_id": (sub.get("id") if sub else None),
-                "subcategory_name_en": (sub.get("name_en") if sub else None),
-                "subcategory_name_ar": (sub.get("name_ar") if sub else None),
-                }
-            pois.append(poi)
-
-    OUT_POIS.write_text(json.dumps(pois, ensure_ascii=False, indent=2), encoding="utf-8")
-    OUT_REPORT.write_text(json.dumps({"summary": counters, "unmatched": unmatched[:200]}, ensure_ascii=False, indent=2), encoding="utf-8")
-    return counters, len(unmatched)
+            # أسماء التصنيف/الفرعي تُخزن مرة واحدة كوسم مشترك (poi_records.PoiTable)
+            ref = pois.label(
+                (sub.get("parent_id") if sub else (cat.get("id") if cat else None)),
+                (cat.get("name_en") if cat else None) or (by_id.get(sub.get("parent_id"), {}).get("name_en") if sub else None),
+                (cat.get("name_ar") if cat else None) or (by_id.get(sub.get("parent_id"), {}).get("name_ar") if sub else None),
+                (sub.get("id") if sub else None),
+                (sub.get("name_en") if sub else None),
+                (sub.get("name_ar") if sub else None),
+            )
+            pois.append(poi_id, name_en, name_ar, ref)
+            if checkpoint:
+                checkpoint.add_poi(pois[-1])
+    prof.stop("map", rows=counters["rows"])
+
+    result = {"counters": counters, "unmatched": unmatched, "pois": pois, "merged": merged,
+              "offset": prev_offset, "fieldnames": fieldnames,
+              "brands": brand_table.stats() if brand_table is not None else None,
+              "fuzzy_index": fuzzy_index.stats() if fuzzy_index is not None else None}
+    if not write_outputs:
+        return result
+
+    prof.start("serialize")
+    pois.write(OUT_POIS, fmt)
+    report = {"summary": counters, "unmatched": unmatched[:200]}
+    for key in ("fuzzy_index", "brands"):
+        if result[key] is not None:
+            report[key] = result[key]
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    prof.stop("serialize", rows=len(pois))
+    if checkpoint:
+        checkpoint.clear()
+    return result
+
+
+def import_pois(csv_path: Path, authoritative_from_csv: bool = True, fuzzy: bool = False, profiler=None,
+                checkpoint_every=None, resume=False, fmt=DEFAULT_FORMAT, brands=False):
+    result = run_import(csv_path, authoritative_from_csv, fuzzy, profiler,
+                        checkpoint_every=checkpoint_every, resume=resume, fmt=fmt, brands=brands)
+    return result["counters"], len(result["unmatched"])
+
+
+def resolve_csv_inputs(arg) -> list:
+    """مسار ملف أو مجلد (كل *.csv فيه) أو نمط glob -> قائمة ملفات مرتبة"""
+    path = Path(arg)
+    if path.is_dir():
+        return sorted(path.glob("*.csv"))
+    if any(ch in str(arg) for ch in "*?["):
+        return [Path(p) for p in sorted(glob.glob(str(arg), recursive=True)) if Path(p).is_file()]
+    return [path] if path.exists() else []
+
+
+def _map_file(csv_path, authoritative_from_csv, fuzzy, categories, derived, brands=False):
+    """تُشغّل في عملية منفصلة: فك ترميز ملف واحد ومطابقة صفوفه"""
+    t0 = time.perf_counter()
+    result = run_import(csv_path, authoritative_from_csv, fuzzy, categories=categories,
+                        write_outputs=False, derived=derived, brands=brands)
+    return result, time.perf_counter() - t0
+
+
+def import_many(csv_paths: list, authoritative_from_csv: bool = True, fuzzy: bool = False, profiler=None,
+                jobs=None, fmt=DEFAULT_FORMAT, brands=False):
+    """استيراد عدة ملفات CSV (مناطق) بالتوازي في pois واحد بدلاً من تشغيلات متتالية يلغي آخرها ما قبله
+
+    1) مسح أسماء التصنيفات في كل ملف بالتوازي ثم اشتقاق التصنيفات مرة واحدة بترتيب
+       الملفات (نفس النتيجة كأن الملفات ملف واحد متصل)
+    2) مطابقة صفوف كل ملف بالتوازي (jobs عملية كحد أقصى)
+    3) الدمج بترتيب الملفات مع حذف المعرفات المكررة عبر الملفات (أول ظهور يبقى)
+    """
+    prof = profiler or profiling.DISABLED
+    csv_paths = [Path(p) for p in csv_paths]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(csv_paths)))
+    with prof.stage("load"):
+        cats = load_categories(None, None if authoritative_from_csv else LOOKUP_FIELDS)[0]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        derived = None
+        if authoritative_from_csv:
+            with prof.stage("derive", rows=len(csv_paths)):
+                unique_cats, unique_subs = {}, {}
+                for cats_i, subs_i in pool.map(scan_csv_categories, csv_paths):
+                    for k, v in cats_i.items():
+                        unique_cats.setdefault(k, v)
+                    for k, v in subs_i.items():
+                        unique_subs.setdefault(k, v)
+                derived = derive_categories(unique_cats, unique_subs, cats, fmt)
+                cats = derived[1]
+
+        prof.start("map")
+        futures = [pool.submit(_map_file, p, authoritative_from_csv, fuzzy, cats, derived, brands)
+                   for p in csv_paths]
+        pois = PoiTable()
+        seen = IdSet()
+        unmatched = []
+        counters = {}
+        files = []
+        brand_stats = fuzzy_stats = None
+        # النتائج تُجمع بترتيب الملفات حتى يكون الناتج حتمياً
+        for path, fut in zip(csv_paths, futures):
+            file_result, seconds = fut.result()
+            file_counters, file_unmatched, file_pois = (file_result[k] for k in ("counters", "unmatched", "pois"))
+            # فهرس الأسماء التقريبي يُبنى من نفس التصنيفات في كل عملية: إحصائياته واحدة
+            fuzzy_stats = fuzzy_stats or file_result["fuzzy_index"]
+            file_brands = file_result["brands"]
+            if file_brands is not None:
+                brand_stats = brand_stats or dict(file_brands, lookups=0, exact=0, prefix=0, miss=0)
+                for k in ("lookups", "exact", "prefix", "miss"):
+                    brand_stats[k] += file_brands[k]
+            dups = pois.extend(file_pois, seen)
+            for k, v in file_counters.items():
+                counters[k] = counters.get(k, 0) + v
+            unmatched += file_unmatched
+            files.append({"path": str(path), **file_counters, "pois": len(file_pois) - dups,
+                          "duplicate_ids": dups, "seconds": round(seconds, 3)})
+        prof.stop("map", rows=counters.get("rows", 0))
+
+    counters["duplicate_ids"] = sum(f["duplicate_ids"] for f in files)
+    counters["files"] = len(files)
+    prof.start("serialize")
+    pois.write(OUT_POIS, fmt)
+    report = {"summary": counters, "files": files, "unmatched": unmatched[:200]}
+    if fuzzy_stats is not None:
+        report["fuzzy_index"] = fuzzy_stats
+    if brand_stats is not None:
+        report["brands"] = brand_stats
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    prof.stop("serialize", rows=len(pois))
+    return {"counters": counters, "unmatched": unmatched, "pois": pois, "files": files,
+            "fuzzy_index": fuzzy_stats, "brands": brand_stats}
+
+
+def _incremental_mode(state, meta, csv_path):
+    """full | append | unchanged حسب حالة آخر استيراد وبصمة الملف"""
+    fmt = meta["format"]
+    if not state or state.get("meta") != meta or not artifact_path(OUT_POIS, fmt).exists():
+        return "full"
+    if meta["authoritative"] and not artifact_path(OUT_CATS_MERGED, fmt).exists():
+        return "full"
+    size = Path(csv_path).stat().st_size
+    if size < state["offset"] or source_fingerprint(csv_path, state["offset"]) != state["fingerprint"]:
+        # الملف أعيدت كتابته (وليس مجرد إضافة صفوف)
+        return "full"
+    return "unchanged" if size == state["offset"] else "append"
+
+
+def import_incremental(csv_path: Path, authoritative_from_csv: bool = True, fuzzy: bool = False, profiler=None,
+                       fmt=DEFAULT_FORMAT, brands=False):
+    """استيراد الصفوف المضافة فقط منذ آخر تشغيل ودمجها في pois.json حسب id
+
+    يُحفظ في OUT_IMPORT_STATE موضع آخر صف وبصمة بداية الملف ونهاية الجزء
+    المعالج؛ إذا تغيّرت البصمة أو صغر الملف يُعاد الاستيراد الكامل.
+    """
+    meta = {
+        "csv": str(Path(csv_path).resolve()),
+        "authoritative": authoritative_from_csv,
+        "fuzzy": bool(fuzzy and not authoritative_from_csv),
+        "format": fmt,
+        "brands": bool(brands),
+    }
+    state = json.loads(OUT_IMPORT_STATE.read_text(encoding="utf-8")) if OUT_IMPORT_STATE.exists() else None
+    mode = _incremental_mode(state, meta, csv_path)
+    incremental = {"mode": mode, "new_rows": 0, "inserted": 0, "updated": 0, "removed": 0}
+
+    if mode == "unchanged":
+        incremental["total_pois"] = state["total_pois"]
+        return {"counters": {"rows": 0}, "unmatched": [], "incremental": incremental}
+
+    if mode == "full":
+        result = run_import(csv_path, authoritative_from_csv, fuzzy, profiler, since=(None, None), fmt=fmt,
+                            brands=brands)
+        counters, pois = result["counters"], result["pois"]
+        incremental["new_rows"], incremental["inserted"] = counters["rows"], len(pois)
+        rows_total = counters["rows"]
+    else:
+        prev_from_csv = []
+        base = None
+        if authoritative_from_csv:
+            base = load_artifact(artifact_path(OUT_CATS_MERGED, fmt))
+            if artifact_path(OUT_CATS_FROM_CSV, fmt).exists():
+                prev_from_csv = load_artifact(artifact_path(OUT_CATS_FROM_CSV, fmt))
+        result = run_import(csv_path, authoritative_from_csv, fuzzy, profiler, categories=base,
+                            since=(state["offset"], state["fieldnames"]), write_outputs=False, fmt=fmt,
+                            brands=brands)
+        counters = result["counters"]
+        incremental["new_rows"] = counters["rows"]
+        rows_total = state["rows_total"] + counters["rows"]
+
+        pois = PoiTable(iter_artifact(artifact_path(OUT_POIS, fmt)))
+        pos = {poi_id: i for i, poi_id in enumerate(pois.ids)}
+        new_ids = set()
+        for poi in result["pois"]:
+            new_ids.add(poi["id"])
+            i = pos.get(poi["id"])
+            if i is None:
+                pos[poi["id"]] = len(pois)
+                pois.append_dict(poi)
+                incremental["inserted"] += 1
+            elif pois[i] != poi:
+                pois.set_dict(i, poi)
+                incremental["updated"] += 1
+        # صف جديد لنفس id لم يعد يطابق أي تصنيف => يُحذف الإدخال القديم
+        dropped = ({u["id"] for u in result["unmatched"]} - new_ids) & pos.keys()
+        if dropped:
+            pois = pois.filtered(dropped)
+            incremental["removed"] = len(dropped)
+
+        if authoritative_from_csv:
+            # derive كتب التصنيفات الموجودة في الصفوف الجديدة فقط؛ نضيف لها السابقة
+            new_from_csv = load_artifact(artifact_path(OUT_CATS_FROM_CSV, fmt))
+            seen = {c["id"] for c in prev_from_csv}
+            prev_from_csv += [c for c in new_from_csv if c["id"] not in seen]
+            write_records(OUT_CATS_FROM_CSV, prev_from_csv, fmt)
+
+        pois.write(OUT_POIS, fmt)
+
+    incremental["total_pois"] = len(pois)
+    report = {"summary": counters, "incremental": incremental, "unmatched": result["unmatched"][:200]}
+    if result.get("brands") is not None:
+        report["brands"] = result["brands"]
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    offset = result["offset"] or 0
+    _atomic_write(OUT_IMPORT_STATE, json.dumps({
+        "meta": meta,
+        "offset": offset,
+        "fieldnames": result["fieldnames"] or (state or {}).get("fieldnames"),
+        "fingerprint": source_fingerprint(csv_path, offset),
+        "rows_total": rows_total,
+        "total_pois": len(pois),
+    }, ensure_ascii=False, indent=2))
+    return {"counters": counters, "unmatched": result["unmatched"], "incremental": incremental}
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python import_pois_from_csv.py <path-to-csv> [--no-authoritative]")
+        print("Usage: python import_pois_from_csv.py <csv | directory | glob> [--no-authoritative] [--fuzzy] [--profile]"
+              " [--checkpoint-every N] [--resume] [--incremental] [--format json|compact|jsonl|msgpack[.gz|.zst]] [--jobs N]"
+              " [--brands]")
         print("Example: python import_pois_from_csv.py \"F:/TRX_LOG/poi_ready_categories_all_1500.csv\"")
+        print("Example: python import_pois_from_csv.py \"F:/TRX_LOG/regions/*.csv\" --jobs 4")
         sys.exit(1)
-    csv_path = Path(sys.argv[1])
-    if not csv_path.exists():
-        print(f"CSV not found: {csv_path}")
+    csv_paths = resolve_csv_inputs(sys.argv[1])
+    if not csv_paths:
+        print(f"CSV not found: {sys.argv[1]}")
+        sys.exit(2)
+    csv_path = csv_paths[0]
+    flags = sys.argv[2:]
+    authoritative = "--no-authoritative" not in flags
+    # --fuzzy: تصحيح أسماء التصنيفات في الأعمدة عبر SymSpell (مع --no-authoritative فقط)
+    fuzzy = "--fuzzy" in flags
+    if fuzzy and authoritative:
+        print("--fuzzy only applies with --no-authoritative (authoritative mode uses the CSV columns as-is)")
         sys.exit(2)
-    authoritative = True
-    if len(sys.argv) > 2 and sys.argv[2] == "--no-authoritative":
-        authoritative = False
-    counters, unmatched = import_pois(csv_path, authoritative_from_csv=authoritative)
+    # --brands: أسماء السلاسل المعروفة (brands.json) تأخذ تصنيفها الثابت (بعد أعمدة CSV في الوضع المعتمد)
+    brands = "--brands" in flags
+    prof = profiling.Profiler("import_pois", enabled="--profile" in flags)
+    # نقاط الاستئناف معطلة افتراضياً: --checkpoint-every N لتفعيلها، و--resume يتابع من آخر نقطة
+    # بعد توقف التشغيل (ويحفظ كل CHECKPOINT_EVERY صف إن لم يُحدد N)
+    every = None
+    if "--checkpoint-every" in flags:
+        every = int(flags[flags.index("--checkpoint-every") + 1])
+    # صيغة المخرجات الكبيرة (pois والتصنيفات المشتقة)؛ json الافتراضية هي ما تقرؤه الواجهة
+    fmt = DEFAULT_FORMAT
+    if "--format" in flags:
+        fmt = flags[flags.index("--format") + 1]
+        if not is_format(fmt):
+            print(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)}, optionally + .gz / .zst)")
+            sys.exit(2)
+    if len(csv_paths) > 1:
+        if "--incremental" in flags or "--resume" in flags:
+            print("--incremental/--resume work on a single CSV")
+            sys.exit(2)
+        # ملفات المناطق: مطابقة متوازية وناتج واحد مدمج مع تفصيل لكل ملف في التقرير
+        jobs = int(flags[flags.index("--jobs") + 1]) if "--jobs" in flags else None
+        result = import_many(csv_paths, authoritative_from_csv=authoritative, fuzzy=fuzzy, profiler=prof,
+                             jobs=jobs, fmt=fmt, brands=brands)
+        counters = result["counters"]
+        for f in result["files"]:
+            print(f"  {f['path']}: rows={f['rows']} pois={f['pois']} duplicates={f['duplicate_ids']}")
+    elif "--incremental" in flags:
+        # ملفات التصدير تنمو بإضافة صفوف: معالجة الجديد فقط ودمجه حسب id
+        result = import_incremental(csv_path, authoritative_from_csv=authoritative, fuzzy=fuzzy, profiler=prof,
+                                    fmt=fmt, brands=brands)
+        counters = result["counters"]
+        print("Incremental:", json.dumps(result["incremental"], ensure_ascii=False))
+    else:
+        counters, unmatched = import_pois(csv_path, authoritative_from_csv=authoritative, fuzzy=fuzzy, profiler=prof,
+                                          checkpoint_every=every or None, resume="--resume" in flags, fmt=fmt,
+                                          brands=brands)
     print("Imported:", json.dumps(counters, ensure_ascii=False))
-    print("Output:", str(OUT_POIS))
+    print("Output:", str(artifact_path(OUT_POIS, fmt)))
     print("Report:", str(OUT_REPORT))
+    if prof.write(OUT_PROFILE):
+        print("Profile:", str(OUT_PROFILE))
     if authoritative:
-        print("Categories from CSV:", str(OUT_CATS_FROM_CSV))
-        print("Merged categories:", str(OUT_CATS_MERGED))
+        print("Categories from CSV:", str(artifact_path(OUT_CATS_FROM_CSV, fmt)))
+        print("Merged categories:", str(artifact_path(OUT_CATS_MERGED, fmt)))
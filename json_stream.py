@@ -0,0 +1,103 @@
+"""
+قارئ JSON متدفق لمصفوفة سجلات مع اختيار الحقول (بدون مكتبات خارجية)
+
+    for cat in iter_records(path, fields={"id", "name_ar", "parent_id"}):
+        ...
+
+يقرأ الملف على دفعات (64KB) ويفصل عناصر المصفوفة عنصراً عنصراً؛ كل عنصر
+يُحلل بمحلل json المدمج (سرعة C) ثم يُبقى فقط على الحقول المطلوبة، فلا يبقى
+في الذاكرة إلا سجل واحد كامل في كل لحظة والحقول المستخدمة من البقية.
+أسماء المفاتيح تُشارك بين السجلات بدلاً من نسخة لكل سجل.
+
+الملف يجب أن يكون مصفوفة JSON في المستوى الأعلى. العناصر غير الكائنات
+تُرجع كما هي (بدون اختيار حقول).
+"""
+
+import json
+import re
+from pathlib import Path
+
+import compressed_io
+
+CHUNK = 1 << 16
+
+_WS = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """مخزن نصي منزلق: يحتفظ فقط بالجزء غير المستهلك من الملف"""
+
+    def __init__(self, f, chunk=CHUNK):
+        self.f = f
+        self.chunk = chunk
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self, size=None):
+        if self.eof:
+            return False
+        data = self.f.read(size or self.chunk)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """أول حرف غير فراغ (بدون استهلاكه)، أو "" عند نهاية الملف"""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, chars):
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """القيمة التالية كاملة؛ إذا قُطعت عند حد الدفعة نقرأ المزيد ونعيد"""
+        self.peek()
+        size = self.chunk
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # رقم في آخر المخزن قد يكون مقطوعاً (بعده يجب أن يأتي , أو ])
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # سجل أكبر من الدفعة: نضاعف حجم القراءة لتجنب إعادة التحليل مرات كثيرة
+            self.more(size)
+            size *= 2
+
+
+def iter_records(path, fields=None, chunk=CHUNK):
+    """سجلات مصفوفة JSON واحداً تلو الآخر، بالحقول المطلوبة فقط (None = كل الحقول)"""
+    keys = {k: k for k in fields} if fields is not None else None
+    # الملفات المضغوطة (.gz / .zst) تُفك بشكل متدفق بنفس حجم الدفعة
+    with compressed_io.open_text(path) as f:
+        r = _Reader(f, chunk)
+        r.expect("[")
+        if r.peek() == "]":
+            return
+        while True:
+            rec = r.value()
+            if keys is not None and isinstance(rec, dict):
+                rec = {keys[k]: v for k, v in rec.items() if k in keys}
+            yield rec
+            if r.expect(",]") == "]":
+                return
+
+
+def load_records(path, fields=None):
+    return list(iter_records(Path(path), fields))
@@ -0,0 +1,74 @@
+"""
+تكرار الكلمات عبر التصنيفات (DF/IDF) وتقليم الكلمات قليلة المعلومات
+
+كلمات مثل "محل" و"متجر" و"store" و"shop" تُضاف لكل التصنيفات تقريباً
+(gen_ar_variants/gen_en_variants والقواميس)، فتجعل كل استعلام يمر على
+مئات التصنيفات دون أن تميّز بينها. هنا نحسب عدد التصنيفات التي تحتوي
+كل كلمة، ونحذف من قوائم الفهرس المقلوب ما يتجاوز العتبة.
+"""
+
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+BASE = DATA_DIR / "categories.json"
+OUT_REPORT = DATA_DIR / "keyword_idf_report.json"
+
+MAX_DF_RATIO = 0.12  # كلمة في أكثر من 12% من التصنيفات تُعتبر عامة
+
+
+def document_frequencies(token_sets):
+    """عدد التصنيفات التي تحتوي كل كلمة"""
+    df = Counter()
+    for toks in token_sets:
+        df.update(set(toks))
+    return df
+
+
+def idf(df_value, n_docs):
+    return math.log((n_docs + 1) / (df_value + 1)) + 1.0
+
+
+def pruned_tokens(df, n_docs, max_df_ratio=MAX_DF_RATIO):
+    """الكلمات التي تتجاوز عتبة التكرار"""
+    limit = max_df_ratio * n_docs
+    return {tok for tok, v in df.items() if v > limit}
+
+
+def build_report(df, n_docs, pruned, max_df_ratio=MAX_DF_RATIO, top=200):
+    rows = [
+        {"token": tok, "df": v, "idf": round(idf(v, n_docs), 4), "pruned": tok in pruned}
+        for tok, v in df.most_common(top)
+    ]
+    return {
+        "categories": n_docs,
+        "tokens": len(df),
+        "max_df": math.floor(max_df_ratio * n_docs),
+        "pruned_tokens": len(pruned),
+        "pruned_postings": sum(df[t] for t in pruned),
+        "total_postings": sum(df.values()),
+        "pruned": sorted(pruned, key=lambda t: -df[t]),
+        "top_tokens": rows,
+    }
+
+
+def main():
+    from category_matcher import MATCH_FIELDS, CategoryIndex
+    from json_stream import load_records
+
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else BASE
+    cats = load_records(path, MATCH_FIELDS)
+    index = CategoryIndex(cats, max_df_ratio=MAX_DF_RATIO)
+    report = build_report(index.df, len(cats), index.pruned)
+    report["source"] = str(path)
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print("Pruned tokens:", report["pruned_tokens"], "postings:", report["pruned_postings"], "/", report["total_postings"])
+    print("Report:", OUT_REPORT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+فهرس مطابقة يقبل تعديلات حية (إضافة/حذف/تعديل كلمات تصنيف واحد)
+
+كل تعديل من لوحة الإدارة (add-keyword أو POST/PUT /categories) يُطبق على
+CategoryIndex في مكانه خلال أجزاء من الملي ثانية: قوائم الكلمات وتكرار
+الكلمات (df) والكلمات العامة تُحدّث للكلمات المتغيرة فقط. الحذف يترك
+موقعاً فارغاً؛ عندما تتجاوز نسبة التجزئة REBUILD_THRESHOLD يُبنى فهرس
+جديد في خيط خلفي من نسخة التصنيفات، ثم تُعاد عليه التعديلات التي وصلت
+أثناء البناء ويُستبدل بالفهرس الحالي.
+
+    python live_index.py [--edits 500] [--threshold 0.05] [--stem] [--prune-generic] ...
+"""
+
+import copy
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+from category_matcher import CATS_PATH, MATCH_FIELDS, CategoryIndex, match_categories
+from json_stream import load_records
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+OUT_REPORT = DATA_DIR / "live_index_report.json"
+
+REBUILD_THRESHOLD = 0.2
+
+
+class LiveIndex:
+    def __init__(self, categories, rebuild_threshold=REBUILD_THRESHOLD, **options):
+        self.options = options
+        self.rebuild_threshold = rebuild_threshold
+        self.index = CategoryIndex(categories, **options)
+        self.rebuilds = 0
+        self._lock = threading.RLock()
+        self._oplog = None  # تعديلات وصلت أثناء إعادة البناء
+        self._thread = None
+
+    def match(self, store_name, max_results=5):
+        with self._lock:
+            return match_categories(store_name, self.index, max_results)
+
+    def add(self, category):
+        self._apply("add", category)
+
+    def remove(self, cat_id):
+        self._apply("remove", cat_id)
+
+    def update(self, category):
+        self._apply("update", category)
+
+    def add_keywords(self, cat_id, ar=(), en=()):
+        """نفس ما يفعله route add-keyword: إلحاق كلمات غير موجودة"""
+        with self._lock:
+            c = copy.deepcopy(self.index.by_id[cat_id])
+        for field, words in (("search_key_words_ar", ar), ("search_key_words_en", en)):
+            current = c.get(field) or []
+            c[field] = current + [w for w in words if w not in current]
+        self.update(c)
+
+    def apply_patch(self, patch):
+        """فرق تصنيفات (taxonomy_patch) كتعديلات حية متتالية"""
+        from taxonomy_patch import index_ops
+
+        with self._lock:
+            ops = list(index_ops(patch, self.index.by_id))
+            for op, arg in ops:
+                self._apply(op, arg)
+        return len(ops)
+
+    def _apply(self, op, arg):
+        with self._lock:
+            self._run(self.index, op, arg)
+            if self._oplog is not None:
+                self._oplog.append((op, arg))
+            elif self.index.fragmentation() > self.rebuild_threshold:
+                self._start_rebuild()
+
+    @staticmethod
+    def _run(index, op, arg):
+        if op == "add":
+            index.add_category(arg)
+        elif op == "remove":
+            index.remove_category(arg)
+        else:
+            index.update_category(arg)
+
+    def _start_rebuild(self):
+        snapshot = self.index.live_categories()
+        self._oplog = []
+        self._thread = threading.Thread(target=self._rebuild, args=(snapshot,), daemon=True)
+        self._thread.start()
+
+    def _rebuild(self, snapshot):
+        fresh = CategoryIndex(snapshot, **self.options)
+        with self._lock:
+            for op, arg in self._oplog:
+                self._run(fresh, op, arg)
+            self.index = fresh
+            self._oplog = None
+            self.rebuilds += 1
+            # تعديلات كثيرة أثناء البناء قد تتجاوز العتبة من جديد
+            if fresh.fragmentation() > self.rebuild_threshold:
+                self._start_rebuild()
+
+    def wait_for_rebuild(self):
+        while True:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            thread.join()
+
+    def stats(self):
+        with self._lock:
+            idx = self.index
+            return {
+                "categories": idx.live,
+                "slots": len(idx.categories),
+                "tombstones": idx.tombstones,
+                "stale_aux": idx.stale_aux,
+                "fragmentation": round(idx.fragmentation(), 4),
+                "pruned_tokens": len(idx.pruned),
+                "rebuilds": self.rebuilds,
+                "rebuilding": self._oplog is not None,
+            }
+
+
+def _signature(matches):
+    return [(m["category"]["id"], round(m["confidence"], 9)) for m in matches]
+
+
+def random_edits(categories, n, seed=7):
+    """تعديلات عشوائية واقعية: إضافة كلمات (الأغلب)، تعديل، حذف، إضافة تصنيف"""
+    rnd = random.Random(seed)
+    pool = sorted({k for c in categories for k in (c.get("search_key_words_ar") or [])})
+    next_id = max(c["id"] for c in categories) + 1
+    live = [c["id"] for c in categories]
+    edits = []
+    for _ in range(n):
+        r = rnd.random()
+        if r < 0.6:
+            edits.append(("keywords", rnd.choice(live), rnd.sample(pool, 2)))
+        elif r < 0.8:
+            edits.append(("drop_keywords", rnd.choice(live), None))
+        elif r < 0.9:
+            victim = live.pop(rnd.randrange(len(live)))
+            edits.append(("remove", victim, None))
+        else:
+            src = rnd.choice(categories)
+            edits.append(("add", next_id, {**src, "id": next_id, "name_ar": (src.get("name_ar") or "") + " جديد"}))
+            live.append(next_id)
+            next_id += 1
+    return edits
+
+
+def apply_edit(live, edit):
+    kind, cat_id, payload = edit
+    if kind == "keywords":
+        live.add_keywords(cat_id, ar=payload)
+    elif kind == "drop_keywords":
+        c = copy.deepcopy(live.index.by_id[cat_id])
+        c["search_key_words_ar"] = (c.get("search_key_words_ar") or [])[1:]
+        live.update(c)
+    elif kind == "remove":
+        live.remove(cat_id)
+    else:
+        live.add(payload)
+
+
+def _arg(flags, name, default=None):
+    if name in flags:
+        i = flags.index(name)
+        if i + 1 < len(flags):
+            return flags[i + 1]
+    return default
+
+
+def main():
+    from evaluate_matcher import index_options, load_labeled, percentile
+
+    flags = sys.argv[1:]
+    n_edits = int(_arg(flags, "--edits", 500))
+    threshold = float(_arg(flags, "--threshold", REBUILD_THRESHOLD))
+    options = index_options(flags)
+    categories = load_records(CATS_PATH, MATCH_FIELDS)
+    queries = [item["name"] for item in load_labeled()]
+
+    t0 = time.perf_counter()
+    live = LiveIndex(categories, rebuild_threshold=threshold, **options)
+    full_build = time.perf_counter() - t0
+
+    latencies = []
+    for edit in random_edits(categories, n_edits):
+        t1 = time.perf_counter()
+        apply_edit(live, edit)
+        latencies.append(time.perf_counter() - t1)
+    live.wait_for_rebuild()
+    latencies.sort()
+
+    # نفس النتائج كفهرس جديد مبني من التصنيفات النهائية؟
+    fresh = CategoryIndex(live.index.live_categories(), **options)
+    same = sum(1 for q in queries if _signature(live.match(q)) == _signature(match_categories(q, fresh)))
+
+    report = {
+        "options": options,
+        "edits": n_edits,
+        "full_build_ms": round(full_build * 1e3, 3),
+        "edit_p50_ms": round(percentile(latencies, 50) * 1e3, 4),
+        "edit_p99_ms": round(percentile(latencies, 99) * 1e3, 4),
+        "identical_to_fresh_build": round(same / len(queries), 4),
+        "index": live.stats(),
+    }
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print("Report:", OUT_REPORT)
+
+
+if __name__ == "__main__":
+    main()
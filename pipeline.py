@@ -0,0 +1,284 @@
+"""
+نقطة تشغيل واحدة لخط تحديث البيانات
+
+المراحل كرسم بياني (DAG):
+
+    import_pois ─> bundles ─┬─> validate
+    (أو source)             ├─> collisions
+                            └─> idf
+
+- كل مرحلة لها مفتاح = بصمة (sha256) لمدخلاتها: محتوى الملفات الخارجية
+  وبصمة مخرجات المراحل السابقة ومعاملاتها. إذا لم يتغير المفتاح وملفاتها
+  موجودة تُتخطى المرحلة.
+- المراحل المستقلة في نفس المستوى تُشغّل بالتوازي (عمليات منفصلة).
+- البيانات الوسيطة تنتقل في الذاكرة (أو من ذاكرة التخزين المؤقت pickle)
+  بدلاً من إعادة قراءة JSON المنسق من wash-tasnifoh/data.
+
+    python pipeline.py [<csv>] [--no-authoritative] [--force] [--jobs N] [--format json|compact|jsonl|msgpack[.gz|.zst]]
+
+--format يحدد صيغة المخرجات الكبيرة (pois والتصنيفات)؛ التقارير تبقى JSON منسقاً.
+إضافة .gz أو .zst للصيغة (مثلاً jsonl.zst) تضغط المخرجات، والقراءة تفك الضغط تلقائياً.
+"""
+
+import copy
+import hashlib
+import json
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import compressed_io
+import detect_keyword_collisions
+import expand_keyword_bundles
+import import_pois_from_csv
+import keyword_idf
+import synonyms
+import validate_keywords
+from artifact_io import DEFAULT_FORMAT, FORMATS, artifact_path, is_format, load_artifact, write_records
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+CACHE_DIR = ROOT / ".pipeline_cache"
+MANIFEST = CACHE_DIR / "manifest.json"
+OUT_VALIDATED = DATA_DIR / "categories_validated.json"
+OUT_PIPELINE_REPORT = DATA_DIR / "pipeline_report.json"
+
+# رفع الرقم يُبطل ذاكرة المرحلة عند تغيير منطقها
+STAGE_VERSION = 1
+
+
+def file_digest(path, fingerprints=None):
+    """sha256 لمحتوى الملف، مع إعادة استخدام البصمة إذا لم يتغير الحجم ووقت التعديل"""
+    path = compressed_io.resolve(path)
+    st = path.stat()
+    key = str(path.resolve())
+    cached = (fingerprints or {}).get(key)
+    if cached and cached["size"] == st.st_size and cached["mtime"] == st.st_mtime_ns:
+        return cached["sha256"]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    if fingerprints is not None:
+        fingerprints[key] = {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": digest}
+    return digest
+
+
+# ---------------------------------------------------------------------------
+# المراحل: دوال على مستوى الوحدة (قابلة للإرسال لعملية أخرى)
+# كل دالة تستقبل مخرجات المراحل السابقة ومعاملاتها وترجع (البيانات، الملفات المكتوبة)
+# ---------------------------------------------------------------------------
+
+def stage_source(inputs, params):
+    cats, src = expand_keyword_bundles.load_categories()
+    return {"categories": cats, "source": str(src)}, []
+
+
+def stage_import_pois(inputs, params):
+    m = import_pois_from_csv
+    fmt = params["format"]
+    result = m.run_import(Path(params["csv"]), authoritative_from_csv=params["authoritative"], fmt=fmt)
+    if params["authoritative"]:
+        source, cats = artifact_path(m.OUT_CATS_MERGED, fmt), result["merged"]
+    else:
+        # lookup mode loads only the fields it needs; later stages want full records
+        source = m.CATS_PATH
+        cats = load_artifact(source)
+    data = {"categories": cats, "counters": result["counters"], "source": str(source)}
+    written = [artifact_path(m.OUT_POIS, fmt), m.OUT_REPORT]
+    if params["authoritative"]:
+        written += [artifact_path(m.OUT_CATS_FROM_CSV, fmt), artifact_path(m.OUT_CATS_MERGED, fmt)]
+    return data, written
+
+
+def stage_bundles(inputs, params):
+    upstream = inputs["import_pois"] if "import_pois" in inputs else inputs["source"]
+    cats = copy.deepcopy(upstream["categories"])
+    stats = expand_keyword_bundles.bundle_categories(cats)
+    report = expand_keyword_bundles.write_bundles(cats, stats, upstream["source"], params["format"])
+    return {"categories": cats, "stats": stats}, [Path(report["output"]), expand_keyword_bundles.REPORT]
+
+
+def stage_validate(inputs, params):
+    cats = copy.deepcopy(inputs["bundles"]["categories"])
+    stats = validate_keywords.clean_categories(cats, verbose=False)
+    out = write_records(OUT_VALIDATED, cats, params["format"])
+    stats = {k: v for k, v in stats.items() if k != "issues"}
+    return {"stats": stats}, [out]
+
+
+def stage_collisions(inputs, params):
+    report = detect_keyword_collisions.detect_collisions(inputs["bundles"]["categories"])
+    report["source"] = str(expand_keyword_bundles.OUT)
+    out = detect_keyword_collisions.OUT_REPORT
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return {"summary": report["summary"]}, [out]
+
+
+def stage_idf(inputs, params):
+    from category_matcher import CategoryIndex
+
+    cats = inputs["bundles"]["categories"]
+    index = CategoryIndex(cats, max_df_ratio=keyword_idf.MAX_DF_RATIO)
+    report = keyword_idf.build_report(index.df, len(cats), index.pruned)
+    report["source"] = str(expand_keyword_bundles.OUT)
+    keyword_idf.OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return {"pruned_tokens": report["pruned_tokens"]}, [keyword_idf.OUT_REPORT]
+
+
+def build_stages(csv_path=None, authoritative=True, fmt=DEFAULT_FORMAT):
+    """تعريف المراحل: الاسم -> (الدالة، المراحل السابقة، الملفات الخارجية، المعاملات)"""
+    stages = {}
+    if csv_path:
+        stages["import_pois"] = (stage_import_pois, [], [csv_path, import_pois_from_csv.CATS_PATH],
+                                 {"csv": str(csv_path), "authoritative": authoritative, "format": fmt})
+        head = "import_pois"
+    else:
+        merged = compressed_io.resolve(expand_keyword_bundles.MERGED)
+        src = merged if merged.exists() else expand_keyword_bundles.BASE
+        stages["source"] = (stage_source, [], [src], {})
+        head = "source"
+    # قاموس المرادفات ملف خارجي للمرحلة: تعديله يعيد التوسيع
+    stages["bundles"] = (stage_bundles, [head], [synonyms.SYNONYMS_PATH], {"format": fmt})
+    stages["validate"] = (stage_validate, ["bundles"], [], {"format": fmt})
+    stages["collisions"] = (stage_collisions, ["bundles"], [], {})
+    stages["idf"] = (stage_idf, ["bundles"], [], {})
+    return stages
+
+
+def levels(stages):
+    """ترتيب طوبولوجي على مستويات (كل مستوى مستقل داخلياً)"""
+    done = set()
+    out = []
+    remaining = dict(stages)
+    while remaining:
+        ready = [n for n, (_, deps, _, _) in remaining.items() if all(d in done for d in deps)]
+        if not ready:
+            raise ValueError(f"Cycle in pipeline stages: {sorted(remaining)}")
+        out.append(ready)
+        done.update(ready)
+        for n in ready:
+            del remaining[n]
+    return out
+
+
+def _load_manifest():
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    return {"stages": {}, "fingerprints": {}}
+
+
+def _run_stage(fn, inputs, params):
+    t0 = time.perf_counter()
+    data, written = fn(inputs, params)
+    return data, [str(p) for p in written], time.perf_counter() - t0
+
+
+def run_pipeline(csv_path=None, authoritative=True, force=False, jobs=2, fmt=DEFAULT_FORMAT):
+    CACHE_DIR.mkdir(exist_ok=True)
+    manifest = _load_manifest()
+    fingerprints = manifest.setdefault("fingerprints", {})
+    stages = build_stages(csv_path, authoritative, fmt)
+
+    digests = {}  # مرحلة -> بصمة مخرجاتها
+    data = {}  # مرحلة -> بيانات في الذاكرة (تُحمّل عند الحاجة)
+    summary = []
+
+    def load_output(name):
+        if name not in data:
+            entry = manifest["stages"][name]
+            data[name] = pickle.loads((CACHE_DIR / entry["pickle"]).read_bytes())
+        return data[name]
+
+    for level in levels(stages):
+        to_run = []
+        for name in level:
+            fn, deps, files, params = stages[name]
+            h = hashlib.sha256()
+            h.update(f"{name}:{STAGE_VERSION}:{json.dumps(params, sort_keys=True)}".encode())
+            for f in files:
+                h.update(file_digest(f, fingerprints).encode())
+            for d in deps:
+                h.update(digests[d].encode())
+            key = h.hexdigest()
+
+            entry = manifest["stages"].get(name)
+            fresh = (
+                not force and entry and entry["key"] == key
+                and (CACHE_DIR / entry["pickle"]).exists()
+                and all(Path(p).exists() for p in entry["outputs"])
+            )
+            if fresh:
+                digests[name] = entry["digest"]
+                summary.append({"stage": name, "status": "skipped", "seconds": 0.0})
+            else:
+                to_run.append((name, key))
+
+        if not to_run:
+            continue
+
+        calls = []
+        for name, key in to_run:
+            fn, deps, _, params = stages[name]
+            calls.append((name, key, fn, {d: load_output(d) for d in deps}, params))
+
+        if jobs > 1 and len(calls) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(calls))) as pool:
+                futures = [(name, key, pool.submit(_run_stage, fn, inp, params)) for name, key, fn, inp, params in calls]
+                results = [(name, key, fut.result()) for name, key, fut in futures]
+        else:
+            results = [(name, key, _run_stage(fn, inp, params)) for name, key, fn, inp, params in calls]
+
+        for name, key, (out, written, seconds) in results:
+            blob = pickle.dumps(out, protocol=pickle.HIGHEST_PROTOCOL)
+            digest = hashlib.sha256(blob).hexdigest()
+            pickle_name = f"{name}.pickle"
+            (CACHE_DIR / pickle_name).write_bytes(blob)
+            old = manifest["stages"].get(name)
+            manifest["stages"][name] = {"key": key, "digest": digest, "pickle": pickle_name, "outputs": written}
+            data[name] = out
+            digests[name] = digest
+            summary.append({
+                "stage": name,
+                "status": "ran",
+                "seconds": round(seconds, 3),
+                # نفس المخرجات رغم إعادة التشغيل => المراحل اللاحقة ستُتخطى
+                "output_changed": not old or old["digest"] != digest,
+            })
+
+    MANIFEST.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    OUT_PIPELINE_REPORT.write_text(json.dumps({"stages": summary}, ensure_ascii=False, indent=2), encoding="utf-8")
+    return summary
+
+
+def _arg(flags, name, default=None):
+    if name in flags:
+        i = flags.index(name)
+        if i + 1 < len(flags):
+            return flags[i + 1]
+    return default
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    csv_arg = args[0] if args and not args[0].startswith("--") else None
+    if csv_arg and not Path(csv_arg).exists():
+        print(f"CSV not found: {csv_arg}")
+        sys.exit(2)
+    fmt = _arg(args, "--format", DEFAULT_FORMAT)
+    if not is_format(fmt):
+        print(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)}, optionally + .gz / .zst)")
+        sys.exit(2)
+    summary = run_pipeline(
+        csv_path=Path(csv_arg) if csv_arg else None,
+        authoritative="--no-authoritative" not in args,
+        force="--force" in args,
+        jobs=int(_arg(args, "--jobs", 2)),
+        fmt=fmt,
+    )
+    for s in summary:
+        print(f"{s['stage']:<12} {s['status']:<8} {s['seconds']:>8.3f}s")
+    print("Report:", OUT_PIPELINE_REPORT)
@@ -0,0 +1,176 @@
+"""
+تخزين مضغوط لنقاط الاهتمام (POI) بأعمدة بدلاً من قاموس لكل صف
+
+كل POI كان قاموساً من 9 مفاتيح (~650 بايت مع الحاوية) تتكرر فيه أسماء
+التصنيف والتصنيف الفرعي. هنا:
+
+- المعرفات في array('q') (أو قائمة إذا ظهر معرف نصي)
+- الاسمان (en/ar) في قائمتين
+- التصنيف + التصنيف الفرعي وأسماؤهما "وسم" واحد مشترك (tuple) يُحفظ مرة
+  واحدة ويُشار إليه برقم 4 بايت في array('I')
+
+القراءة ترجع نفس القاموس السابق (نفس المفاتيح والترتيب)، والكتابة إلى
+JSON (أو JSONL/MessagePack عبر artifact_io) متدفقة ومطابقة بايتاً ببايت
+لـ json.dumps(pois, indent=2).
+"""
+
+from array import array
+
+from artifact_io import DEFAULT_FORMAT, write_records
+
+FIELDS = (
+    "id", "name_en", "name_ar",
+    "category_id", "category_name_en", "category_name_ar",
+    "subcategory_id", "subcategory_name_en", "subcategory_name_ar",
+)
+_INT64 = (-(1 << 63), (1 << 63) - 1)
+
+
+class PoiTable:
+    __slots__ = ("ids", "names_en", "names_ar", "refs", "labels", "_label_index")
+
+    def __init__(self, pois=()):
+        self.ids = array("q")
+        self.names_en = []
+        self.names_ar = []
+        self.refs = array("I")
+        self.labels = []  # (category_id, cat_en, cat_ar, subcategory_id, sub_en, sub_ar)
+        self._label_index = {}
+        for poi in pois:
+            self.append_dict(poi)
+
+    def label(self, category_id, cat_en, cat_ar, sub_id, sub_en, sub_ar):
+        """رقم الوسم المشترك (يُنشأ مرة واحدة لكل تركيبة تصنيف)"""
+        key = (category_id, cat_en, cat_ar, sub_id, sub_en, sub_ar)
+        ref = self._label_index.get(key)
+        if ref is None:
+            ref = self._label_index[key] = len(self.labels)
+            self.labels.append(key)
+        return ref
+
+    def _id_value(self, poi_id):
+        if isinstance(self.ids, array):
+            if type(poi_id) is int and _INT64[0] <= poi_id <= _INT64[1]:
+                return poi_id
+            # معرف نصي: نتحول إلى قائمة عامة مرة واحدة
+            self.ids = list(self.ids)
+        return poi_id
+
+    def append(self, poi_id, name_en, name_ar, ref):
+        poi_id = self._id_value(poi_id)
+        self.ids.append(poi_id)
+        self.names_en.append(name_en)
+        self.names_ar.append(name_ar)
+        self.refs.append(ref)
+
+    def append_dict(self, poi):
+        self.append(poi["id"], poi["name_en"], poi["name_ar"], self._ref_of(poi))
+
+    def set_dict(self, i, poi):
+        poi_id = self._id_value(poi["id"])
+        self.ids[i] = poi_id
+        self.names_en[i] = poi["name_en"]
+        self.names_ar[i] = poi["name_ar"]
+        self.refs[i] = self._ref_of(poi)
+
+    def _ref_of(self, poi):
+        return self.label(poi["category_id"], poi["category_name_en"], poi["category_name_ar"],
+                          poi["subcategory_id"], poi["subcategory_name_en"], poi["subcategory_name_ar"])
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __getitem__(self, i):
+        return dict(zip(FIELDS, (self.ids[i], self.names_en[i], self.names_ar[i], *self.labels[self.refs[i]])))
+
+    def __iter__(self):
+        for i in range(len(self.refs)):
+            yield self[i]
+
+    def extend(self, other, seen=None):
+        """إلحاق صفوف جدول آخر؛ مع seen (IdSet) تُتخطى المعرفات المكررة ويُرجع عددها"""
+        dups = 0
+        for i, poi_id in enumerate(other.ids):
+            if seen is not None and not seen.add(poi_id):
+                dups += 1
+                continue
+            self.append(poi_id, other.names_en[i], other.names_ar[i], self.label(*other.labels[other.refs[i]]))
+        return dups
+
+    def filtered(self, drop_ids):
+        out = PoiTable()
+        for i, poi_id in enumerate(self.ids):
+            if poi_id not in drop_ids:
+                lab = self.labels[self.refs[i]]
+                out.append(poi_id, self.names_en[i], self.names_ar[i], out.label(*lab))
+        return out
+
+    def write(self, path, fmt=DEFAULT_FORMAT):
+        """كتابة متدفقة دون بناء القائمة كاملة (json مطابقة لـ json.dumps(list(self), indent=2))"""
+        return write_records(path, self, fmt)
+
+    def stats(self):
+        return {"pois": len(self), "labels": len(self.labels), "int_ids": isinstance(self.ids, array)}
+
+
+class IdSet:
+    """مجموعة معرفات مضغوطة لإزالة التكرار عبر ملفات كثيرة
+
+    المعرفات الرقمية في جدول عنونة مفتوحة array('q') (~13 بايت لكل معرف عند
+    امتلاء 60%) بدلاً من set (~60-90 بايت مع كائن int). المعرفات النصية وقيمة
+    الخانة الفارغة نفسها تذهب إلى set عادية.
+    """
+
+    __slots__ = ("table", "bits", "count", "other")
+    _EMPTY = _INT64[0]
+    _MULT = 0x9E3779B97F4A7C15  # تجزئة فيبوناتشي: البتات العليا من الضرب
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity=1024):
+        self.bits = 4
+        while (1 << self.bits) * 0.6 < capacity:
+            self.bits += 1
+        self.table = array("q", [self._EMPTY]) * (1 << self.bits)
+        self.count = 0
+        self.other = set()
+
+    def _slot(self, x):
+        table, mask = self.table, (1 << self.bits) - 1
+        i = ((x * self._MULT) & self._MASK64) >> (64 - self.bits)
+        while True:
+            v = table[i]
+            if v == x or v == self._EMPTY:
+                return i
+            i = (i + 1) & mask
+
+    def add(self, x):
+        """True إذا كان المعرف جديداً"""
+        if type(x) is not int or not _INT64[0] < x <= _INT64[1]:
+            if x in self.other:
+                return False
+            self.other.add(x)
+            return True
+        i = self._slot(x)
+        if self.table[i] == x:
+            return False
+        self.table[i] = x
+        self.count += 1
+        if self.count > (1 << self.bits) * 0.6:
+            self._grow()
+        return True
+
+    def __contains__(self, x):
+        if type(x) is not int or not _INT64[0] < x <= _INT64[1]:
+            return x in self.other
+        return self.table[self._slot(x)] == x
+
+    def __len__(self):
+        return self.count + len(self.other)
+
+    def _grow(self):
+        old = self.table
+        self.bits += 1
+        self.table = array("q", [self._EMPTY]) * (1 << self.bits)
+        for v in old:
+            if v != self._EMPTY:
+                self.table[self._slot(v)] = v
@@ -0,0 +1,99 @@
+"""
+طبقة قياس موحّدة لسكربتات خط البيانات (--profile)
+
+لكل مرحلة (load, derive, map, serialize ...) تسجّل: زمن الجدار والمعالج،
+عدد الصفوف والصفوف/ثانية، ذروة الذاكرة عبر tracemalloc، وصافي الكتل
+المحجوزة. عند عدم التفعيل كل الاستدعاءات ترجع فوراً (تكلفة شبه صفرية).
+
+    prof = Profiler("import_pois", enabled="--profile" in sys.argv)
+    prof.start("load")
+    ...
+    prof.stop("load", rows=len(data))
+    with prof.stage("serialize"):
+        ...
+    prof.write(DATA_DIR / "pois_import_profile.json")
+"""
+
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+_NULL = contextlib.nullcontext()
+
+
+class Profiler:
+    def __init__(self, script="", enabled=False):
+        self.script = script
+        self.enabled = enabled
+        self.stages = []
+        self._open = {}
+        self._started = None
+        self._own_tracing = False
+        if enabled:
+            self._started = (time.perf_counter(), time.process_time())
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._own_tracing = True
+
+    def start(self, name):
+        if not self.enabled:
+            return
+        tracemalloc.reset_peak()
+        self._open[name] = (time.perf_counter(), time.process_time(), sys.getallocatedblocks())
+
+    def stop(self, name, rows=None):
+        if not self.enabled:
+            return
+        w0, c0, b0 = self._open.pop(name)
+        wall = time.perf_counter() - w0
+        _, peak = tracemalloc.get_traced_memory()
+        self.stages.append({
+            "name": name,
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(time.process_time() - c0, 6),
+            "rows": rows,
+            "rows_per_sec": round(rows / wall, 2) if rows and wall > 0 else None,
+            "peak_bytes": peak,
+            "alloc_blocks": sys.getallocatedblocks() - b0,
+        })
+
+    def stage(self, name, rows=None):
+        """نفس start/stop كمدير سياق (المراحل لا تتداخل)"""
+        if not self.enabled:
+            return _NULL
+        return self._stage(name, rows)
+
+    @contextlib.contextmanager
+    def _stage(self, name, rows):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name, rows)
+
+    def trace(self):
+        w0, c0 = self._started
+        return {
+            "script": self.script,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_seconds": round(time.perf_counter() - w0, 6),
+            "cpu_seconds": round(time.process_time() - c0, 6),
+            "stages": self.stages,
+        }
+
+    def write(self, path):
+        """كتابة ملف التتبع (لا شيء إذا لم يكن القياس مفعلاً)"""
+        if not self.enabled:
+            return None
+        if self._own_tracing:
+            tracemalloc.stop()
+            self._own_tracing = False
+        path = Path(path)
+        path.write_text(json.dumps(self.trace(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+DISABLED = Profiler()
@@ -0,0 +1,367 @@
+"""
+تقسيم فهرس المطابقة إلى أجزاء (shards) حسب التصنيف الجذري
+
+- كل جزء يحمل مجموعة جذور (parent_id = None) مع كل فروعها، فالتصنيف
+  وأبوه دائماً في نفس الجزء. الجذور توزع بالأثقل أولاً على الجزء الأخف
+  (عدد الكلمات المفتاحية) ليتقارب حجم الأجزاء.
+- الموجّه (ShardRouter) يطبّع الاستعلام مرة واحدة بمفردات كل الأجزاء
+  (التحويل اللاتيني، التصحيح، التجذيع) ثم يرسله لكل الأجزاء ويدمج أفضل k
+  من كل جزء بنفس مفتاح الترتيب (الثقة ثم الموقع في القائمة الكاملة).
+- إحصاءات الكلمات العامة (df) تُجمع من الأجزاء وتُطبق على الكل، ونتائج
+  الأجزاء التي رجعت لقوائم الكلمات العامة تُهمل إذا وجد جزء آخر مرشحين
+  حقيقيين. لذلك النتائج مطابقة تماماً لفهرس واحد.
+
+الأجزاء تعمل داخل نفس العملية أو في عمليات منفصلة (workers=True) تتواصل
+عبر Pipe؛ نفس البروتوكول يمكن نقله لاحقاً إلى عقد منفصلة.
+
+    python sharded_matcher.py [--shards 1,2,4] [--scale 4] [--queries 2000] [--batch 200]
+                              [--in-process] [--fuzzy] [--translit] [--stem] [--prune-generic] [--brands] [--bilingual]
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import arabic_stemmer
+import brands as brand_table
+import keyword_idf
+import symspell_index
+import transliteration
+from category_matcher import CATS_PATH, MATCH_FIELDS, CategoryIndex, match_categories, normalize_text, score_candidates
+from json_stream import load_records
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+OUT_REPORT = DATA_DIR / "sharded_matcher_report.json"
+
+
+def root_of(cat, by_id):
+    seen = set()
+    while cat.get("parent_id") in by_id and cat["id"] not in seen:
+        seen.add(cat["id"])
+        cat = by_id[cat["parent_id"]]
+    return cat["id"]
+
+
+def shard_taxonomy(categories, n_shards):
+    """مواقع التصنيفات لكل جزء (قوائم مرتبة)، مجمعة حسب الجذر"""
+    by_id = {c["id"]: c for c in categories}
+    groups = {}
+    for pos, c in enumerate(categories):
+        groups.setdefault(root_of(c, by_id), []).append(pos)
+
+    def weight(positions):
+        return sum(1 + len(categories[p].get("search_key_words_ar") or []) for p in positions)
+
+    shards = [[] for _ in range(max(1, n_shards))]
+    loads = [0] * len(shards)
+    for root, positions in sorted(groups.items(), key=lambda g: (-weight(g[1]), str(g[0]))):
+        i = loads.index(min(loads))
+        shards[i].extend(positions)
+        loads[i] += weight(positions)
+    return [sorted(s) for s in shards if s]
+
+
+class Shard:
+    """فهرس جزئي: التصنيفات في مواقع positions من القائمة الكاملة"""
+
+    def __init__(self, categories, positions, stem=False, bilingual=False):
+        self.positions = positions
+        self.index = CategoryIndex([categories[p] for p in positions], stem=stem, bilingual=bilingual)
+
+    def vocabulary(self):
+        return set(self.index.postings) | set(self.index.generic)
+
+    def prune(self, tokens):
+        self.index.prune(tokens)
+
+    def search(self, store_norm, k, fuzzy=()):
+        scored, source = score_candidates(self.index, store_norm, fuzzy)
+        return [(conf, self.positions[pos], matched[:3]) for conf, pos, matched in scored[:k]], source
+
+    def search_batch(self, queries, k):
+        """queries: [(الاستعلام المطبّع، التصحيحات)]"""
+        return [self.search(norm, k, fuzzy) for norm, fuzzy in queries]
+
+
+def _serve(conn, categories, positions, stem, bilingual):
+    """حلقة عملية الجزء: نفس واجهة Shard عبر رسائل"""
+    shard = Shard(categories, positions, stem, bilingual)
+    conn.send((shard.index.df, shard.vocabulary()))
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        op, payload = msg
+        if op == "prune":
+            shard.prune(payload)
+            conn.send(True)
+        elif op == "search":
+            queries, k = payload
+            conn.send(shard.search_batch(queries, k))
+    conn.close()
+
+
+class _LocalShard:
+    def __init__(self, categories, positions, stem, bilingual):
+        self.shard = Shard(categories, positions, stem, bilingual)
+        self._pending = None
+
+    def stats(self):
+        return self.shard.index.df, self.shard.vocabulary()
+
+    def prune(self, tokens):
+        self.shard.prune(tokens)
+
+    def submit(self, queries, k):
+        self._pending = self.shard.search_batch(queries, k)
+
+    def result(self):
+        out, self._pending = self._pending, None
+        return out
+
+    def close(self):
+        pass
+
+
+class _ProcessShard:
+    def __init__(self, categories, positions, stem, bilingual):
+        self.conn, child = multiprocessing.Pipe()
+        # العملية تستلم تصنيفاتها فقط
+        subset = [categories[p] for p in positions]
+        self.proc = multiprocessing.Process(
+            target=_serve, args=(child, subset, list(range(len(positions))), stem, bilingual), daemon=True)
+        self.proc.start()
+        child.close()
+        self.positions = positions
+        self._stats = None
+
+    def stats(self):
+        if self._stats is None:
+            self._stats = self.conn.recv()
+        return self._stats
+
+    def prune(self, tokens):
+        self.conn.send(("prune", tokens))
+        self.conn.recv()
+
+    def submit(self, queries, k):
+        self.conn.send(("search", (queries, k)))
+
+    def result(self):
+        # مواقع العملية محلية؛ نحولها للقائمة الكاملة
+        return [([(conf, self.positions[p], m) for conf, p, m in hits], source)
+                for hits, source in self.conn.recv()]
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.proc.join(timeout=5)
+
+
+class QueryNormalizer:
+    """نفس مراحل CategoryIndex.normalize_query لكن بمفردات كل الأجزاء"""
+
+    normalize_query = CategoryIndex.normalize_query
+    prepare_query = CategoryIndex.prepare_query
+    transliterate = CategoryIndex.transliterate
+    corrections = CategoryIndex.corrections
+
+    def __init__(self, categories, vocabulary, fuzzy=False, translit=False, stem=False):
+        self.vocabulary = vocabulary
+        self.stem = stem
+        self.symspell = symspell_index.build_from_categories(categories, normalize_text) if fuzzy else None
+        self.translit = transliteration.TransliterationIndex(categories, normalize=normalize_text) if translit else None
+
+    def _known(self, tok):
+        if tok in self.vocabulary:
+            return True
+        if self.stem:
+            return arabic_stemmer.stem(tok) in self.vocabulary
+        return False
+
+
+def merge_results(results, k):
+    """دمج أفضل k من كل جزء؛ نتائج الرجوع للكلمات العامة تُهمل إن وُجدت مرشحات حقيقية"""
+    if any(source == "postings" for _, source in results):
+        results = [r for r in results if r[1] == "postings"]
+    hits = [h for hs, _ in results for h in hs]
+    hits.sort(key=lambda h: (-h[0], h[1]))
+    return hits[:k]
+
+
+class ShardRouter:
+    def __init__(self, categories, n_shards=2, fuzzy=False, translit=False, stem=False, max_df_ratio=None,
+                 workers=False, brands=False, bilingual=False):
+        self.categories = categories
+        self.by_id = {c["id"]: c for c in categories}
+        self.position = {c["id"]: pos for pos, c in enumerate(categories)}
+        self.brands = None
+        if brands:
+            path = brand_table.BRANDS_PATH if brands is True else brands
+            self.brands = brand_table.load_brands(normalize_text, path, categories)
+        self.assignment = shard_taxonomy(categories, n_shards)
+        make = _ProcessShard if workers else _LocalShard
+        self.shards = [make(categories, positions, stem, bilingual) for positions in self.assignment]
+
+        df = Counter()
+        vocabulary = set()
+        for shard in self.shards:
+            shard_df, shard_vocab = shard.stats()
+            df.update(shard_df)
+            vocabulary |= shard_vocab
+        self.pruned = set()
+        if max_df_ratio is not None:
+            self.pruned = keyword_idf.pruned_tokens(df, len(categories), max_df_ratio)
+            for shard in self.shards:
+                shard.prune(self.pruned)
+        self.normalizer = QueryNormalizer(categories, vocabulary, fuzzy, translit, stem)
+
+    def search_batch(self, store_names, k=5):
+        """مطابقة مجموعة أسماء: العلامات المعروفة في الموجّه، والباقي يوزع على كل الأجزاء ثم يُدمج"""
+        hits = [self._brand(n) if n and n.strip() else None for n in store_names]
+        queries = [self.normalizer.prepare_query(n) if n and n.strip() and hit is None else ("", ())
+                   for n, hit in zip(store_names, hits)]
+        for shard in self.shards:
+            shard.submit(queries, k)
+        per_shard = [shard.result() for shard in self.shards]
+        out = []
+        for i in range(len(queries)):
+            merged = merge_results([res[i] for res in per_shard], k) if queries[i][0] else []
+            if hits[i] is not None:
+                merged = [hits[i]]
+            out.append([self._format(conf, pos, matched) for conf, pos, matched in merged])
+        return out
+
+    def _brand(self, store_name):
+        if self.brands is None:
+            return None
+        hit = self.brands.lookup(store_name)
+        if hit is None:
+            return None
+        return 1.0, self.position[hit[0]], [hit[1]]
+
+    def match(self, store_name, k=5):
+        return self.search_batch([store_name], k)[0]
+
+    def _format(self, confidence, pos, matched):
+        c = self.categories[pos]
+        return {
+            "category": c,
+            "parent_category": self.by_id.get(c.get("parent_id")) if c.get("parent_id") else None,
+            "confidence": confidence,
+            "matched_keywords": matched,
+        }
+
+    def sizes(self):
+        return [len(p) for p in self.assignment]
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+
+
+def _signature(matches):
+    return [(m["category"]["id"], round(m["confidence"], 9)) for m in matches]
+
+
+def run_harness(categories, queries, shard_counts, options, workers=True, batch=200):
+    """قياس البناء والزمن والإنتاجية لكل عدد أجزاء، مع التحقق من المطابقة لفهرس واحد"""
+    t0 = time.perf_counter()
+    single = CategoryIndex(categories, **options)
+    single_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    expected = [_signature(match_categories(q, single)) for q in queries]
+    single_seconds = time.perf_counter() - t0
+    rows = [{
+        "shards": 0,
+        "mode": "single-index",
+        "build_seconds": round(single_build, 4),
+        "throughput_qps": round(len(queries) / single_seconds, 2) if single_seconds else None,
+    }]
+
+    from evaluate_matcher import percentile
+
+    for n in shard_counts:
+        t0 = time.perf_counter()
+        router = ShardRouter(categories, n, workers=workers, **options)
+        build = time.perf_counter() - t0
+        try:
+            latencies = []
+            got = []
+            for q in queries[: min(len(queries), 300)]:
+                t1 = time.perf_counter()
+                got.append(_signature(router.match(q)))
+                latencies.append(time.perf_counter() - t1)
+            latencies.sort()
+
+            t1 = time.perf_counter()
+            batched = []
+            for i in range(0, len(queries), batch):
+                batched += router.search_batch(queries[i:i + batch])
+            batch_seconds = time.perf_counter() - t1
+            exact = sum(1 for a, b in zip(expected, (_signature(m) for m in batched)) if a == b)
+            rows.append({
+                "shards": len(router.shards),
+                "mode": "processes" if workers else "in-process",
+                "shard_sizes": router.sizes(),
+                "build_seconds": round(build, 4),
+                "p50_ms": round(percentile(latencies, 50) * 1e3, 4),
+                "p99_ms": round(percentile(latencies, 99) * 1e3, 4),
+                "throughput_qps": round(len(queries) / batch_seconds, 2) if batch_seconds else None,
+                "identical_to_single": round(exact / len(queries), 4) if queries else 1.0,
+            })
+        finally:
+            router.close()
+    return rows
+
+
+def _arg(flags, name, default=None):
+    if name in flags:
+        i = flags.index(name)
+        if i + 1 < len(flags):
+            return flags[i + 1]
+    return default
+
+
+def main():
+    from benchmarks import generators
+    from evaluate_matcher import index_options, load_labeled
+
+    flags = sys.argv[1:]
+    shard_counts = [int(x) for x in _arg(flags, "--shards", "1,2,4").split(",") if x]
+    scale = float(_arg(flags, "--scale", 1))
+    n_queries = int(_arg(flags, "--queries", 2000))
+    batch = int(_arg(flags, "--batch", 200))
+    options = index_options(flags)
+
+    if scale == 1:
+        categories = load_records(CATS_PATH, MATCH_FIELDS)
+    else:
+        categories = generators.generate_taxonomy(scale)
+    queries = [item["name"] for item in load_labeled()]
+    for row in generators.iter_poi_rows(max(0, n_queries - len(queries)), categories):
+        queries.append(row["name_ar"] if len(queries) % 3 else row["name_en"])
+
+    rows = run_harness(categories, queries, shard_counts, options, workers="--in-process" not in flags, batch=batch)
+    report = {
+        "categories": len(categories),
+        "queries": len(queries),
+        "cpu_count": os.cpu_count(),
+        "options": options,
+        "runs": rows,
+    }
+    OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+    print("Report:", OUT_REPORT)
+
+
+if __name__ == "__main__":
+    main()
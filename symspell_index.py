@@ -0,0 +1,154 @@
+"""
+فهرس SymSpell (الحذف المتماثل) للبحث المتسامح مع الأخطاء الإملائية
+
+يُحسب مسبقاً كل ما ينتج عن حذف حرف أو حرفين من كل كلمة في المفردات،
+فيصبح البحث عن المرشحين ضمن مسافة تحرير ≤ 2 مجرد عمليات بحث في dict
+بدلاً من مقارنة الكلمة بكل المفردات.
+"""
+
+import sys
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7  # حذف الحروف ضمن أول 7 أحرف فقط (يحدّ من حجم الفهرس)
+MAX_ENTRIES = 2_000_000  # سقف عدد مدخلات الحذف في الفهرس
+
+
+def _deletes(word, max_distance):
+    """كل الكلمات الناتجة عن حذف حتى max_distance حروف"""
+    out = set()
+    frontier = {word}
+    for _ in range(max_distance):
+        nxt = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                d = w[:i] + w[i + 1:]
+                if d not in out:
+                    nxt.add(d)
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+def edit_distance(a, b, max_distance=MAX_DISTANCE):
+    """مسافة Damerau-Levenshtein (OSA) مع توقف مبكر عند تجاوز الحد"""
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    if abs(la - lb) > max_distance:
+        return max_distance + 1
+    prev2 = None
+    prev = list(range(lb + 1))
+    for i in range(1, la + 1):
+        cur = [i] + [0] * lb
+        row_min = cur[0]
+        ca = a[i - 1]
+        for j in range(1, lb + 1):
+            cost = 0 if ca == b[j - 1] else 1
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1]):
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if row_min > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[lb]
+
+
+class SymSpellIndex:
+    """فهرس حذف متماثل: مفتاح الحذف -> الكلمات الأصلية"""
+
+    def __init__(self, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH, max_entries=MAX_ENTRIES):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.max_entries = max_entries
+        self.words = {}  # الكلمة -> التكرار
+        self.deletes = {}  # مفتاح الحذف -> قائمة الكلمات
+        self.entries = 0
+        self.truncated = 0  # كلمات لم تُفهرس حذوفاتها بسبب السقف
+
+    def add(self, word, count=1):
+        if not word:
+            return
+        if word in self.words:
+            self.words[word] += count
+            return
+        self.words[word] = count
+        prefix = word[:self.prefix_length]
+        keys = _deletes(prefix, self.max_distance)
+        keys.add(prefix)
+        if self.entries + len(keys) > self.max_entries:
+            # الكلمة تبقى قابلة للمطابقة التامة فقط
+            self.truncated += 1
+            return
+        for k in keys:
+            bucket = self.deletes.get(k)
+            if bucket is None:
+                self.deletes[k] = [word]
+            else:
+                bucket.append(word)
+        self.entries += len(keys)
+
+    def lookup(self, word, max_distance=None):
+        """المرشحون ضمن مسافة التحرير مرتبين (المسافة، -التكرار، الكلمة)"""
+        if max_distance is None:
+            max_distance = self.max_distance
+        max_distance = min(max_distance, self.max_distance)
+        if not word:
+            return []
+        if word in self.words:
+            return [(word, 0)]
+
+        prefix = word[:self.prefix_length]
+        probes = _deletes(prefix, max_distance)
+        probes.add(prefix)
+        seen = set()
+        out = []
+        for p in probes:
+            for cand in self.deletes.get(p, ()):
+                if cand in seen:
+                    continue
+                seen.add(cand)
+                d = edit_distance(word, cand, max_distance)
+                if d <= max_distance:
+                    out.append((cand, d))
+        out.sort(key=lambda x: (x[1], -self.words[x[0]], x[0]))
+        return out
+
+    def best(self, word, max_distance=None):
+        hits = self.lookup(word, max_distance)
+        return hits[0][0] if hits else None
+
+    def stats(self):
+        """إحصائيات الحجم والذاكرة التقريبية للفهرس"""
+        approx = sys.getsizeof(self.words) + sys.getsizeof(self.deletes)
+        for k, v in self.deletes.items():
+            approx += sys.getsizeof(k) + sys.getsizeof(v)
+        for w in self.words:
+            approx += sys.getsizeof(w)
+        return {
+            "words": len(self.words),
+            "delete_keys": len(self.deletes),
+            "entries": self.entries,
+            "max_entries": self.max_entries,
+            "truncated_words": self.truncated,
+            "approx_bytes": approx,
+        }
+
+
+def build_from_categories(categories, normalize, max_entries=MAX_ENTRIES):
+    """بناء الفهرس من مفردات الأسماء والكلمات المفتاحية المطبّعة"""
+    index = SymSpellIndex(max_entries=max_entries)
+    for c in categories:
+        texts = [c.get("name_ar"), c.get("name_en")]
+        texts += (c.get("search_key_words_ar") or []) + (c.get("search_key_words_en") or [])
+        seen = set()
+        for t in texts:
+            for tok in normalize(t or "").split():
+                if len(tok) > 1 and tok not in seen:
+                    seen.add(tok)
+                    index.add(tok)
+    return index
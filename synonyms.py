@@ -0,0 +1,154 @@
+"""
+جداول المرادفات الموحدة (synonyms.json) مجمّعة مسبقاً
+
+كل قواميس التوسيع (expand_keywords_v2 و mega_dictionary_complete و
+expand_keyword_bundles) في ملف واحد بجداول مسماة. كل جدول يُجمّع مرة واحدة إلى:
+
+- فهرس مباشر: مفتاح -> رقمه، وقيمة -> أرقام المفاتيح التي تحتويها
+- آلة Aho-Corasick على المفاتيح: كل المفاتيح الموجودة داخل نص في مرور واحد
+- فهرس المقاطع: مقطع -> أرقام المفاتيح التي تحتويه (عكس الاتجاه)
+
+النتائج ترجع أرقام المفاتيح بترتيبها في الملف، فيبقى ترتيب الإضافة كما كان
+مع حلقات `for key in dict` السابقة. النسخة المجمّعة تُحفظ في ملف pickle
+وتُستخدم ما دام synonyms.json لم يتغير.
+"""
+
+import json
+import pickle
+from pathlib import Path
+
+import compressed_io
+
+ROOT = Path(__file__).parent
+SYNONYMS_PATH = ROOT / "synonyms.json"
+CACHE_PATH = ROOT / ".synonyms_cache.pickle"
+CACHE_VERSION = 1
+
+
+class SynonymTable:
+    __slots__ = ("keys", "values", "index", "by_value", "goto", "fail", "out", "containing")
+
+    def __init__(self, mapping):
+        self.keys = list(mapping)
+        self.values = [list(v) for v in mapping.values()]
+        self.index = {k: i for i, k in enumerate(self.keys)}
+        by_value = {}
+        for i, vals in enumerate(self.values):
+            for v in vals:
+                ids = by_value.setdefault(v, [])
+                if not ids or ids[-1] != i:
+                    ids.append(i)
+        self.by_value = {v: tuple(ids) for v, ids in by_value.items()}
+        self._build_automaton()
+        containing = {}
+        for i, k in enumerate(self.keys):
+            for sub in {k[a:b] for a in range(len(k)) for b in range(a + 1, len(k) + 1)}:
+                containing.setdefault(sub, []).append(i)
+        self.containing = {sub: tuple(ids) for sub, ids in containing.items()}
+
+    def _build_automaton(self):
+        goto, out = [{}], [[]]
+        for i, key in enumerate(self.keys):
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(i)
+        fail = [0] * len(goto)
+        queue = [0]
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                if state == 0:
+                    continue
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self.goto = goto
+        self.fail = fail
+        self.out = [tuple(o) for o in out]
+
+    def get(self, key, default=None):
+        i = self.index.get(key)
+        return self.values[i] if i is not None else default
+
+    def keys_in(self, text):
+        """أرقام المفاتيح الموجودة داخل النص (key in text)"""
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return sorted(found)
+
+    def keys_containing(self, text):
+        """أرقام المفاتيح التي تحتوي النص (text in key)"""
+        if not text:
+            return list(range(len(self.keys)))
+        return list(self.containing.get(text, ()))
+
+    def keys_related(self, text):
+        """key in text أو text in key"""
+        return sorted(set(self.keys_in(text)).union(self.keys_containing(text)))
+
+    def keys_with_value(self, value):
+        return self.by_value.get(value, ())
+
+    def as_dict(self):
+        return dict(zip(self.keys, self.values))
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _stamp(path):
+    st = compressed_io.resolve(path).stat()
+    return {"size": st.st_size, "mtime": st.st_mtime_ns}
+
+
+def compile_tables(path=SYNONYMS_PATH):
+    data = json.loads(compressed_io.read_text(path))
+    return {name: SynonymTable(mapping) for name, mapping in data.items()}
+
+
+def load_tables(path=SYNONYMS_PATH, cache_path=CACHE_PATH):
+    """الجداول المجمّعة من ذاكرة التخزين على القرص، أو تجميعها وحفظها"""
+    stamp = _stamp(path)
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("version") == CACHE_VERSION and cached.get("source") == stamp:
+            return cached["tables"]
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+        pass
+    tables = compile_tables(path)
+    try:
+        tmp = Path(cache_path).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "source": stamp, "tables": tables}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(cache_path)
+    except OSError:
+        pass  # مجلد للقراءة فقط: نكتفي بالنسخة في الذاكرة
+    return tables
+
+
+_TABLES = None
+
+
+def table(name):
+    """جدول مجمّع بالاسم (يُحمّل مرة واحدة لكل عملية)"""
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = load_tables()
+    return _TABLES[name]
@@ -0,0 +1,307 @@
+"""
+فروق ملفات التصنيفات (diff/patch) بدلاً من إعادة تحميل الملف كاملاً
+
+عند إعادة توليد categories_validated.json أو categories_bundled.json يتغير
+عادةً عدد قليل من الكلمات المفتاحية، لكن كل مستهلك يعيد قراءة الملف كله.
+هنا:
+
+- diff_categories: فرق منظم بين نسختين في زمن خطي (dict حسب id):
+  تصنيفات مضافة/محذوفة، وللمتغيرة الحقول الجديدة وفروق قوائم الكلمات
+  (add/remove) بدلاً من القائمة كاملة، وترتيب الملف فقط إذا تغيّر
+- apply_patch: تطبيق الفرق على قائمة في الذاكرة (السجلات غير المتغيرة تبقى
+  نفس الكائنات)، و apply_to_index على CategoryIndex بالتحديثات الحية
+- VersionStore: سلسلة نسخ (بصمة المحتوى -> فرق عن النسخة السابقة) حتى
+  يلحق أي مستهلك بآخر نسخة من أي نسخة سابقة يعرفها
+
+    python taxonomy_patch.py diff <old.json> <new.json> [--out patch.json]
+    python taxonomy_patch.py publish <categories.json> [--store DIR]
+    python taxonomy_patch.py catch-up <categories.json> <version> [--store DIR] [--out new.json]
+"""
+
+import copy
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from artifact_io import load_artifact
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+STORE_DIR = DATA_DIR / "taxonomy_versions"
+OUT_REPORT = DATA_DIR / "taxonomy_patch_report.json"
+
+PATCH_VERSION = 1
+
+
+def taxonomy_version(categories):
+    """بصمة المحتوى (مستقلة عن المسافات وترتيب المفاتيح)"""
+    blob = json.dumps(categories, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _list_diff(old, new):
+    """{"add", "remove"} إذا كان يعيد القائمة الجديدة بالضبط، وإلا None"""
+    new_set = set(new)
+    old_set = set(old)
+    remove = [x for x in old if x not in new_set]
+    add = [x for x in new if x not in old_set]
+    removed = set(remove)
+    if [x for x in old if x not in removed] + add != new:
+        return None  # إعادة ترتيب أو تكرار: القائمة كاملة أبسط
+    return {"add": add, "remove": remove}
+
+
+def _record_diff(old, new):
+    fields, lists = {}, {}
+    for key, value in new.items():
+        prev = old.get(key, _MISSING)
+        if prev == value:
+            continue
+        if isinstance(prev, list) and isinstance(value, list):
+            d = _list_diff(prev, value)
+            if d is not None and len(d["add"]) + len(d["remove"]) < len(value):
+                lists[key] = d
+                continue
+        fields[key] = value
+    dropped = [key for key in old if key not in new]
+    if not (fields or lists or dropped):
+        return None
+    change = {"id": new["id"]}
+    if fields:
+        change["fields"] = fields
+    if lists:
+        change["lists"] = lists
+    if dropped:
+        change["dropped"] = dropped
+    return change
+
+
+_MISSING = object()
+
+
+def diff_categories(old, new, base=None):
+    """الفرق من old إلى new؛ base = بصمة old إن كانت محسوبة"""
+    old_by_id = {c["id"]: c for c in old}
+    new_ids = {c["id"] for c in new}
+    added, changed = [], []
+    for c in new:
+        prev = old_by_id.get(c["id"])
+        if prev is None:
+            added.append(c)
+        else:
+            change = _record_diff(prev, c)
+            if change is not None:
+                changed.append(change)
+    removed = [c["id"] for c in old if c["id"] not in new_ids]
+    patch = {
+        "format": PATCH_VERSION,
+        "base": base or taxonomy_version(old),
+        "version": taxonomy_version(new),
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+    # الترتيب الناتج عن التطبيق: القديم بدون المحذوف ثم المضاف بترتيبه
+    dropped = set(removed)
+    expected = [c["id"] for c in old if c["id"] not in dropped] + [c["id"] for c in added]
+    if expected != [c["id"] for c in new]:
+        patch["order"] = [c["id"] for c in new]
+    return patch
+
+
+def patch_record(c, change):
+    """نسخة جديدة من السجل بعد تطبيق التغيير (السجل الأصلي لا يُعدّل)"""
+    out = dict(c)
+    for key in change.get("dropped", ()):
+        out.pop(key, None)
+    out.update(copy.deepcopy(change.get("fields", {})))
+    for key, d in change.get("lists", {}).items():
+        remove = set(d["remove"])
+        out[key] = [x for x in out.get(key) or [] if x not in remove] + d["add"]
+    return out
+
+
+def apply_patch(categories, patch):
+    """قائمة التصنيفات الجديدة؛ السجلات التي لم تتغير تبقى نفس الكائنات"""
+    changes = {ch["id"]: ch for ch in patch["changed"]}
+    removed = set(patch["removed"])
+    out = []
+    for c in categories:
+        if c["id"] in removed:
+            continue
+        change = changes.get(c["id"])
+        out.append(patch_record(c, change) if change else c)
+    out.extend(copy.deepcopy(patch["added"]))
+    if "order" in patch:
+        by_id = {c["id"]: c for c in out}
+        out = [by_id[cid] for cid in patch["order"]]
+    return out
+
+
+def index_ops(patch, by_id):
+    """(العملية، المعامل) لتحديث فهرس حي: remove ثم update ثم add"""
+    for cid in patch["removed"]:
+        if cid in by_id:
+            yield "remove", cid
+    for change in patch["changed"]:
+        if change["id"] in by_id:
+            yield "update", patch_record(by_id[change["id"]], change)
+    for c in patch["added"]:
+        yield "add", copy.deepcopy(c)
+
+
+def apply_to_index(index, patch):
+    """تطبيق الفرق على CategoryIndex بدون إعادة بنائه (ترتيب الملف لا يُعاد على الفهرس)"""
+    ops = {"add": index.add_category, "remove": index.remove_category, "update": index.update_category}
+    n = 0
+    for op, arg in list(index_ops(patch, index.by_id)):
+        ops[op](arg)
+        n += 1
+    return n
+
+
+class VersionStore:
+    """مجلد فيه manifest.json (سلسلة النسخ) وملف فرق لكل نسخة ونسخة كاملة من الأخيرة"""
+
+    def __init__(self, path=STORE_DIR):
+        self.path = Path(path)
+        self.manifest_path = self.path / "manifest.json"
+        self.head_path = self.path / "head.json"
+        if self.manifest_path.exists():
+            self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        else:
+            self.manifest = {"head": None, "versions": []}
+
+    @property
+    def head(self):
+        return self.manifest["head"]
+
+    def publish(self, categories):
+        """تسجيل نسخة جديدة (فرق عن الأخيرة)؛ None إذا لم يتغير المحتوى"""
+        version = taxonomy_version(categories)
+        if version == self.head:
+            return None
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry = {"version": version, "parent": self.head, "categories": len(categories)}
+        if self.head is not None:
+            previous = json.loads(self.head_path.read_text(encoding="utf-8"))
+            patch = diff_categories(previous, categories, base=self.head)
+            # اسم فريد بموقع النسخة في السلسلة: الرجوع لنسخة سابقة لا يستبدل فرقها القديم
+            name = f"{len(self.manifest['versions']):04d}-{version}.patch.json"
+            (self.path / name).write_text(json.dumps(patch, ensure_ascii=False, separators=(",", ":")),
+                                          encoding="utf-8")
+            entry.update(patch=name, added=len(patch["added"]), removed=len(patch["removed"]),
+                         changed=len(patch["changed"]), bytes=(self.path / name).stat().st_size)
+        _write(self.head_path, json.dumps(categories, ensure_ascii=False, separators=(",", ":")))
+        self.manifest["versions"].append(entry)
+        self.manifest["head"] = version
+        _write(self.manifest_path, json.dumps(self.manifest, ensure_ascii=False, indent=2))
+        return entry
+
+    def chain(self, since):
+        """الفروق بالترتيب من النسخة since إلى الأخيرة؛ KeyError إذا كانت غير معروفة"""
+        versions = [v["version"] for v in self.manifest["versions"]]
+        if since not in versions:
+            raise KeyError(f"Unknown taxonomy version {since!r}; reload {self.head_path}")
+        # آخر ظهور للنسخة (قد تتكرر إذا رجع المحتوى لنسخة سابقة): أقصر سلسلة
+        start = len(versions) - 1 - versions[::-1].index(since)
+        out = []
+        for entry in self.manifest["versions"][start + 1:]:
+            out.append(json.loads((self.path / entry["patch"]).read_text(encoding="utf-8")))
+        return out
+
+    def catch_up(self, categories, since):
+        """(التصنيفات بعد تطبيق كل الفروق، النسخة الأخيرة، عدد الفروق)
+
+        ValueError إذا لم تكن categories هي النسخة since، أو لم تصل النتيجة
+        إلى النسخة الأخيرة (سلسلة تالفة)، بدلاً من إرجاع تصنيفات خاطئة بصمت.
+        """
+        actual = taxonomy_version(categories)
+        if actual != since:
+            raise ValueError(f"Categories are version {actual}, not {since!r}")
+        patches = self.chain(since)
+        for patch in patches:
+            categories = apply_patch(categories, patch)
+        actual = taxonomy_version(categories)
+        if actual != self.head:
+            raise ValueError(f"Patch chain from {since} ended at {actual}, expected head {self.head}; "
+                             f"reload {self.head_path}")
+        return categories, self.head, len(patches)
+
+    def load_head(self):
+        return json.loads(self.head_path.read_text(encoding="utf-8"))
+
+
+def _write(path, text):
+    tmp = Path(path).with_suffix(".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+def _arg(flags, name, default=None):
+    if name in flags:
+        i = flags.index(name)
+        if i + 1 < len(flags):
+            return flags[i + 1]
+    return default
+
+
+def diff_report(old_path, new_path):
+    """الفرق مع الزمن والحجم مقارنة بإعادة تحميل الملف الجديد كاملاً"""
+    old = load_artifact(old_path)
+    t0 = time.perf_counter()
+    new = load_artifact(new_path)
+    load_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    patch = diff_categories(old, new)
+    diff_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    patched = apply_patch(old, patch)
+    apply_s = time.perf_counter() - t0
+    patch_bytes = len(json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return patch, {
+        "old": str(old_path),
+        "new": str(new_path),
+        "added": len(patch["added"]),
+        "removed": len(patch["removed"]),
+        "changed": len(patch["changed"]),
+        "reordered": "order" in patch,
+        "exact": patched == new,
+        "file_bytes": Path(new_path).stat().st_size,
+        "patch_bytes": patch_bytes,
+        "full_load_ms": round(load_s * 1e3, 3),
+        "diff_ms": round(diff_s * 1e3, 3),
+        "apply_ms": round(apply_s * 1e3, 3),
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in ("diff", "publish", "catch-up"):
+        print("Usage: python taxonomy_patch.py diff <old.json> <new.json> [--out patch.json]")
+        print("       python taxonomy_patch.py publish <categories.json> [--store DIR]")
+        print("       python taxonomy_patch.py catch-up <categories.json> <version> [--store DIR] [--out new.json]")
+        sys.exit(1)
+    store = VersionStore(Path(_arg(args, "--store", STORE_DIR)))
+    if args[0] == "diff":
+        patch, report = diff_report(Path(args[1]), Path(args[2]))
+        if _arg(args, "--out"):
+            Path(_arg(args, "--out")).write_text(json.dumps(patch, ensure_ascii=False, indent=2), encoding="utf-8")
+        OUT_REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        print("Report:", OUT_REPORT)
+    elif args[0] == "publish":
+        entry = store.publish(load_artifact(Path(args[1])))
+        print("Unchanged:", store.head) if entry is None else print("Published:", json.dumps(entry))
+    else:
+        categories, head, n = store.catch_up(load_artifact(Path(args[1])), args[2])
+        if _arg(args, "--out"):
+            Path(_arg(args, "--out")).write_text(json.dumps(categories, ensure_ascii=False, indent=2),
+                                                 encoding="utf-8")
+        print(f"Applied {n} patch(es); now at {head} ({len(categories)} categories)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+مفتاح صوتي مشترك بين العربية واللاتينية (Arabizi)
+
+يحوّل الكلمة العربية أو تهجئتها اللاتينية إلى هيكل حروف ساكنة موحّد:
+    كنافة / kunafa / kunafeh / knafeh  -> "knf"
+    ورق عنب / warak enab / waraq 3enab -> "wrk nb"
+الرقم 2 همزة في Arabizi فيُحذف: wara2 (نطق القاف همزةً) -> "wr" لا "wrk".
+يُحسب المفتاح مسبقاً لكل كلمة مفتاحية في فهرس، فيصبح الاستعلام اللاتيني
+بحثاً واحداً في dict يعيد الصيغة العربية المقابلة.
+"""
+
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import compressed_io
+
+ROOT = Path(__file__).parent
+DATA_DIR = ROOT / "wash-tasnifoh" / "data"
+BASE = DATA_DIR / "categories.json"
+OUT_REPORT = DATA_DIR / "transliteration_report.json"
+
+MIN_KEY_LEN = 3  # المفاتيح الأقصر تتصادم كثيراً
+
+# فئات الحروف الساكنة (حروف العلة والهمزة والعين تُحذف)
+AR_CLASSES = {
+    'ب': 'b', 'پ': 'b', 'ت': 't', 'ث': 't', 'ط': 't', 'ج': 'j', 'چ': 'S',
+    'ح': 'h', 'ه': 'h', 'خ': 'x', 'د': 'd', 'ذ': 'd', 'ض': 'd', 'ر': 'r',
+    'ز': 'z', 'ظ': 'z', 'س': 's', 'ص': 's', 'ش': 'S', 'غ': 'g', 'گ': 'g',
+    'ف': 'f', 'ڤ': 'f', 'ق': 'k', 'ك': 'k', 'ل': 'l', 'م': 'm', 'ن': 'n',
+}
+AR_SEMI = {'و': 'w', 'ي': 'y'}
+
+# الثنائيات تُستبدل أولاً برموز كبيرة حتى لا تتداخل مع الحروف المفردة
+LATIN_DIGRAPHS = [('sh', 'S'), ('ch', 'S'), ('kh', 'X'), ('gh', 'G'), ('th', 'T'), ('dh', 'D'), ('ph', 'F')]
+DIGRAPH_CLASSES = {'S': 'S', 'X': 'x', 'G': 'g', 'T': 't', 'D': 'd', 'F': 'f'}
+LATIN_CLASSES = {
+    'b': 'b', 'p': 'b', 't': 't', 'j': 'j', 'g': 'j', 'h': 'h', 'd': 'd',
+    'r': 'r', 'z': 'z', 's': 's', 'f': 'f', 'v': 'f', 'k': 'k', 'q': 'k',
+    'c': 'k', 'l': 'l', 'm': 'm', 'n': 'n', 'x': 'ks',
+    # أرقام Arabizi
+    '5': 'x', '7': 'h', '6': 't', '8': 'g', '9': 's',
+}
+LATIN_SEMI = {'w': 'w', 'y': 'y'}
+LATIN_ARTICLES = {'al', 'el'}
+
+_AR_STRIP = re.compile(r'[ً-ٰٟـ]')
+_ARABIC = re.compile(r'[؀-ۿ]')
+_LATIN = re.compile(r'[A-Za-z]')
+
+
+def _collapse(chars):
+    out = []
+    for ch in chars:
+        if not out or out[-1] != ch:
+            out.append(ch)
+    # الهاء الأخيرة غالباً تاء مربوطة أو حرف علة (kunafeh / كنافه)
+    if len(out) > 1 and out[-1] == 'h':
+        out.pop()
+    return ''.join(out)
+
+
+def _arabic_token_key(tok):
+    if tok.startswith('ال') and len(tok) > 3:
+        tok = tok[2:]
+    out = []
+    for i, ch in enumerate(tok):
+        cls = AR_CLASSES.get(ch)
+        if cls:
+            out.append(cls)
+        elif ch in AR_SEMI and i == 0:
+            out.append(AR_SEMI[ch])
+    return _collapse(out)
+
+
+def _latin_token_key(tok):
+    for a, b in LATIN_DIGRAPHS:
+        tok = tok.replace(a, b)
+    out = []
+    for i, ch in enumerate(tok):
+        cls = DIGRAPH_CLASSES.get(ch) or LATIN_CLASSES.get(ch)
+        if cls:
+            out.append(cls)
+        elif ch in LATIN_SEMI and i == 0:
+            out.append(LATIN_SEMI[ch])
+    return _collapse(out)
+
+
+def phonetic_key(text):
+    """المفتاح الصوتي للنص (عربي أو لاتيني أو مختلط)"""
+    if not text:
+        return ""
+    text = _AR_STRIP.sub('', str(text))
+    parts = []
+    for tok in re.split(r'[\s\-_/،,.]+', text):
+        if not tok:
+            continue
+        if _ARABIC.search(tok):
+            key = _arabic_token_key(tok)
+        else:
+            low = tok.lower()
+            if low in LATIN_ARTICLES:
+                continue
+            key = _latin_token_key(low)
+        if key:
+            parts.append(key)
+    return ' '.join(parts)
+
+
+def is_latin(text):
+    return bool(text) and bool(_LATIN.search(text)) and not _ARABIC.search(text)
+
+
+class TransliterationIndex:
+    """مفتاح صوتي -> الصيغة العربية الأكثر شيوعاً والتصنيفات المالكة"""
+
+    def __init__(self, categories, normalize=None):
+        forms = defaultdict(Counter)
+        owners = defaultdict(set)
+        for c in categories:
+            texts = [c.get("name_ar")] + list(c.get("search_key_words_ar") or [])
+            for t in texts:
+                if not t or not _ARABIC.search(t):
+                    continue
+                form = normalize(t) if normalize else t.strip()
+                candidates = [form] + (form.split() if ' ' in form else [])
+                for f in candidates:
+                    key = phonetic_key(f)
+                    if len(key.replace(' ', '')) >= MIN_KEY_LEN:
+                        forms[key][f] += 1
+                        owners[key].add(c["id"])
+        self.forms = {k: cnt.most_common(1)[0][0] for k, cnt in forms.items()}
+        self.owners = {k: sorted(v) for k, v in owners.items()}
+
+    def lookup(self, text):
+        """الصيغة العربية المقابلة لنص لاتيني (أو None)"""
+        return self.forms.get(phonetic_key(text))
+
+    def categories_for(self, text):
+        return self.owners.get(phonetic_key(text), [])
+
+    def __len__(self):
+        return len(self.forms)
+
+
+def redundant_latin_keywords(cat):
+    """الكلمات اللاتينية في search_key_words_ar التي يغطيها مفتاح كلمة عربية في نفس التصنيف"""
+    ar = cat.get("search_key_words_ar") or []
+    keys = set()
+    for kw in ar + [cat.get("name_ar") or ""]:
+        if _ARABIC.search(kw):
+            keys.add(phonetic_key(kw))
+    return [kw for kw in ar if is_latin(kw) and phonetic_key(kw) in keys]
+
+
+def main():
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 and not sys.argv[1].startswith("--") else BASE
+    cats = json.loads(compressed_io.read_text(path))
+    index = TransliterationIndex(cats)
+
+    redundant = {}
+    for c in cats:
+        red = redundant_latin_keywords(c)
+        if red:
+            redundant[str(c["id"])] = red
+
+    if "--prune" in sys.argv:
+        # إزالة التهجئات اللاتينية المكررة لأن الفهرس يغطيها
+        out = path.with_name(path.stem + "_translit_pruned.json")
+        for c in cats:
+            red = set(redundant.get(str(c["id"]), []))
+            if red:
+                c["search_key_words_ar"] = [k for k in c["search_key_words_ar"] if k not in red]
+        out.write_text(json.dumps(cats, ensure_ascii=False, indent=2), encoding="utf-8")
+        print("Pruned:", out)
+
+    total = sum(len(v) for v in redundant.values())
+    OUT_REPORT.write_text(json.dumps({
+        "source": str(path),
+        "keys": len(index),
+        "redundant_latin_keywords": total,
+        "by_category": redundant,
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    print("Keys:", len(index))
+    print("Redundant Latin spellings:", total)
+    print("Report:", OUT_REPORT)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,30 @@
 import json
+import math
 import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+import profiling
+from artifact_io import DEFAULT_FORMAT, FORMATS, is_format, load_artifact, write_records
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+NGRAM = 3
+# أقل تشابه جيب تمام بين الكلمة واسم التصنيف للإبقاء عليها؛ معايَر على
+# keyword_eval_set.json (أزواج إبقاء/حذف معنونة) بأعلى F0.5 (الدقة أهم من
+# الاستدعاء: الإبقاء على كلمة خاطئة أسوأ من حذف صحيحة). انظر --calibrate
+NGRAM_THRESHOLD = 0.35
+KEYWORD_EVAL_SET = Path(__file__).parent / 'keyword_eval_set.json'
+
+# بادئات التراكيب المولّدة آلياً (gen_ar_variants: محل/متجر، ونوع النشاط في
+# categories_complete.json): "صيانة خط بنفسجي" تشابه "الخط البنفسجي" حرفياً
+# لكنها ليست كلمة للتصنيف، فلا تُنقذ بالمقاطع الحرفية
+TEMPLATE_PREFIXES = {'محل', 'متجر', 'خدمات', 'صيانه', 'شركه', 'بيع', 'ورشه', 'تصليح', 'مركز', 'مكتب', 'معرض'}
 
 def normalize_arabic(text):
     """تنظيف وتوحيد النص العربي"""
@@ -38,15 +63,148 @@ def get_category_words(category_name):
     words = re.split(r'[\s،,\-/]+', category_name)
     return [w for w in words if len(w) > 1 and normalize_arabic(w) not in stop_words]
 
-def validate_and_clean_keywords(input_file, output_file):
-    """التحقق من الكلمات المفتاحية وإزالة غير المرتبطة"""
-
-    print("📖 قراءة الملف...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"✅ تم تحميل {len(data)} تصنيف\n")
-
+def is_template_variant(keyword_norm):
+    """هل الكلمة (مطبّعة) تركيب مولّد: بادئة نشاط + اسم التصنيف؟"""
+    words = keyword_norm.split()
+    return len(words) > 1 and words[0] in TEMPLATE_PREFIXES
+
+
+def char_ngrams(text, n=NGRAM):
+    """مقاطع حرفية بطول n مع حدود الكلمة (" مخبز " -> " مخ"، "مخب"، ...)"""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def _tfidf_rows(docs, n=NGRAM):
+    """(المقاطع، الأوزان) لكل نص بعد TF-IDF وتطبيع L2"""
+    counts = [Counter(char_ngrams(d, n)) for d in docs]
+    df = Counter(g for c in counts for g in c)
+    total = len(docs)
+    idf = {g: math.log((1 + total) / (1 + v)) + 1 for g, v in df.items()}
+    return counts, idf
+
+
+def _sparse_similarity(counts, idf, left, right):
+    vocab = {g: j for j, g in enumerate(idf)}
+    indptr, indices, values = [0], [], []
+    for c in counts:
+        for g, tf in c.items():
+            indices.append(vocab[g])
+            values.append(tf * idf[g])
+        indptr.append(len(indices))
+    x = sparse.csr_matrix((np.array(values), np.array(indices), np.array(indptr)),
+                          shape=(len(counts), len(vocab)))
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    x = sparse.diags(1.0 / np.where(norms > 0, norms, 1.0)) @ x
+    return np.asarray(x[np.array(left)].multiply(x[np.array(right)]).sum(axis=1)).ravel().tolist()
+
+
+def _dict_similarity(counts, idf, left, right):
+    vectors = []
+    for c in counts:
+        vec = {g: tf * idf[g] for g, tf in c.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        vectors.append({g: v / norm for g, v in vec.items()})
+    out = []
+    for a, b in zip(left, right):
+        va, vb = vectors[a], vectors[b]
+        if len(vb) < len(va):
+            va, vb = vb, va
+        out.append(sum(v * vb.get(g, 0.0) for g, v in va.items()))
+    return out
+
+
+def ngram_similarity(pairs, n=NGRAM, use_sparse=None):
+    """تشابه جيب التمام بين متجهي TF-IDF للمقاطع الحرفية لكل زوج (كلمة، اسم)
+
+    كل النصوص في مصفوفة متفرقة واحدة (NumPy/SciPy)، والتشابه لكل الأزواج
+    بضرب عنصري ثم جمع صفوف؛ بدون NumPy/SciPy (أو use_sparse=False) نفس
+    الحساب بقواميس. انظر --check-backends لمقارنة المسارين.
+    """
+    if not pairs:
+        return []
+    docs = {}
+    for a, b in pairs:
+        docs.setdefault(a, len(docs))
+        docs.setdefault(b, len(docs))
+    counts, idf = _tfidf_rows(list(docs), n)
+    left = [docs[a] for a, _ in pairs]
+    right = [docs[b] for _, b in pairs]
+    if use_sparse is None:
+        use_sparse = sparse is not None
+    if use_sparse:
+        if sparse is None:
+            raise RuntimeError("use_sparse=True يتطلب numpy و scipy")
+        return _sparse_similarity(counts, idf, left, right)
+    return _dict_similarity(counts, idf, left, right)
+
+
+def check_backends(labeled, tol=1e-9):
+    """أكبر فرق بين تشابه مسار SciPy ومسار القواميس على أزواج معنونة
+
+    يرجع None إذا لم تتوفر numpy/scipy (لا يمكن المقارنة).
+    """
+    if sparse is None:
+        return None
+    pairs = [(normalize_arabic(x['keyword']), normalize_arabic(x['category'])) for x in labeled]
+    fast = ngram_similarity(pairs, use_sparse=True)
+    slow = ngram_similarity(pairs, use_sparse=False)
+    return max((abs(a - b) for a, b in zip(fast, slow)), default=0.0)
+
+
+def ngram_matches(data, threshold=NGRAM_THRESHOLD):
+    """(موقع التصنيف، اللغة، الكلمة) للكلمات القريبة حرفياً من اسم تصنيفها"""
+    keys, pairs = [], []
+    for i, category in enumerate(data):
+        for lang in ('ar', 'en'):
+            name = normalize_arabic(category.get(f'name_{lang}') or '')
+            if not name:
+                continue
+            for kw in category.get(f'search_key_words_{lang}') or []:
+                kw_norm = normalize_arabic(kw)
+                if is_template_variant(kw_norm):
+                    continue
+                keys.append((i, lang, kw))
+                pairs.append((kw_norm, name))
+    return {key for key, sim in zip(keys, ngram_similarity(pairs)) if sim >= threshold}
+
+
+def calibrate_threshold(labeled, thresholds=None, beta=0.5):
+    """دقة/استدعاء/F-beta لكل عتبة على أزواج معنونة {keyword, category, keep}
+
+    يرجع (الصفوف، أفضل عتبة). الأزواج هي كلمات لا يبقيها فحص النص الجزئي،
+    أي بالضبط ما يقرره وضع ngram.
+    """
+    thresholds = thresholds or [round(0.2 + 0.05 * k, 2) for k in range(9)]
+    pairs = [(normalize_arabic(x['keyword']), normalize_arabic(x['category'])) for x in labeled]
+    sims = ngram_similarity(pairs)
+    rows = []
+    for t in thresholds:
+        tp = fp = fn = 0
+        for x, (kw_norm, _), sim in zip(labeled, pairs, sims):
+            kept = sim >= t and not is_template_variant(kw_norm)
+            tp += kept and x['keep']
+            fp += kept and not x['keep']
+            fn += not kept and x['keep']
+        p = tp / (tp + fp) if tp + fp else 0.0
+        r = tp / (tp + fn) if tp + fn else 0.0
+        f = (1 + beta ** 2) * p * r / (beta ** 2 * p + r) if p + r else 0.0
+        rows.append({'threshold': t, 'precision': round(p, 3), 'recall': round(r, 3),
+                     f'f{beta:g}': round(f, 3), 'kept': tp + fp})
+    best = max(rows, key=lambda row: row[f'f{beta:g}'])['threshold']
+    return rows, best
+
+
+def clean_categories(data, verbose=True, mode="substring", threshold=NGRAM_THRESHOLD):
+    """تنظيف الكلمات المفتاحية لكل التصنيفات في الذاكرة وإرجاع الإحصائيات
+
+    mode="ngram": تبقى أيضاً الكلمات التي تشابه اسم التصنيف بالمقاطع الحرفية
+    (جيب تمام >= threshold) مثل مخابز/مخبز و bakeries/bakery، محسوبة دفعة واحدة
+    لكل التصنيفات قبل المرور عليها.
+    """
+    similar = ngram_matches(data, threshold) if mode == "ngram" else set()
     total_removed_ar = 0
     total_removed_en = 0
     total_kept_ar = 0
@@ -54,10 +212,8 @@ def validate_and_clean_keywords(input_file, output_file):
 
     issues = []
 
-    print("🔍 التحقق من الكلمات المفتاحية...\n")
-
     for i, category in enumerate(data):
-        if i % 100 == 0:
+        if verbose and i % 100 == 0:
             print(f"   معالجة {i}/{len(data)}...")
 
         name_ar = category.get('name_ar', '')
@@ -76,7 +232,7 @@ def validate_and_clean_keywords(input_file, output_file):
             invalid_ar = []
 
             for kw in original_ar:
-                if is_keyword_relevant(kw, name_ar, words_ar):
+                if is_keyword_relevant(kw, name_ar, words_ar) or (i, 'ar', kw) in similar:
                     valid_ar.append(kw)
                 else:
                     invalid_ar.append(kw)
@@ -114,6 +270,8 @@ def validate_and_clean_keywords(input_file, output_file):
                     valid_en.append(kw)
                 elif kw_lower in name_en_lower or name_en_lower in kw_lower:
                     valid_en.append(kw)
+                elif (i, 'en', kw) in similar:
+                    valid_en.append(kw)
                 else:
                     invalid_en.append(kw)
 
@@ -122,6 +280,35 @@ def validate_and_clean_keywords(input_file, output_file):
             total_kept_en += len(valid_en)
             total_removed_en += len(invalid_en)
 
+    return {
+        'kept_ar': total_kept_ar,
+        'removed_ar': total_removed_ar,
+        'kept_en': total_kept_en,
+        'removed_en': total_removed_en,
+        'issues': issues,
+    }
+
+def validate_and_clean_keywords(input_file, output_file, profiler=None, fmt=DEFAULT_FORMAT, mode="substring"):
+    """التحقق من الكلمات المفتاحية وإزالة غير المرتبطة"""
+    prof = profiler or profiling.DISABLED
+
+    print("📖 قراءة الملف...")
+    prof.start("load")
+    data = load_artifact(input_file)
+    prof.stop("load", rows=len(data))
+
+    print(f"✅ تم تحميل {len(data)} تصنيف\n")
+
+    print("🔍 التحقق من الكلمات المفتاحية...\n")
+
+    prof.start("validate")
+    stats = clean_categories(data, mode=mode)
+    prof.stop("validate", rows=len(data))
+
+    total_kept_ar, total_removed_ar = stats['kept_ar'], stats['removed_ar']
+    total_kept_en, total_removed_en = stats['kept_en'], stats['removed_en']
+    issues = stats['issues']
+
     print(f"\n📊 نتائج التحقق:")
     print(f"   كلمات عربية:")
     print(f"     - محفوظة: {total_kept_ar}")
@@ -141,8 +328,9 @@ def validate_and_clean_keywords(input_file, output_file):
 
     # حفظ الملف النظيف
     print(f"\n💾 حفظ الملف المنظف...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    prof.start("serialize")
+    output_file = write_records(output_file, data, fmt)
+    prof.stop("serialize", rows=len(data))
 
     print(f"✅ تم! حُفظ في: {output_file}\n")
 
@@ -159,7 +347,33 @@ if __name__ == '__main__':
     input_file = r'f:\category and subcategory\categories_complete.json'
     output_file = r'f:\category and subcategory\categories_validated.json'
 
-    validate_and_clean_keywords(input_file, output_file)
+    flags = sys.argv[1:]
+    if '--calibrate' in flags:
+        # --calibrate: عتبة ngram على keyword_eval_set.json بدون تعديل أي ملف
+        rows, best = calibrate_threshold(json.loads(KEYWORD_EVAL_SET.read_text(encoding='utf-8')))
+        for row in rows:
+            print('   ' + '  '.join(f'{k}={v}' for k, v in row.items()))
+        print(f"أفضل عتبة: {best} (الحالية {NGRAM_THRESHOLD})")
+        sys.exit(0)
+    if '--check-backends' in flags:
+        # --check-backends: مسار SciPy يعطي نفس تشابه مسار القواميس على keyword_eval_set.json
+        diff = check_backends(json.loads(KEYWORD_EVAL_SET.read_text(encoding='utf-8')))
+        if diff is None:
+            print("numpy/scipy غير مثبتة: لا يوجد مسار ثانٍ للمقارنة")
+            sys.exit(0)
+        print(f"أكبر فرق بين المسارين: {diff:.2e}")
+        sys.exit(0 if diff <= 1e-9 else 1)
+    prof = profiling.Profiler("validate_keywords", enabled='--profile' in flags)
+    fmt = flags[flags.index('--format') + 1] if '--format' in flags else DEFAULT_FORMAT
+    if not is_format(fmt):
+        print(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)}, optionally + .gz / .zst)")
+        sys.exit(2)
+    # --ngram: إبقاء الكلمات القريبة حرفياً من الاسم (TF-IDF للمقاطع الحرفية)
+    mode = 'ngram' if '--ngram' in flags else 'substring'
+    validate_and_clean_keywords(input_file, output_file, profiler=prof, fmt=fmt, mode=mode)
+    trace = prof.write(Path(output_file).with_name('validate_profile.json'))
+    if trace:
+        print(f"⏱️  القياس: {trace}")
 
     print("=" * 70)
     print("🎉 اكتمل التحقق والتنظيف بنجاح!")